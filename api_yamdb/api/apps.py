@@ -1,6 +1,36 @@
+import os
+import sys
+
 from django.apps import AppConfig
+from django.conf import settings
+
+# Серверы WSGI/ASGI, в процессах которых прогревается кеш
+WARM_CACHE_SERVERS = (
+    'gunicorn', 'uwsgi', 'daphne', 'uvicorn', 'hypercorn', 'waitress-serve',
+)
+# Команды manage.py и django-admin, при запуске которых прогревается кеш
+WARM_CACHE_COMMANDS = ('runserver',)
 
 
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        if settings.WARM_CACHE_ON_STARTUP and self.is_server():
+            from .warmup import warm_cache_in_background
+            warm_cache_in_background()
+
+    @staticmethod
+    def is_server():
+        """
+        Процесс обслуживает запросы: запущен одним из серверов
+        WARM_CACHE_SERVERS или командой runserver. Остальные процессы
+        (миграции, другие команды, тесты) кеш не прогревают.
+        """
+        if not sys.argv:
+            return False
+        if os.path.basename(sys.argv[0]) in WARM_CACHE_SERVERS:
+            return True
+        return len(sys.argv) > 1 and sys.argv[1] in WARM_CACHE_COMMANDS
@@ -0,0 +1,155 @@
+from django.shortcuts import get_object_or_404
+from django.utils.functional import cached_property
+from rest_framework.exceptions import AuthenticationFailed, ValidationError
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from reviews.models import User
+from reviews.revocation import is_revoked
+from reviews.versions import AUTH_VERSION, get_version
+
+# Утверждения токена: роль, признак суперпользователя, имя
+# и версия данных авторизации пользователя на момент выдачи
+ROLE_CLAIM = 'role'
+SUPERUSER_CLAIM = 'is_superuser'
+USERNAME_CLAIM = 'username'
+AUTH_VERSION_CLAIM = 'auth_version'
+
+
+class RoleTokenUser(TokenUser):
+    """
+    Пользователь, восстановленный из утверждений токена
+    без запроса к базе данных. Поддерживает проверки прав
+    (is_admin, is_moderator), но не является объектом модели User.
+    """
+
+    @cached_property
+    def role(self):
+        return self.token[ROLE_CLAIM]
+
+    @property
+    def is_moderator(self):
+        return self.role == User.MODERATOR
+
+    @property
+    def is_admin(self):
+        return self.role == User.ADMIN or self.is_superuser
+
+
+def get_access_token(user):
+    """
+    Возвращает токен доступа с ролью пользователя и текущей
+    версией его данных авторизации.
+    """
+    token = AccessToken.for_user(user)
+    token[ROLE_CLAIM] = user.role
+    token[SUPERUSER_CLAIM] = user.is_superuser
+    token[USERNAME_CLAIM] = user.username
+    token[AUTH_VERSION_CLAIM] = get_version(AUTH_VERSION.format(user.pk))
+    return token
+
+
+def get_tokens(user):
+    """
+    Возвращает короткоживущий токен доступа и токен обновления.
+    """
+    return get_access_token(user), RefreshToken.for_user(user)
+
+
+def check_not_revoked(token):
+    if is_revoked(
+        token[api_settings.JTI_CLAIM],
+        token[api_settings.USER_ID_CLAIM],
+        token.get('iat', 0)
+    ):
+        raise AuthenticationFailed('Токен отозван.', code='token_revoked')
+
+
+def refresh_access_token(raw_token):
+    """
+    Возвращает новый токен доступа по токену обновления.
+    Роль и версия авторизации берутся из базы данных одним запросом
+    по первичному ключу, поэтому изменения пользователя применяются
+    не позже, чем истекает токен доступа.
+    """
+    try:
+        refresh = RefreshToken(raw_token)
+    except TokenError as error:
+        raise InvalidToken(error.args[0])
+    check_not_revoked(refresh)
+    user = User.objects.filter(
+        pk=refresh[api_settings.USER_ID_CLAIM], is_active=True
+    ).first()
+    if user is None:
+        raise AuthenticationFailed(
+            'Пользователь не найден.', code='user_not_found'
+        )
+    return get_access_token(user)
+
+
+def get_refresh_token(raw_token, user_id):
+    """
+    Возвращает действительный токен обновления пользователя user_id.
+    """
+    try:
+        refresh = RefreshToken(raw_token)
+    except TokenError as error:
+        raise ValidationError({'refresh': [error.args[0]]})
+    if refresh[api_settings.USER_ID_CLAIM] != user_id:
+        raise ValidationError(
+            {'refresh': ['Токен выдан другому пользователю.']}
+        )
+    return refresh
+
+
+def has_current_claims(token):
+    """
+    Утверждения токена актуальны, если версия данных авторизации
+    пользователя не менялась с момента выдачи: версия обновляется
+    при любом изменении или удалении пользователя.
+    """
+    version = token.get(AUTH_VERSION_CLAIM)
+    return version is not None and version == get_version(
+        AUTH_VERSION.format(token[api_settings.USER_ID_CLAIM])
+    )
+
+
+def get_user(request):
+    """
+    Возвращает объект модели User текущего пользователя
+    (для пользователя из токена - загружает из базы данных).
+    """
+    if isinstance(request.user, RoleTokenUser):
+        return get_object_or_404(User, pk=request.user.pk)
+    return request.user
+
+
+class RoleJWTAuthentication(JWTAuthentication):
+    """
+    Аутентификация по JWT, которая для безопасных запросов
+    с актуальными утверждениями о роли не загружает пользователя
+    из базы данных. Изменяющие запросы, токены без утверждений
+    и токены, выданные до изменения пользователя, проверяются
+    по базе данных. Отозванные токены отклоняются.
+    """
+
+    def get_validated_token(self, raw_token):
+        token = super().get_validated_token(raw_token)
+        check_not_revoked(token)
+        return token
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        token = self.get_validated_token(raw_token)
+        if request.method in SAFE_METHODS and has_current_claims(token):
+            return RoleTokenUser(token), token
+        return self.get_user(token), token
@@ -0,0 +1,125 @@
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from urllib.parse import parse_qsl, unquote_to_bytes, urlencode, urlsplit
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import connections
+from django.urls import Resolver404, resolve
+from django.utils.encoding import iri_to_uri
+
+logger = logging.getLogger(__name__)
+
+BATCH_URL_NAME = 'batch'
+SAFE_METHODS = ('GET',)
+# Заголовки родительского запроса, которые не относятся к вложенным
+PARENT_ONLY_META = ('CONTENT_TYPE', 'CONTENT_LENGTH', 'HTTP_IF_NONE_MATCH',
+                    'HTTP_IF_MODIFIED_SINCE', 'wsgi.input')
+# Параметр выбора формата ответа: вложенные ответы всегда в JSON
+FORMAT_PARAM = 'format'
+
+executor = ThreadPoolExecutor(
+    max_workers=settings.BATCH_MAX_WORKERS, thread_name_prefix='batch'
+)
+
+
+def build_request(parent, method, path, body):
+    """
+    Создаёт вложенный запрос с заголовками родительского,
+    в том числе с заголовком авторизации. Ответ запрашивается
+    в формате JSON: заголовок Accept заменяется, а параметр
+    format отбрасывается.
+    """
+    url = urlsplit(iri_to_uri(path))
+    content = b'' if body is None else json.dumps(body).encode()
+    environ = {
+        key: value for key, value in parent.META.items()
+        if key not in PARENT_ONLY_META
+    }
+    query = urlencode([
+        (name, value)
+        for name, value in parse_qsl(url.query, keep_blank_values=True)
+        if name != FORMAT_PARAM
+    ])
+    environ.update({
+        'REQUEST_METHOD': method,
+        # Переменные окружения WSGI - байты, декодированные как latin-1
+        'PATH_INFO': unquote_to_bytes(url.path).decode('iso-8859-1'),
+        'QUERY_STRING': query,
+        'HTTP_ACCEPT': 'application/json',
+        'CONTENT_TYPE': 'application/json',
+        'CONTENT_LENGTH': str(len(content)),
+        'wsgi.input': BytesIO(content),
+    })
+    return WSGIRequest(environ)
+
+
+def execute(parent, method, path, body=None):
+    """
+    Выполняет вложенный запрос через URL resolver без HTTP
+    и возвращает статус и тело ответа. Исключение во вложенном
+    запросе возвращается как ответ со статусом 500.
+    """
+    url = urlsplit(path)
+    try:
+        match = resolve(url.path)
+    except Resolver404:
+        match = None
+    if (
+        match is None or match.url_name == BATCH_URL_NAME
+        or not url.path.startswith('/api/')
+    ):
+        return {'status': 404, 'body': {'detail': 'Страница не найдена.'}}
+    request = build_request(parent, method, path, body)
+    try:
+        response = match.func(request, *match.args, **match.kwargs)
+        if hasattr(response, 'render'):
+            response.render()
+        content = response.content
+        return {
+            'status': response.status_code,
+            'body': json.loads(content) if content else None,
+        }
+    except Exception:
+        # Ошибка вложенного запроса не прерывает выполнение пакета
+        logger.exception('Ошибка вложенного запроса %s %s', method, path)
+        return {'status': 500, 'body': {'detail': 'Ошибка сервера.'}}
+
+
+def execute_in_thread(parent, method, path, body=None):
+    """
+    Выполняет безопасный вложенный запрос в потоке пула
+    и закрывает открытые в этом потоке соединения с базой данных.
+    """
+    try:
+        return execute(parent, method, path, body)
+    finally:
+        connections.close_all()
+
+
+def execute_batch(parent, requests):
+    """
+    Выполняет вложенные запросы и возвращает ответы в том же порядке.
+    Подряд идущие безопасные запросы выполняются параллельно,
+    изменяющие - по одному в порядке следования, чтобы последующие
+    запросы видели их результат.
+    """
+    responses = []
+    safe = []
+    for sub_request in requests:
+        if sub_request['method'] in SAFE_METHODS:
+            safe.append(executor.submit(
+                execute_in_thread, parent, sub_request['method'],
+                sub_request['path']
+            ))
+            continue
+        responses.extend(future.result() for future in safe)
+        safe = []
+        responses.append(execute(
+            parent, sub_request['method'], sub_request['path'],
+            sub_request.get('body')
+        ))
+    responses.extend(future.result() for future in safe)
+    return responses
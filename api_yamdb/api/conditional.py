@@ -0,0 +1,110 @@
+import hashlib
+import math
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, urlencode
+
+from reviews.versions import get_versions
+
+RESPONSE_KEY = 'response:{}'
+# Последний ответ на запрос без учёта версий данных
+STALE_RESPONSE_KEY = 'response:stale:{}'
+
+
+class EarlyResponse(Exception):
+    """
+    Готовый ответ (304 или из кеша), прерывающий обработку запроса
+    до выполнения запросов к базе данных.
+    """
+
+    def __init__(self, response):
+        super().__init__()
+        self.response = response
+
+
+def get_request_key(request, user=None):
+    """
+    Возвращает хеш запроса: адрес (со схемой и хостом, которые входят
+    в ссылки пагинации), отсортированные параметры запроса,
+    формат ответа и, если передан, пользователь.
+    """
+    query = urlencode(sorted(
+        (key, value)
+        for key, values in request.query_params.lists()
+        for value in values
+    ))
+    return hashlib.sha1('|'.join([
+        request.build_absolute_uri(request.path),
+        query,
+        request.accepted_renderer.format,
+        '' if user is None else str(user.pk),
+    ]).encode()).hexdigest()
+
+
+def get_request_state(request, names, user=None):
+    """
+    Возвращает хеш состояния ответа и время его последнего изменения
+    по хешу запроса и версиям данных names без построения ответа.
+    Версия - отметка времени изменения в микросекундах, поэтому
+    наибольшая из версий (с округлением вверх до секунды) - время
+    последнего изменения ответа.
+    """
+    versions = get_versions(names)
+    state = '|'.join([
+        get_request_key(request, user),
+        *(f'{name}={versions[name]}' for name in sorted(versions)),
+    ])
+    return (
+        hashlib.sha1(state.encode()).hexdigest(),
+        math.ceil(max(versions.values()) / 1_000_000),
+    )
+
+
+def check_not_modified(request, etag, last_modified):
+    """
+    Вызывает EarlyResponse с ответом 304, если ETag или время изменения
+    совпадают с заголовками If-None-Match или If-Modified-Since запроса.
+    """
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    if response is not None:
+        raise EarlyResponse(response)
+
+
+def set_validators(response, etag, last_modified):
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    return response
+
+
+def load_response(key):
+    """
+    Возвращает закешированный ответ с ключом key или None.
+    """
+    cached = cache.get(key)
+    if cached is None:
+        return None
+    content_type, content = cached
+    response = HttpResponse(content, content_type=content_type)
+    response.from_cache = True
+    return response
+
+
+def cache_response(key, response, stale_key=None):
+    """
+    Сохраняет в кеше готовое содержимое успешного ответа.
+    Ключ содержит версии данных, поэтому срок хранения не нужен:
+    устаревшие записи недоступны и вытесняются кешем.
+    Под stale_key ответ сохраняется как последний для запроса.
+    """
+    if hasattr(response, 'render'):
+        response.render()
+    cached = (response['Content-Type'], response.content)
+    keys = [key] if stale_key is None else [key, stale_key]
+    cache.set_many(
+        dict.fromkeys(keys, cached), timeout=settings.RESPONSE_CACHE_TIMEOUT
+    )
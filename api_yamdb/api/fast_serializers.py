@@ -0,0 +1,231 @@
+from rest_framework import serializers
+
+from reviews.catalog import get_catalog
+from reviews.models import Title
+
+
+class Column:
+    """
+    Поле ответа из одного столбца values().
+    convert повторяет to_representation поля DRF (None не преобразуется).
+    """
+
+    def __init__(self, lookup=None, convert=None):
+        self.lookup = lookup
+        self.convert = convert
+
+    def bind(self, name):
+        self.lookup = self.lookup or name
+        self.lookups = (self.lookup,)
+
+    def load(self, rows):
+        return None
+
+    def extract(self, row, loaded):
+        value = row[self.lookup]
+        if value is None or self.convert is None:
+            return value
+        return self.convert(value)
+
+
+class Related:
+    """
+    Вложенный объект по внешнему ключу: словарь из полей fields
+    связанной модели или None, если связи нет.
+    """
+
+    def __init__(self, fields):
+        self.fields = fields
+
+    def bind(self, name):
+        self.name = name
+        self.columns = tuple(
+            (field, f'{name}__{field}') for field in self.fields
+        )
+        self.lookups = (name,) + tuple(lookup for _, lookup in self.columns)
+
+    def load(self, rows):
+        return None
+
+    def extract(self, row, loaded):
+        if row[self.name] is None:
+            return None
+        return {field: row[lookup] for field, lookup in self.columns}
+
+
+class RelatedMany:
+    """
+    Список вложенных объектов по связи многие-ко-многим.
+    Загружается одним запросом к промежуточной таблице для всех строк,
+    объекты отсортированы по id (как в Prefetch сериализаторов DRF).
+    """
+
+    def __init__(self, model, fields):
+        self.model = model
+        self.fields = fields
+        self.lookups = ()
+
+    def bind(self, name):
+        field = self.model._meta.get_field(name)
+        self.through = field.remote_field.through
+        self.source = field.m2m_field_name()
+        self.target = field.m2m_reverse_field_name()
+
+    def load(self, rows):
+        objects = {}
+        if not rows:
+            return objects
+        values = self.through.objects.filter(**{
+            f'{self.source}__in': [row['id'] for row in rows]
+        }).order_by(self.target).values_list(
+            self.source, *(f'{self.target}__{field}' for field in self.fields)
+        )
+        for object_id, *related in values:
+            objects.setdefault(object_id, []).append(
+                dict(zip(self.fields, related))
+            )
+        return objects
+
+    def extract(self, row, loaded):
+        return loaded.get(row['id'], [])
+
+
+class CatalogRelated:
+    """
+    Вложенная категория по внешнему ключу из снимка каталога
+    без соединения таблиц.
+    """
+
+    def __init__(self, objects, fields):
+        self.objects = objects
+        self.fields = fields
+
+    def bind(self, name):
+        self.name = name
+        self.lookups = (name,)
+
+    def load(self, rows):
+        return getattr(get_catalog(), self.objects)
+
+    def extract(self, row, loaded):
+        related = loaded.get(row[self.name])
+        if related is None:
+            return None
+        return {field: getattr(related, field) for field in self.fields}
+
+
+class CatalogRelatedMany(RelatedMany):
+    """
+    Список жанров по связи многие-ко-многим: из промежуточной таблицы
+    читаются только id, объекты берутся из снимка каталога.
+    Связи с объектами, которых ещё нет в снимке (до обновления
+    версии каталога), пропускаются.
+    """
+
+    def __init__(self, model, objects, fields):
+        super().__init__(model, fields)
+        self.objects = objects
+
+    def load(self, rows):
+        objects = {}
+        if not rows:
+            return objects
+        catalog = getattr(get_catalog(), self.objects)
+        values = self.through.objects.filter(**{
+            f'{self.source}__in': [row['id'] for row in rows]
+        }).order_by(f'{self.target}_id').values_list(
+            self.source, f'{self.target}_id'
+        )
+        for object_id, related_id in values:
+            related = catalog.get(related_id)
+            if related is None:
+                continue
+            objects.setdefault(object_id, []).append(
+                {field: getattr(related, field) for field in self.fields}
+            )
+        return objects
+
+
+class ValuesSerializer:
+    """
+    Быстрый сериализатор для чтения: строит ответ из строк values()
+    без создания объектов моделей и полей DRF на каждую запись.
+    Ответ совпадает с ответом соответствующего ModelSerializer.
+    Поля создаются один раз для класса и не хранят состояния запроса.
+    """
+    fields = {}
+
+    def __init__(self, field_names=None):
+        self.selected = {
+            name: field for name, field in self.fields.items()
+            if field_names is None or name in field_names
+        }
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name, field in cls.fields.items():
+            field.bind(name)
+
+    def get_queryset(self, queryset):
+        """
+        Возвращает queryset со строками values() для выбранных полей.
+        """
+        lookups = {'id'}
+        for field in self.selected.values():
+            lookups.update(field.lookups)
+        return queryset.prefetch_related(None).values(*lookups)
+
+    def to_representation(self, rows):
+        rows = list(rows)
+        fields = [
+            (name, field.extract, field.load(rows))
+            for name, field in self.selected.items()
+        ]
+        return [
+            {name: extract(row, loaded) for name, extract, loaded in fields}
+            for row in rows
+        ]
+
+
+datetime_to_representation = serializers.DateTimeField().to_representation
+
+
+class TitleValuesSerializer(ValuesSerializer):
+    """
+    Быстрый аналог TitleReadOnlySerializer.
+    """
+    fields = {
+        'id': Column(),
+        'name': Column(),
+        'year': Column(),
+        'rating': Column(convert=int),
+        'weighted_rating': Column(convert=float),
+        'description': Column(),
+        'genre': CatalogRelatedMany(Title, 'genres_by_id', ('name', 'slug')),
+        'category': CatalogRelated('categories_by_id', ('name', 'slug')),
+    }
+
+
+class ReviewValuesSerializer(ValuesSerializer):
+    """
+    Быстрый аналог ReviewSerializer.
+    """
+    fields = {
+        'id': Column(),
+        'text': Column(),
+        'author': Column('author__username'),
+        'score': Column(),
+        'pub_date': Column(convert=datetime_to_representation),
+    }
+
+
+class CommentValuesSerializer(ValuesSerializer):
+    """
+    Быстрый аналог CommentSerializer.
+    """
+    fields = {
+        'id': Column(),
+        'text': Column(),
+        'author': Column('author__username'),
+        'pub_date': Column(convert=datetime_to_representation),
+    }
@@ -0,0 +1,112 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+
+def get_fieldset(field_names, params):
+    """
+    Возвращает поля из field_names, выбранные параметрами
+    fields=a,b и exclude=c запроса, с сохранением порядка.
+    """
+    selected = list(field_names)
+    for param in ('fields', 'exclude'):
+        value = params.get(param)
+        if value is None:
+            continue
+        names = set(value.split(',')) - {''}
+        unknown = names - set(field_names)
+        if unknown:
+            raise ValidationError(
+                {param: [f'Неизвестные поля: {", ".join(sorted(unknown))}']}
+            )
+        selected = [
+            name for name in selected
+            if (name in names) == (param == 'fields')
+        ]
+    return selected
+
+
+class SparseFieldsMixin:
+    """
+    Миксин сериализатора для выбора полей ответа параметрами
+    fields и exclude GET-запроса. Применяется только к сериализатору
+    верхнего уровня, вложенные объекты возвращаются целиком.
+    """
+
+    def is_root_serializer(self):
+        return self.parent is None or (
+            isinstance(self.parent, serializers.ListSerializer)
+            and self.parent.parent is None
+        )
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        if (
+            request is None or request.method != 'GET'
+            or not self.is_root_serializer()
+        ):
+            return fields
+        return {
+            name: fields[name]
+            for name in get_fieldset(fields, request.query_params)
+        }
+
+
+def get_related_columns(field, source):
+    """
+    Возвращает поля связанной модели, которые нужны полю сериализатора,
+    или None, если нужна вся запись (например, для StringRelatedField).
+    """
+    if isinstance(field, serializers.BaseSerializer):
+        concrete = {
+            model_field.name
+            for model_field in field.Meta.model._meta.concrete_fields
+        }
+        children = [child.source for child in field.fields.values()]
+        if not concrete.issuperset(children):
+            return None
+        return [f'{source}__{child}' for child in children]
+    if isinstance(field, serializers.SlugRelatedField):
+        return [f'{source}__{field.slug_field}']
+    return None
+
+
+def optimize_queryset(queryset, fields, restrict=True):
+    """
+    Загружает в queryset только связи и столбцы, нужные полям
+    сериализатора fields: select_related для внешних ключей,
+    prefetch_related для связей многие-ко-многим (по порядку id)
+    и only() для столбцов (если restrict). Если источник поля - не поле модели
+    (свойство, метод), набор столбцов не ограничивается.
+    """
+    meta = queryset.model._meta
+    columns = {meta.pk.name}
+    select, prefetch = [], []
+    for field in fields:
+        try:
+            model_field = meta.get_field(field.source)
+        except FieldDoesNotExist:
+            restrict = False
+            continue
+        if model_field.many_to_many or model_field.one_to_many:
+            prefetch.append(Prefetch(
+                field.source,
+                queryset=model_field.related_model.objects.order_by('pk')
+            ))
+            continue
+        columns.add(field.source)
+        if not model_field.is_relation or isinstance(
+            field, serializers.PrimaryKeyRelatedField
+        ):
+            continue
+        select.append(field.source)
+        related_columns = get_related_columns(field, field.source)
+        if related_columns is not None:
+            columns.update(related_columns)
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    return queryset.only(*columns) if restrict else queryset
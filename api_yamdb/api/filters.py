@@ -1,6 +1,14 @@
-from django_filters import CharFilter, FilterSet
+from django.db.models import CharField, Count, F, Value
+from django.db.models.functions import Cast
+from django_filters import CharFilter, FilterSet, NumberFilter
 
 from reviews.models import Title
+from .genre_index import genre_index, ids_to_bitmap
+
+# Шаг группировки произведений по годам для фасета year
+YEAR_BUCKET = 10
+TITLE_FACETS = ('genre', 'category', 'year')
+GENRE_FILTERS = ('genre', 'genre_all')
 
 
 class TitleFilter(FilterSet):
@@ -8,8 +16,100 @@ class TitleFilter(FilterSet):
     Класс фильтрация для TitleViewSet.
     """
     category = CharFilter(field_name='category__slug')
-    genre = CharFilter(field_name='genre__slug')
+    genre = CharFilter(method='filter_genre')
+    genre_all = CharFilter(method='filter_genre')
+    rating_min = NumberFilter(field_name='rating', lookup_expr='gte')
+    weighted_rating_min = NumberFilter(
+        field_name='weighted_rating', lookup_expr='gte'
+    )
 
     class Meta:
         model = Title
-        fields = ('name', 'year', 'category', 'genre')
+        fields = (
+            'name', 'year', 'category', 'genre', 'genre_all',
+            'rating_min', 'weighted_rating_min',
+        )
+
+    def filter_genre(self, queryset, name, value):
+        """
+        Фильтрует произведения по списку жанров через запятую:
+        genre - хотя бы один из жанров, genre_all - все жанры сразу.
+        Используется вместе с другими фильтрами, поэтому условие
+        строится подзапросом к жанрам произведений. Список только
+        с фильтрами по жанрам строится по индексу жанров
+        (get_genre_bitmap).
+        """
+        slugs = parse_slugs(value)
+        if not slugs:
+            return queryset
+        links = Title.genre.through.objects.values('title_id')
+        if name == 'genre_all':
+            for slug in slugs:
+                queryset = queryset.filter(
+                    pk__in=links.filter(genre__slug=slug)
+                )
+            return queryset
+        return queryset.filter(pk__in=links.filter(genre__slug__in=slugs))
+
+
+def parse_slugs(value):
+    return [slug for slug in value.split(',') if slug]
+
+
+def get_genre_bitmap(params):
+    """
+    Возвращает битовую карту произведений из индекса жанров,
+    если из фильтров списка переданы только genre и genre_all,
+    иначе None.
+    """
+    names = set(params) & set(TitleFilter.base_filters)
+    if not names or not names <= set(GENRE_FILTERS):
+        return None
+    bitmap = None
+    for name in names:
+        slugs = parse_slugs(params[name])
+        if not slugs:
+            continue
+        if name == 'genre_all':
+            matched = genre_index.all_of(slugs)
+        else:
+            matched = genre_index.any_of(slugs)
+        bitmap = matched if bitmap is None else bitmap & matched
+    return bitmap
+
+
+def get_title_facets(queryset, facets):
+    """
+    Подсчитывает количество произведений по жанрам, категориям
+    и десятилетиям для отфильтрованного queryset.
+    Жанры считаются пересечением с индексом жанров, остальные
+    запрошенные фасеты - одним запросом (UNION ALL).
+    """
+    result = {facet: {} for facet in facets}
+    if 'genre' in facets:
+        result['genre'] = genre_index.counts(
+            ids_to_bitmap(queryset.order_by().values_list('id', flat=True))
+        )
+        facets = [facet for facet in facets if facet != 'genre']
+    if not facets:
+        return result
+    titles = Title.objects.filter(id__in=queryset.values('id'))
+    facet_querysets = {
+        'category': titles.annotate(
+            key=F('category__slug'), item=F('id')
+        ),
+        'year': titles.annotate(
+            key=Cast(F('year') / YEAR_BUCKET * YEAR_BUCKET, CharField()),
+            item=F('id')
+        ),
+    }
+    grouped = [
+        facet_querysets[facet].annotate(
+            facet=Value(facet, CharField())
+        ).values('facet', 'key').annotate(count=Count('item'))
+        for facet in facets
+    ]
+    for row in grouped[0].union(*grouped[1:], all=True):
+        if row['key'] is not None:
+            result[row['facet']][row['key']] = row['count']
+    return result
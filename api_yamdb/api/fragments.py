@@ -0,0 +1,74 @@
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.renderers import JSONRenderer
+
+from reviews.models import Title
+from reviews.versions import CATALOG_VERSION, TITLE_VERSION, get_versions
+from .fast_serializers import TitleValuesSerializer
+
+FRAGMENT_KEY = 'fragment:title:{id}:{version}:{catalog}'
+
+renderer = JSONRenderer()
+
+
+def render_titles(ids):
+    """
+    Возвращает закодированный JSON произведений с id из ids.
+    """
+    serializer = TitleValuesSerializer()
+    rows = serializer.get_queryset(Title.objects.filter(pk__in=ids))
+    return {
+        title['id']: renderer.render(title)
+        for title in serializer.to_representation(rows)
+    }
+
+
+def get_title_fragments(ids):
+    """
+    Возвращает закодированный JSON произведений в порядке ids.
+    Фрагменты хранятся в кеше по версии произведения и каталога,
+    поэтому изменение произведения, его отзывов, жанров или категории
+    делает устаревший фрагмент недоступным без явного удаления.
+    Отсутствующие в кеше фрагменты строятся одним запросом.
+    """
+    names = [TITLE_VERSION.format(title_id) for title_id in ids]
+    versions = get_versions(names + [CATALOG_VERSION])
+    keys = {
+        title_id: FRAGMENT_KEY.format(
+            id=title_id, version=versions[name],
+            catalog=versions[CATALOG_VERSION]
+        )
+        for title_id, name in zip(ids, names)
+    }
+    cached = cache.get_many(keys.values())
+    fragments = {
+        title_id: cached[key] for title_id, key in keys.items()
+        if key in cached
+    }
+    missing = [title_id for title_id in ids if title_id not in fragments]
+    if missing:
+        rendered = render_titles(missing)
+        cache.set_many(
+            {keys[title_id]: fragment
+             for title_id, fragment in rendered.items()},
+            timeout=settings.TITLE_FRAGMENT_TIMEOUT.total_seconds()
+        )
+        fragments.update(rendered)
+    return [fragments[title_id] for title_id in ids if title_id in fragments]
+
+
+def render_page(envelope, fragments):
+    """
+    Собирает ответ из конверта пагинации и готовых фрагментов:
+    фрагменты подставляются в список results без повторного кодирования.
+    """
+    results = b'[' + b','.join(fragments) + b']'
+    if envelope is None:
+        return results
+    envelope = dict(envelope)
+    envelope.pop('results')
+    separator = b',' if envelope else b''
+    return (
+        renderer.render(envelope)[:-1] + separator
+        + b'"results":' + results + b'}'
+    )
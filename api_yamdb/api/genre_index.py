@@ -0,0 +1,207 @@
+import threading
+
+from django.db import transaction
+
+from reviews.models import Title
+from reviews.versions import bump_version, get_version
+
+GENRE_INDEX_VERSION = 'genre-index'
+BITMAP_BLOCK_BYTES = 512
+
+
+def ids_to_bitmap(ids):
+    """
+    Упаковывает id произведений в битовую карту (целое число).
+    """
+    bitmap = 0
+    for title_id in ids:
+        bitmap |= 1 << title_id
+    return bitmap
+
+
+def bitmap_to_ids(bitmap):
+    """
+    Возвращает отсортированный список id из битовой карты.
+    """
+    bits = bin(bitmap)[:1:-1]
+    return [title_id for title_id, bit in enumerate(bits) if bit == '1']
+
+
+def bitmap_count(bitmap):
+    """
+    Возвращает количество id в битовой карте.
+    """
+    return bin(bitmap).count('1')
+
+
+def bitmap_slice(bitmap, start, stop):
+    """
+    Возвращает id с порядковыми номерами от start до stop
+    (по возрастанию id) из битовой карты. Карта разбирается блоками
+    по BITMAP_BLOCK_BYTES байт, id выписываются только из блоков,
+    попавших в срез.
+    """
+    data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, 'little')
+    ids = []
+    position = 0
+    for offset in range(0, len(data), BITMAP_BLOCK_BYTES):
+        if position >= stop:
+            break
+        block = int.from_bytes(
+            data[offset:offset + BITMAP_BLOCK_BYTES], 'little'
+        )
+        count = bitmap_count(block)
+        if position + count > start:
+            ids.extend(
+                offset * 8 + title_id
+                for title_id in bitmap_to_ids(block)[
+                    max(start - position, 0):stop - position
+                ]
+            )
+        position += count
+    return ids
+
+
+class BitmapIds:
+    """
+    Список id произведений с фильтром по жанрам для пагинации:
+    количество считается по битовой карте без запроса. При порядке
+    по id срез берётся из битовой карты, при другом порядке -
+    запросом queryset (тот же фильтр в SQL) с LIMIT и OFFSET.
+    """
+
+    def __init__(self, bitmap, ordering, queryset):
+        self.bitmap = bitmap
+        self.ordering = tuple(ordering)
+        self.queryset = queryset
+
+    def count(self):
+        return bitmap_count(self.bitmap)
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if self.ordering in (('id',), ('pk',)):
+            start, stop, _ = index.indices(len(self))
+            return bitmap_slice(self.bitmap, start, stop)
+        if self.ordering in (('-id',), ('-pk',)):
+            count = len(self)
+            start, stop, _ = index.indices(count)
+            return bitmap_slice(
+                self.bitmap, count - stop, count - start
+            )[::-1]
+        return list(self.queryset[index])
+
+
+class GenreIndex:
+    """
+    Индекс жанров в памяти процесса: slug жанра -> битовая карта
+    id произведений этого жанра.
+    Строится при первом обращении и обновляется сигналами при изменении
+    жанров произведений после фиксации транзакции. Другие процессы
+    узнают об изменениях по версии индекса в кеше и перестраивают
+    свою копию.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bitmaps = {}
+        self._version = None
+
+    def _sync(self):
+        version = get_version(GENRE_INDEX_VERSION)
+        if version == self._version:
+            return self._bitmaps
+        with self._lock:
+            if version != self._version:
+                bitmaps = {}
+                rows = Title.genre.through.objects.values_list(
+                    'genre__slug', 'title_id'
+                )
+                for slug, title_id in rows:
+                    bitmaps[slug] = bitmaps.get(slug, 0) | 1 << title_id
+                self._bitmaps = bitmaps
+                self._version = version
+        return self._bitmaps
+
+    def _apply(self, change):
+        """
+        Применяет изменение к индексу и публикует новую версию.
+        Если индекс уже отставал от версии в кеше, при следующем
+        обращении он будет перестроен целиком.
+        """
+        with self._lock:
+            in_sync = self._version == get_version(GENRE_INDEX_VERSION)
+            bitmaps = dict(self._bitmaps)
+            change(bitmaps)
+            self._bitmaps = bitmaps
+            version = bump_version(GENRE_INDEX_VERSION)
+            self._version = version if in_sync else None
+
+    def _update(self, change):
+        """
+        Применяет изменение после фиксации транзакции: другие процессы
+        перестраивают индекс по новой версии только из зафиксированных
+        данных, а при откате индекс не меняется.
+        """
+        transaction.on_commit(lambda: self._apply(change))
+
+    def add(self, title_id, slugs):
+        slugs = list(slugs)
+
+        def change(bitmaps):
+            for slug in slugs:
+                bitmaps[slug] = bitmaps.get(slug, 0) | 1 << title_id
+        self._update(change)
+
+    def remove(self, title_id, slugs=None):
+        if slugs is not None:
+            slugs = list(slugs)
+
+        def change(bitmaps):
+            for slug in bitmaps if slugs is None else slugs:
+                if slug in bitmaps:
+                    bitmaps[slug] &= ~(1 << title_id)
+        self._update(change)
+
+    def invalidate(self):
+        def reset():
+            with self._lock:
+                self._version = None
+            bump_version(GENRE_INDEX_VERSION)
+        transaction.on_commit(reset)
+
+    def any_of(self, slugs):
+        """
+        Битовая карта произведений, у которых есть хотя бы один из жанров.
+        """
+        bitmaps = self._sync()
+        result = 0
+        for slug in slugs:
+            result |= bitmaps.get(slug, 0)
+        return result
+
+    def all_of(self, slugs):
+        """
+        Битовая карта произведений, у которых есть все указанные жанры.
+        """
+        bitmaps = self._sync()
+        result = bitmaps.get(slugs[0], 0)
+        for slug in slugs[1:]:
+            result &= bitmaps.get(slug, 0)
+        return result
+
+    def counts(self, bitmap):
+        """
+        Количество произведений из bitmap для каждого жанра.
+        """
+        counts = {}
+        for slug, genre_bitmap in self._sync().items():
+            count = bitmap_count(genre_bitmap & bitmap)
+            if count:
+                counts[slug] = count
+        return counts
+
+
+genre_index = GenreIndex()
@@ -0,0 +1,55 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.authentication import get_access_token
+from reviews.models import User
+
+BENCHMARK_USERNAME = 'benchmark-auth'
+URL = '/api/v1/genres/'
+
+
+class Command(BaseCommand):
+    help = ('Сравнение пропускной способности авторизованных запросов '
+            'с токеном без утверждений и с утверждениями о роли.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests', type=int, default=500,
+            help='Количество запросов для каждого токена.')
+
+    def measure(self, token, requests):
+        """
+        Возвращает количество запросов в секунду и количество
+        запросов к базе данных на один запрос к API.
+        """
+        client = Client(HTTP_AUTHORIZATION=f'Bearer {token}')
+        client.get(URL)
+        with CaptureQueriesContext(connection) as context:
+            started = time.perf_counter()
+            for _ in range(requests):
+                client.get(URL)
+            elapsed = time.perf_counter() - started
+        return requests / elapsed, len(context.captured_queries) / requests
+
+    def handle(self, *args, **options):
+        user, _ = User.objects.get_or_create(
+            username=BENCHMARK_USERNAME,
+            defaults={'email': f'{BENCHMARK_USERNAME}@yamdb.fake'}
+        )
+        try:
+            for name, token in (
+                ('Без утверждений', AccessToken.for_user(user)),
+                ('С утверждениями о роли', get_access_token(user)),
+            ):
+                rate, queries = self.measure(token, options['requests'])
+                self.stdout.write(
+                    f'{name}: {rate:.0f} запросов/с, '
+                    f'{queries:.1f} запросов к БД на запрос'
+                )
+        finally:
+            user.delete()
@@ -0,0 +1,77 @@
+import multiprocessing
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.utils.module_loading import import_string
+
+BACKENDS = (
+    ('LocMemCache', 'django.core.cache.backends.locmem.LocMemCache',
+     'benchmark'),
+    ('FileBasedCache', 'django.core.cache.backends.filebased.FileBasedCache',
+     'files'),
+    ('SQLiteCache', 'api_yamdb.cache.SQLiteCache', 'cache.sqlite3'),
+)
+
+
+def run_worker(backend, location, options):
+    """
+    Выполняет в отдельном процессе чтения случайных ключей,
+    при промахе записывает значение, как это делают представления.
+    Возвращает количество попаданий.
+    """
+    cache = import_string(backend)(location, {
+        'TIMEOUT': None,
+        'OPTIONS': {'MAX_ENTRIES': options['keys'] * 2},
+    })
+    value = b'x' * options['value_size']
+    generator = random.Random()
+    hits = 0
+    for _ in range(options['operations']):
+        key = f'key:{generator.randrange(options["keys"])}'
+        if cache.get(key) is None:
+            cache.set(key, value)
+        else:
+            hits += 1
+    return hits
+
+
+class Command(BaseCommand):
+    help = ('Сравнение бэкендов кеша при одновременной работе '
+            'нескольких процессов.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes', type=int, default=8,
+            help='Количество процессов.')
+        parser.add_argument(
+            '--operations', type=int, default=2000,
+            help='Количество чтений в каждом процессе.')
+        parser.add_argument(
+            '--keys', type=int, default=500,
+            help='Количество различных ключей.')
+        parser.add_argument(
+            '--value-size', type=int, default=2048,
+            help='Размер значения в байтах.')
+
+    def handle(self, *args, **options):
+        processes = options['processes']
+        total = processes * options['operations']
+        context = multiprocessing.get_context('fork')
+        for name, backend, location in BACKENDS:
+            with tempfile.TemporaryDirectory() as directory:
+                arguments = (
+                    backend, str(Path(directory) / location), options
+                )
+                started = time.perf_counter()
+                with context.Pool(processes) as pool:
+                    hits = sum(pool.starmap(
+                        run_worker, [arguments] * processes
+                    ))
+                elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f'{name}: {total / elapsed:.0f} операций/с, '
+                f'попадания {hits / total:.0%}'
+            )
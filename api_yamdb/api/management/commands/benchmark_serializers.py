@@ -0,0 +1,64 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.fast_serializers import (CommentValuesSerializer,
+                                  ReviewValuesSerializer,
+                                  TitleValuesSerializer)
+from api.fieldsets import optimize_queryset
+from api.serializers import (CommentSerializer, ReviewSerializer,
+                             TitleReadOnlySerializer)
+from reviews.models import Comment, Review, Title
+
+BENCHMARKS = (
+    ('titles', Title.objects.order_by('name'),
+     TitleReadOnlySerializer, TitleValuesSerializer),
+    ('reviews', Review.objects.order_by('id'),
+     ReviewSerializer, ReviewValuesSerializer),
+    ('comments', Comment.objects.order_by('id'),
+     CommentSerializer, CommentValuesSerializer),
+)
+
+
+def measure(serialize, repeat):
+    """
+    Возвращает лучшее время выполнения serialize из repeat запусков.
+    """
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        serialize()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+class Command(BaseCommand):
+    help = ('Сравнение скорости сериализаторов DRF и быстрых '
+            'сериализаторов из values() на страницах списков.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--page-size', type=int, default=100,
+            help='Количество объектов на странице.')
+        parser.add_argument(
+            '--repeat', type=int, default=20,
+            help='Количество повторов, учитывается лучший.')
+
+    def handle(self, *args, **options):
+        page_size, repeat = options['page_size'], options['repeat']
+        for name, queryset, serializer_class, values_class in BENCHMARKS:
+            page = queryset[:page_size]
+            fields = serializer_class().fields.values()
+            drf = measure(lambda: serializer_class(
+                list(optimize_queryset(page, fields)), many=True
+            ).data, repeat)
+            values_serializer = values_class()
+            fast = measure(lambda: values_serializer.to_representation(
+                values_serializer.get_queryset(page)
+            ), repeat)
+            self.stdout.write(
+                f'{name}: DRF {page_size / drf:.0f} объектов/с, '
+                f'values() {page_size / fast:.0f} объектов/с, '
+                f'ускорение {drf / fast:.1f}x'
+            )
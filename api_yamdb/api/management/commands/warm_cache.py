@@ -0,0 +1,31 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.warmup import warm_cache
+
+
+class Command(BaseCommand):
+    help = ('Прогрев кеша: JSON произведений первых страниц списков, '
+            'лучшие и популярные произведения.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--pages', type=int, default=settings.WARM_CACHE_PAGES,
+            help='Сколько первых страниц каждого списка загрузить.')
+        parser.add_argument(
+            '--workers', type=int, default=settings.WARM_CACHE_WORKERS,
+            help='Количество потоков.')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+
+        def report(name, count, elapsed):
+            self.stdout.write(
+                f'{name}: {count} объектов за {elapsed:.2f} с'
+            )
+
+        tasks = warm_cache(options['pages'], options['workers'], report)
+        return (f'Кеш прогрет: {tasks} задач за '
+                f'{time.monotonic() - started:.1f} с.')
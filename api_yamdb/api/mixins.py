@@ -1,18 +1,43 @@
+from array import array
+from collections.abc import Mapping
+
+from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator
+from django.db.models import Prefetch
+from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
 
-from rest_framework import permissions, status
+from rest_framework import filters, permissions, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.mixins import (
     CreateModelMixin, DestroyModelMixin, ListModelMixin)
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import AccessToken
 
-from reviews.models import User
-from .serializers import (TokenSerializer,
+from reviews.catalog import get_catalog
+from reviews.core import SCORE_FIELDS, SCORES
+from reviews.models import (Comment, Review, SimilarTitle, Title, User,
+                            UserFactors)
+from reviews.revocation import revoke_token, revoke_user_tokens
+from .authentication import (get_refresh_token, get_tokens, get_user,
+                             refresh_access_token)
+from .batch import execute_batch
+from .conditional import (RESPONSE_KEY, STALE_RESPONSE_KEY, EarlyResponse,
+                          cache_response, check_not_modified,
+                          get_request_key, get_request_state, load_response,
+                          set_validators)
+from .fieldsets import get_fieldset, optimize_queryset
+from .filters import TITLE_FACETS, get_genre_bitmap, get_title_facets
+from .fragments import get_title_fragments, render_page
+from .genre_index import BitmapIds
+from .rankings import get_top_titles, get_trending_titles
+from .serializers import (BatchSerializer, LogoutSerializer,
+                          RefreshSerializer, TitleReadOnlySerializer,
+                          TokenSerializer,
                           UserRegisterSerializer,
                           UserSerializer)
-from .utils import send_confirmation_code
+from .singleflight import flights
+from .utils import first_related, parse_ids, send_confirmation_code
 # реализовано для избежания дублирования кода
 
 
@@ -27,18 +52,18 @@ class UserRegisterMixin(CreateModelMixin):
         - создание нового пользователя,
         - отправку на его почту - кода подтверждения.
         """
-        serializer = UserRegisterSerializer(data=request.data)
-        if User.objects.filter(
-            username=request.data.get('username'),
-            email=request.data.get('email')
-        ).exists():
+        data = request.data if isinstance(request.data, Mapping) else {}
+        user = User.objects.filter(
+            username=data.get('username'), email=data.get('email')
+        ).first()
+        if user is not None:
             # Отправка повторного кода подтверждения,
             # зарегистрированному ранее пользователю
-            send_confirmation_code(request)
+            send_confirmation_code(user)
             return Response(request.data, status=status.HTTP_200_OK)
+        serializer = UserRegisterSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        serializer.save()
-        send_confirmation_code(request)
+        send_confirmation_code(serializer.save())
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
@@ -54,23 +79,65 @@ class GetTokenMixin(CreateModelMixin):
         serializer = TokenSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         username = serializer.validated_data.get('username')
-        if not User.objects.filter(username=username).exists():
+        user = User.objects.filter(username=username).first()
+        if user is None:
             return Response(
                 {'username': ['Такого пользователя не существует.']},
                 status=status.HTTP_404_NOT_FOUND
             )
-        user = User.objects.get(username=username)
         if default_token_generator.check_token(
             user, serializer.validated_data['confirmation_code']
         ):
-            token = AccessToken.for_user(user)
-            return Response({'token': str(token)}, status=status.HTTP_200_OK)
+            token, refresh = get_tokens(user)
+            return Response(
+                {'token': str(token), 'refresh': str(refresh)},
+                status=status.HTTP_200_OK
+            )
         return Response(
             {'confirmation_code': ['Неверный код подтверждения']},
             status=status.HTTP_400_BAD_REQUEST
         )
 
 
+class RefreshTokenMixin(CreateModelMixin):
+    """
+    Миксин для обновления JWT токена доступа.
+    """
+
+    def create(self, request):
+        """
+        Метод возвращает новый токен доступа по токену обновления.
+        """
+        serializer = RefreshSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        token = refresh_access_token(serializer.validated_data['refresh'])
+        return Response({'token': str(token)}, status=status.HTTP_200_OK)
+
+
+class LogoutMixin(CreateModelMixin):
+    """
+    Миксин для отзыва JWT токенов.
+    """
+
+    def create(self, request):
+        """
+        Метод отзывает токен запроса (и переданный токен обновления)
+        или, при all=true, все выданные ранее токены пользователя.
+        """
+        serializer = LogoutSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        if serializer.validated_data['all']:
+            revoke_user_tokens(request.user.pk)
+            return Response(status=status.HTTP_204_NO_CONTENT)
+        revoke_token(request.auth['jti'], request.auth['exp'])
+        if 'refresh' in serializer.validated_data:
+            refresh = get_refresh_token(
+                serializer.validated_data['refresh'], request.user.pk
+            )
+            revoke_token(refresh['jti'], refresh['exp'])
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
 class UserModelMixin(CreateModelMixin, ListModelMixin):
     """
     Миксин для работы с моделью - User.
@@ -124,7 +191,48 @@ class UserModelMixin(CreateModelMixin, ListModelMixin):
             serializer.is_valid(raise_exception=True)
             serializer.save(role=request.user.role)
             return Response(serializer.data, status=status.HTTP_200_OK)
-        serializer = UserSerializer(request.user)
+        serializer = UserSerializer(get_user(request))
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    @action(
+        methods=['get'],
+        detail=False,
+        url_path='me/recommendations',
+        permission_classes=(permissions.IsAuthenticated,),
+    )
+    def get_recommendations(self, request):
+        """
+        Метод реализует:
+        - чтение рекомендаций, заранее подобранных командой
+        train_recommendations, без произведений, которые пользователь
+        оценил после обучения.
+        Пользователям без факторов возвращаются лучшие произведения.
+        """
+        limit = settings.REST_FRAMEWORK['PAGE_SIZE']
+        reviewed = set(Review.objects.filter(
+            author_id=request.user.pk
+        ).values_list('title_id', flat=True))
+        recommendations = UserFactors.objects.filter(
+            user_id=request.user.pk
+        ).values_list('recommendations', flat=True).first()
+        titles = Title.objects.select_related('category').prefetch_related(
+            'genre'
+        )
+        if recommendations is None:
+            titles = get_top_titles(
+                titles.exclude(pk__in=reviewed), limit
+            )
+        else:
+            ids = [
+                title_id for title_id in array('I', bytes(recommendations))
+                if title_id not in reviewed
+            ][:limit]
+            titles_by_id = titles.in_bulk(ids)
+            titles = [
+                titles_by_id[title_id] for title_id in ids
+                if title_id in titles_by_id
+            ]
+        serializer = TitleReadOnlySerializer(titles, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
@@ -135,5 +243,481 @@ class CategoryGenreMixin(
 ):
     """
     Миксин для работы с моделями - Category и Genre.
+    Список строится из снимка каталога (атрибут catalog_objects)
+    без запросов к базе данных, поиск по названию без учёта регистра.
+    """
+    catalog_objects = None
+
+    def list(self, request, *args, **kwargs):
+        # Параметры fields и exclude проверяются и для пустого списка
+        get_fieldset(
+            self.get_serializer_class().Meta.fields, request.query_params
+        )
+        terms = [
+            term.lower()
+            for term in filters.SearchFilter().get_search_terms(request)
+        ]
+        objects = [
+            obj for obj in getattr(get_catalog(), self.catalog_objects)
+            if all(term in obj.name.lower() for term in terms)
+        ]
+        page = self.paginate_queryset(objects)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        return Response(self.get_serializer(objects, many=True).data)
+
+
+class TitleFacetMixin(ListModelMixin):
+    """
+    Миксин для подсчёта фасетов по списку произведений.
+    """
+
+    def list(self, request, *args, **kwargs):
+        """
+        Метод дополняет ответ со списком произведений ключом facets,
+        если в запросе передан параметр facets=genre,category,year.
+        """
+        facets = request.query_params.get('facets')
+        if not facets:
+            return super().list(request, *args, **kwargs)
+        facets = list(dict.fromkeys(facets.split(',')))
+        unknown = set(facets) - set(TITLE_FACETS)
+        if unknown:
+            raise ValidationError(
+                {'facets': [f'Неизвестные фасеты: {", ".join(unknown)}']}
+            )
+        response = super().list(request, *args, **kwargs)
+        response.data['facets'] = get_title_facets(
+            self.filter_queryset(self.get_queryset()), facets
+        )
+        return response
+
+
+class TitleRankingMixin:
+    """
+    Миксин для получения лучших и популярных произведений.
+    """
+
+    def get_ranking_params(self):
+        """
+        Метод возвращает параметры рейтинга из запроса:
+        category, genre и limit (по умолчанию - размер страницы).
+        """
+        limit = self.request.query_params.get(
+            'limit', settings.REST_FRAMEWORK['PAGE_SIZE']
+        )
+        try:
+            limit = int(limit)
+        except ValueError:
+            limit = 0
+        if not 0 < limit <= settings.RANKING_SIZE:
+            raise ValidationError(
+                {'limit': [f'Допустимо от 1 до {settings.RANKING_SIZE}.']}
+            )
+        return {
+            'limit': limit,
+            'category': self.request.query_params.get('category'),
+            'genre': self.request.query_params.get('genre'),
+        }
+
+    @action(methods=['get'], detail=False)
+    def top(self, request):
+        """
+        Метод возвращает произведения с наибольшим рейтингом.
+        """
+        titles = get_top_titles(
+            self.get_queryset(), **self.get_ranking_params()
+        )
+        serializer = self.get_serializer(titles, many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    @action(methods=['get'], detail=False)
+    def trending(self, request):
+        """
+        Метод возвращает произведения с наибольшим числом отзывов
+        за последнее время.
+        """
+        titles = get_trending_titles(
+            self.get_queryset(), **self.get_ranking_params()
+        )
+        serializer = self.get_serializer(titles, many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class TitleBulkMixin(ListModelMixin):
+    """
+    Миксин для получения нескольких произведений по списку id.
+    """
+
+    def get_bulk_response(self, ids):
+        """
+        Метод возвращает произведения в порядке ids и список
+        отсутствующих id. Число запросов не зависит от числа id.
+        """
+        titles = self.get_queryset().in_bulk(ids)
+        serializer = self.get_serializer(
+            [titles[title_id] for title_id in ids if title_id in titles],
+            many=True
+        )
+        return Response(
+            {
+                'results': serializer.data,
+                'missing': [
+                    title_id for title_id in ids if title_id not in titles
+                ],
+            },
+            status=status.HTTP_200_OK
+        )
+
+    def list(self, request, *args, **kwargs):
+        """
+        Метод возвращает произведения из параметра ids=1,2,3
+        без пагинации или обычный список произведений.
+        """
+        if 'ids' not in request.query_params:
+            return super().list(request, *args, **kwargs)
+        return self.get_bulk_response(parse_ids(request.query_params['ids']))
+
+    @action(methods=['post'], detail=False,
+            permission_classes=(permissions.AllowAny,))
+    def bulk(self, request):
+        """
+        Метод возвращает произведения из списка ids в теле запроса,
+        для списков, которые не помещаются в URL.
+        """
+        data = request.data if isinstance(request.data, Mapping) else {}
+        return self.get_bulk_response(parse_ids(data.get('ids')))
+
+
+class ScoreDistributionMixin:
+    """
+    Миксин для получения распределения оценок нескольких произведений.
+    """
+
+    @action(methods=['get'], detail=False)
+    def score_distribution(self, request):
+        """
+        Метод возвращает распределение оценок от 1 до 10
+        для произведений из параметра ids=1,2,3 одним запросом.
+        """
+        ids = parse_ids(request.query_params.get('ids', ''))
+        rows = Title.objects.filter(pk__in=ids).values_list(
+            'id', *SCORE_FIELDS
+        )
+        return Response(
+            {
+                title_id: dict(zip(SCORES, histogram))
+                for title_id, *histogram in rows
+            },
+            status=status.HTTP_200_OK
+        )
+
+
+class SimilarTitlesMixin:
+    """
+    Миксин для получения похожих произведений.
+    """
+
+    @action(methods=['get'], detail=True)
+    def similar(self, request, pk):
+        """
+        Метод возвращает похожие произведения, заранее посчитанные
+        командой build_similar_titles, в порядке убывания сходства.
+        Если у произведения ещё нет оценок, возвращает похожие
+        по жанрам и категории.
+        """
+        for source in (SimilarTitle.RATINGS, SimilarTitle.GENRES):
+            titles = self.get_queryset().filter(
+                similar_to__title_id=pk, similar_to__source=source
+            ).order_by('-similar_to__score')[:settings.SIMILAR_TITLES_COUNT]
+            serializer = self.get_serializer(titles, many=True)
+            if serializer.data:
+                break
+        if not serializer.data:
+            get_object_or_404(Title, pk=pk)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class TitleIncludeMixin:
+    """
+    Миксин для встраивания отзывов и комментариев
+    в ответ с отдельным произведением.
+    """
+    TITLE_INCLUDES = ('reviews', 'comments')
+
+    def get_includes(self):
+        """
+        Метод возвращает встраиваемые данные из параметра include.
+        Комментарии встраиваются только вместе с отзывами.
+        """
+        includes = self.request.query_params.get('include')
+        if not includes:
+            return set()
+        includes = set(includes.split(','))
+        unknown = includes - set(self.TITLE_INCLUDES)
+        if unknown:
+            raise ValidationError(
+                {'include': [f'Неизвестные значения: {", ".join(unknown)}']}
+            )
+        return includes | {'reviews'}
+
+    def get_queryset(self):
+        """
+        Метод добавляет к запросу произведения загрузку первых отзывов
+        с авторами и первых комментариев к ним: по одному запросу
+        на отзывы и комментарии независимо от их количества.
+        """
+        queryset = super().get_queryset()
+        if self.action != 'retrieve':
+            return queryset
+        includes = self.get_includes()
+        if not includes:
+            return queryset
+        reviews = first_related(
+            Review.objects.select_related('author'),
+            'title_id', settings.TITLE_INCLUDE_REVIEWS
+        )
+        if 'comments' in includes:
+            reviews = reviews.prefetch_related(Prefetch(
+                'comments',
+                queryset=first_related(
+                    Comment.objects.select_related('author'),
+                    'review_id', settings.TITLE_INCLUDE_COMMENTS
+                ),
+                to_attr='preview_comments'
+            ))
+        return queryset.prefetch_related(
+            Prefetch('reviews', queryset=reviews, to_attr='preview_reviews')
+        )
+
+
+class BatchMixin(CreateModelMixin):
+    """
+    Миксин для выполнения нескольких запросов к API одним запросом.
+    """
+
+    def create(self, request):
+        """
+        Метод выполняет вложенные запросы с авторизацией родительского
+        запроса и возвращает их статусы и ответы в том же порядке.
+        """
+        serializer = BatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response(
+            execute_batch(request, serializer.validated_data['requests']),
+            status=status.HTTP_200_OK
+        )
+
+
+class SparseQuerysetMixin:
+    """
+    Миксин для загрузки из базы данных только тех связей и столбцов,
+    которые нужны полям сериализатора (с учётом fields и exclude).
+    """
+
+    def get_queryset(self):
+        """
+        Метод дополняет queryset select_related и prefetch_related
+        по полям сериализатора, а для GET-запросов ограничивает
+        загружаемые столбцы. При изменении объект загружается целиком.
+        """
+        return optimize_queryset(
+            super().get_queryset(),
+            self.get_serializer().fields.values(),
+            restrict=self.request.method == 'GET'
+        )
+
+
+class ValuesListMixin(ListModelMixin):
+    """
+    Миксин для получения списка объектов быстрым сериализатором
+    из строк values(), без создания объектов моделей.
+    """
+    values_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        """
+        Метод возвращает список объектов с пагинацией, совпадающий
+        с ответом serializer_class, с учётом параметров fields и exclude.
+        """
+        serializer = self.values_serializer_class(get_fieldset(
+            self.values_serializer_class.fields, request.query_params
+        ))
+        queryset = serializer.get_queryset(
+            self.filter_queryset(self.get_queryset())
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(
+                serializer.to_representation(page)
+            )
+        return Response(serializer.to_representation(queryset))
+
+
+class TitleFragmentListMixin(ListModelMixin):
+    """
+    Миксин для сборки списка произведений из закешированных
+    фрагментов JSON без сериализации и кодирования на каждый запрос.
+    """
+    FRAGMENT_BYPASS_PARAMS = ('facets', 'fields', 'exclude')
+
+    def list(self, request, *args, **kwargs):
+        """
+        Метод получает id произведений страницы и подставляет
+        их готовый JSON в ответ с пагинацией. Для выбора полей,
+        фасетов и не-JSON форматов используется обычный список.
+        """
+        if request.accepted_renderer.format != 'json' or any(
+            param in request.query_params
+            for param in self.FRAGMENT_BYPASS_PARAMS
+        ):
+            return super().list(request, *args, **kwargs)
+        ids = self.get_list_ids()
+        page = self.paginate_queryset(ids)
+        envelope = None
+        if page is not None:
+            ids = page
+            envelope = self.get_paginated_response([]).data
+        return HttpResponse(
+            render_page(envelope, get_title_fragments(list(ids))),
+            content_type=request.accepted_renderer.media_type
+        )
+
+    def get_list_ids(self):
+        """
+        Метод возвращает id произведений списка. Если из фильтров
+        переданы только жанры, количество считается по битовой карте
+        индекса жанров, а при порядке по id из неё же берётся страница.
+        """
+        queryset = self.get_queryset()
+        ids = self.filter_queryset(queryset).values_list('id', flat=True)
+        bitmap = get_genre_bitmap(self.request.query_params)
+        if bitmap is None:
+            return ids
+        ordering = filters.OrderingFilter().get_ordering(
+            self.request, queryset, self
+        )
+        return BitmapIds(bitmap, ordering or queryset.query.order_by, ids)
+
+
+class ConditionalGetMixin:
+    """
+    Миксин для условных GET-запросов: ответы содержат ETag
+    и Last-Modified по версиям данных из get_version_keys,
+    а на совпадающие If-None-Match и If-Modified-Since
+    возвращается 304 до выполнения запросов к базе данных.
+    """
+    conditional_per_user = False
+
+    def get_version_keys(self):
+        """
+        Метод возвращает имена версий данных ответа или None,
+        если ответ не поддерживает условные запросы.
+        """
+        return None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.state = None
+        if request.method != 'GET':
+            return
+        names = self.get_version_keys()
+        if names is None:
+            return
+        self.state = get_request_state(
+            request, names,
+            request.user if self.conditional_per_user else None
+        )
+        check_not_modified(request, *self.get_validators())
+
+    def get_validators(self):
+        digest, last_modified = self.state
+        return f'"{digest}"', last_modified
+
+    def handle_exception(self, exc):
+        if isinstance(exc, EarlyResponse):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request, response, *args, **kwargs
+        )
+        if (
+            getattr(self, 'state', None) is not None
+            and response.status_code in (200, 304)
+            and not getattr(response, 'stale', False)
+        ):
+            set_validators(response, *self.get_validators())
+        return response
+
+
+class ResponseCacheMixin(ConditionalGetMixin):
+    """
+    Миксин для кеширования ответов на GET-запросы анонимных
+    пользователей. Ключ содержит путь, параметры запроса и версии
+    данных, поэтому изменение данных делает запись недоступной.
+
+    Если single_flight, при промахе ответ строит только один запрос
+    на ключ, а остальные получают последний (устаревший) ответ
+    или ждут нового (stale-while-revalidate).
     """
-    pass
+    single_flight = False
+
+    def is_response_cached(self, request):
+        return self.state is not None and request.user.is_anonymous
+
+    def initial(self, request, *args, **kwargs):
+        self.flight = None
+        super().initial(request, *args, **kwargs)
+        if not self.is_response_cached(request):
+            return
+        key = RESPONSE_KEY.format(self.state[0])
+        response = load_response(key)
+        if response is None and self.single_flight:
+            response = self.join_flight(key)
+        if response is not None:
+            raise EarlyResponse(response)
+
+    def join_flight(self, key):
+        """
+        Метод делает запрос ведущим для key или возвращает
+        последний ответ на запрос либо результат ведущего.
+        None означает, что ответ нужно построить.
+        """
+        flight = flights.acquire(key)
+        if flight is True:
+            self.flight = key
+            return None
+        response = load_response(self.get_stale_key())
+        if response is not None:
+            response.stale = True
+            return response
+        return flights.wait(key, flight, lambda: load_response(key))
+
+    def get_stale_key(self):
+        return STALE_RESPONSE_KEY.format(get_request_key(self.request))
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request, response, *args, **kwargs
+        )
+        if (
+            getattr(self, 'state', None) is not None
+            and response.status_code == 200
+            and self.is_response_cached(request)
+            and not getattr(response, 'from_cache', False)
+        ):
+            cache_response(
+                RESPONSE_KEY.format(self.state[0]), response,
+                self.get_stale_key() if self.single_flight else None
+            )
+        return response
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            if getattr(self, 'flight', None) is not None:
+                flights.release(self.flight)
@@ -15,7 +15,7 @@ class IsModeratorOrAdminOrAuthor(permissions.BasePermission):
             or (request.user.is_authenticated
                 and (request.user.is_admin
                      or request.user.is_moderator
-                     or obj.author == request.user))
+                     or obj.author_id == request.user.pk))
         )
 
     def has_permission(self, request, view):
@@ -0,0 +1,67 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from django.utils import timezone
+
+from reviews.models import Review
+from reviews.versions import get_version
+
+TRENDING_VERSION = 'trending'
+TRENDING_KEY = 'trending:{version}:{category}:{genre}'
+
+
+def get_top_titles(queryset, limit, category=None, genre=None):
+    """
+    Возвращает произведения с наибольшим взвешенным рейтингом.
+    Рейтинг хранится в модели Title и обновляется при изменении отзывов,
+    поэтому чтение - проход по индексу (category, -weighted_rating).
+    """
+    queryset = queryset.filter(rating__isnull=False)
+    if category:
+        queryset = queryset.filter(category__slug=category)
+    if genre:
+        queryset = queryset.filter(genre__slug=genre)
+    return queryset.order_by(
+        '-weighted_rating', '-reviews_count', 'id'
+    )[:limit]
+
+
+def get_trending_title_ids(category=None, genre=None):
+    """
+    Возвращает id произведений, отсортированных по числу отзывов
+    за последние TRENDING_WINDOW.
+    Рейтинг хранится в кеше и пересчитывается при изменении отзывов
+    или по истечении TRENDING_REFRESH, чтобы окно сдвигалось со временем.
+    """
+    key = TRENDING_KEY.format(
+        version=get_version(TRENDING_VERSION),
+        category=category or '',
+        genre=genre or '',
+    )
+    ranking = cache.get(key)
+    if ranking is None:
+        reviews = Review.objects.filter(
+            pub_date__gte=timezone.now() - settings.TRENDING_WINDOW
+        )
+        if category:
+            reviews = reviews.filter(title__category__slug=category)
+        if genre:
+            reviews = reviews.filter(title__genre__slug=genre)
+        ranking = list(
+            reviews.values('title_id').annotate(
+                activity=Count('id')
+            ).order_by('-activity', 'title_id').values_list(
+                'title_id', flat=True
+            )[:settings.RANKING_SIZE]
+        )
+        cache.set(key, ranking, settings.TRENDING_REFRESH.total_seconds())
+    return ranking
+
+
+def get_trending_titles(queryset, limit, category=None, genre=None):
+    """
+    Возвращает популярные произведения в порядке рейтинга.
+    """
+    ids = get_trending_title_ids(category, genre)[:limit]
+    titles = queryset.in_bulk(ids)
+    return [titles[title_id] for title_id in ids if title_id in titles]
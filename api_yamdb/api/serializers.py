@@ -1,8 +1,14 @@
+from django.conf import settings
+from django.db import transaction
+from django.utils.encoding import smart_str
 from rest_framework import serializers
 from rest_framework.relations import SlugRelatedField
 
+from reviews.catalog import get_catalog
 from reviews.models import Category, Comment, Genre, Review, Title, User
 
+from .fieldsets import SparseFieldsMixin
+
 
 class TokenSerializer(serializers.ModelSerializer):
     """
@@ -18,7 +24,7 @@ class TokenSerializer(serializers.ModelSerializer):
         fields = ('username', 'confirmation_code')
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Сериализатор для модели - User.
     """
@@ -49,7 +55,7 @@ class UserRegisterSerializer(serializers.ModelSerializer):
         )
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Сериализатор для модели - Category.
     """
@@ -60,7 +66,7 @@ class CategorySerializer(serializers.ModelSerializer):
         lookup_url_kwarg = 'slug'
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class GenreSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Сериализатор для модели - Genre.
     """
@@ -71,33 +77,83 @@ class GenreSerializer(serializers.ModelSerializer):
         lookup_url_kwarg = 'slug'
 
 
-class TitleReadOnlySerializer(serializers.ModelSerializer):
+class TitleReadOnlySerializer(SparseFieldsMixin,
+                              serializers.ModelSerializer):
     """
     Сериализатор для GET запросов.
     """
     rating = serializers.IntegerField(
         read_only=True)
+    weighted_rating = serializers.FloatField(
+        read_only=True)
     genre = GenreSerializer(many=True)
     category = CategorySerializer()
 
     class Meta:
         model = Title
         fields = (
-            'id', 'name', 'year', 'rating', 'description', 'genre', 'category'
+            'id', 'name', 'year', 'rating', 'weighted_rating', 'description',
+            'genre', 'category'
         )
 
 
+class TitleDetailSerializer(TitleReadOnlySerializer):
+    """
+    Сериализатор для GET запроса отдельного произведения.
+    Дополнительно возвращает распределение оценок от 1 до 10
+    и первые отзывы, если они загружены в preview_reviews.
+    """
+    score_distribution = serializers.DictField(
+        child=serializers.IntegerField(),
+        read_only=True)
+
+    class Meta(TitleReadOnlySerializer.Meta):
+        fields = TitleReadOnlySerializer.Meta.fields + ('score_distribution',)
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        if hasattr(instance, 'preview_reviews'):
+            data['reviews'] = ReviewPreviewSerializer(
+                instance.preview_reviews, many=True
+            ).data
+        return data
+
+
+class CatalogSlugRelatedField(SlugRelatedField):
+    """
+    Поле категории или жанра по slug: объект ищется в снимке каталога
+    (словари ids: slug -> id и objects: id -> объект) без запроса.
+    """
+
+    def __init__(self, ids, objects, **kwargs):
+        self.ids = ids
+        self.objects = objects
+        super().__init__(slug_field='slug', **kwargs)
+
+    def to_internal_value(self, data):
+        catalog = get_catalog()
+        try:
+            return getattr(catalog, self.objects)[
+                getattr(catalog, self.ids)[data]
+            ]
+        except KeyError:
+            self.fail('does_not_exist', slug_name=self.slug_field,
+                      value=smart_str(data))
+        except TypeError:
+            self.fail('invalid')
+
+
 class TitleSerializer(serializers.ModelSerializer):
     """
     Сериализатор для POST, PATCH и DELETE запросов.
     """
-    genre = SlugRelatedField(
-        slug_field='slug',
+    genre = CatalogSlugRelatedField(
+        'genre_ids', 'genres_by_id',
         many=True,
         queryset=Genre.objects.all(),
     )
-    category = SlugRelatedField(
-        slug_field='slug',
+    category = CatalogSlugRelatedField(
+        'category_ids', 'categories_by_id',
         queryset=Category.objects.all()
     )
 
@@ -114,11 +170,23 @@ class TitleSerializer(serializers.ModelSerializer):
             )
         return value
 
+    @transaction.atomic
+    def create(self, validated_data):
+        """
+        Произведение и его жанры сохраняются в одной транзакции,
+        чтобы связанные данные пересчитывались один раз.
+        """
+        return super().create(validated_data)
+
+    @transaction.atomic
+    def update(self, instance, validated_data):
+        return super().update(instance, validated_data)
+
     def to_representation(self, instance):
         return TitleReadOnlySerializer(instance).data
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Сериализатор для модели Review, представляет поля:
     id title, text, author, score и pub_date.
@@ -147,7 +215,7 @@ class ReviewSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Сериализатор для модели Comment, представляет поля:
     id review, text, author и pub_date.
@@ -160,3 +228,55 @@ class CommentSerializer(serializers.ModelSerializer):
         fields = fields = (
             'id', 'text', 'author', 'pub_date'
         )
+
+
+class ReviewPreviewSerializer(ReviewSerializer):
+    """
+    Сериализатор отзыва, встроенного в ответ с произведением.
+    Дополнительно возвращает первые комментарии,
+    если они загружены в preview_comments.
+    """
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        if hasattr(instance, 'preview_comments'):
+            data['comments'] = CommentSerializer(
+                instance.preview_comments, many=True
+            ).data
+        return data
+
+
+class BatchRequestSerializer(serializers.Serializer):
+    """
+    Сериализатор вложенного запроса: метод, путь и тело.
+    """
+    method = serializers.ChoiceField(
+        choices=('GET', 'POST', 'PATCH', 'DELETE'))
+    path = serializers.RegexField(r'^/api/')
+    body = serializers.JSONField(required=False)
+
+
+class BatchSerializer(serializers.Serializer):
+    """
+    Сериализатор пакета вложенных запросов.
+    """
+    requests = serializers.ListField(
+        child=BatchRequestSerializer(),
+        min_length=1,
+        max_length=settings.BATCH_MAX_REQUESTS)
+
+
+class RefreshSerializer(serializers.Serializer):
+    """
+    Сериализатор для обновления токена доступа.
+    """
+    refresh = serializers.CharField()
+
+
+class LogoutSerializer(serializers.Serializer):
+    """
+    Сериализатор для отзыва токена: текущего (и токена обновления
+    refresh, если передан) или, если all, всех токенов пользователя.
+    """
+    all = serializers.BooleanField(default=False)
+    refresh = serializers.CharField(required=False)
@@ -0,0 +1,51 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from reviews.models import Genre, Review, Title
+from reviews.versions import bump_version_on_commit
+from .genre_index import genre_index
+from .rankings import TRENDING_VERSION
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def update_genre_index(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Обновляет индекс жанров при изменении жанров произведения.
+    """
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if reverse:
+        genre_index.invalidate()
+    elif action == 'post_clear':
+        genre_index.remove(instance.pk)
+    else:
+        slugs = Genre.objects.filter(pk__in=pk_set).values_list(
+            'slug', flat=True
+        )
+        if action == 'post_add':
+            genre_index.add(instance.pk, slugs)
+        else:
+            genre_index.remove(instance.pk, slugs)
+
+
+@receiver(post_delete, sender=Title)
+def remove_title_from_genre_index(sender, instance, **kwargs):
+    genre_index.remove(instance.pk)
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def invalidate_genre_index(sender, instance, created=False, **kwargs):
+    if not created:
+        genre_index.invalidate()
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def invalidate_trending(sender, instance, created=True, **kwargs):
+    """
+    Сбрасывает рейтинг популярных произведений при появлении
+    или удалении отзыва.
+    """
+    if created:
+        bump_version_on_commit(TRENDING_VERSION)
@@ -0,0 +1,68 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+LEASE_KEY = 'lease:{}'
+
+
+class SingleFlight:
+    """
+    Гарантирует, что значение для одного ключа вычисляет только один
+    запрос (ведущий), а остальные ждут его результата.
+    Внутри процесса ведомые потоки ждут события, между процессами
+    ведущий удерживает аренду в кеше (cache.add атомарен), которая
+    истекает через SINGLE_FLIGHT_TIMEOUT, если процесс завершился.
+    """
+
+    def __init__(self):
+        self.guard = threading.Lock()
+        self.flights = {}
+
+    def acquire(self, key):
+        """
+        Возвращает True, если вызывающий стал ведущим для key.
+        Иначе возвращает событие завершения ведущего потока этого
+        процесса или None, если ведущий - другой процесс.
+        """
+        with self.guard:
+            event = self.flights.get(key)
+            if event is not None:
+                return event
+            if not cache.add(
+                LEASE_KEY.format(key), True,
+                timeout=settings.SINGLE_FLIGHT_TIMEOUT
+            ):
+                return None
+            self.flights[key] = threading.Event()
+            return True
+
+    def release(self, key):
+        """
+        Снимает аренду и будит ожидающие потоки процесса.
+        """
+        cache.delete(LEASE_KEY.format(key))
+        with self.guard:
+            self.flights.pop(key).set()
+
+    def wait(self, key, event, fetch):
+        """
+        Ждёт результата ведущего и возвращает fetch() или None,
+        если ведущий завершился без результата или время ожидания
+        SINGLE_FLIGHT_TIMEOUT истекло.
+        """
+        deadline = time.monotonic() + settings.SINGLE_FLIGHT_TIMEOUT
+        while time.monotonic() < deadline:
+            if event is not None:
+                finished = event.wait(deadline - time.monotonic())
+            else:
+                time.sleep(settings.SINGLE_FLIGHT_POLL)
+                finished = not cache.has_key(LEASE_KEY.format(key))
+            result = fetch()
+            if result is not None or finished:
+                return result
+        return None
+
+
+flights = SingleFlight()
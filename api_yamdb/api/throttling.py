@@ -0,0 +1,69 @@
+import hashlib
+import math
+import time
+from collections.abc import Mapping
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import BaseThrottle
+
+THROTTLE_KEY = 'throttle:{}:{}:{}'
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Ограничение частоты запросов корзинами токенов по IP-адресу,
+    имени пользователя и почте из тела запроса. Каждая корзина
+    вмещает AUTH_THROTTLE_BURST запросов и пополняется на один запрос
+    за AUTH_THROTTLE_REFILL_INTERVAL. Запрос проходит, если во всех
+    его корзинах есть токен. Корзины разных представлений независимы
+    (атрибут throttle_scope представления). Чтение и запись корзин
+    не атомарны, поэтому при одновременных запросах ограничение
+    приблизительное.
+    """
+    fields = ('username', 'email')
+    timer = time.time
+
+    def get_keys(self, request, scope):
+        values = [('ip', self.get_ident(request))]
+        # Тело запроса ещё не проверено сериализатором
+        # и может быть не объектом (например, списком)
+        data = request.data if isinstance(request.data, Mapping) else {}
+        for field in self.fields:
+            value = data.get(field)
+            if isinstance(value, str) and value:
+                values.append((field, value.lower()))
+        return [
+            THROTTLE_KEY.format(scope, field, hashlib.blake2b(
+                value.encode(), digest_size=16
+            ).hexdigest())
+            for field, value in values
+        ]
+
+    def allow_request(self, request, view):
+        self.delay = None
+        scope = getattr(view, 'throttle_scope', None)
+        if scope is None:
+            return True
+        cache = caches[settings.THROTTLE_CACHE]
+        burst = settings.AUTH_THROTTLE_BURST
+        interval = settings.AUTH_THROTTLE_REFILL_INTERVAL.total_seconds()
+        now = self.timer()
+        keys = self.get_keys(request, scope)
+        buckets = cache.get_many(keys)
+        levels = {}
+        for key in keys:
+            tokens, updated = buckets.get(key, (burst, now))
+            levels[key] = min(burst, tokens + (now - updated) / interval)
+        lowest = min(levels.values())
+        if lowest < 1:
+            self.delay = (1 - lowest) * interval
+            return False
+        cache.set_many(
+            {key: (tokens - 1, now) for key, tokens in levels.items()},
+            timeout=math.ceil(burst * interval)
+        )
+        return True
+
+    def wait(self):
+        return self.delay
@@ -1,8 +1,9 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from .views import (CategoryViewSet, CommentViewSet, GenreViewSet,
-                    GetTokenViewSet, RegisterViewSet, ReviewViewSet,
+from .views import (BatchViewSet, CategoryViewSet, CommentViewSet,
+                    GenreViewSet, GetTokenViewSet, LogoutViewSet,
+                    RefreshTokenViewSet, RegisterViewSet, ReviewViewSet,
                     TitleViewSet, UserViewSet)
 
 router = DefaultRouter()
@@ -28,4 +29,19 @@ urlpatterns = [
         GetTokenViewSet.as_view({'post': 'create'}),
         name='token'
     ),
+    path(
+        'v1/auth/token/refresh/',
+        RefreshTokenViewSet.as_view({'post': 'create'}),
+        name='token_refresh'
+    ),
+    path(
+        'v1/auth/logout/',
+        LogoutViewSet.as_view({'post': 'create'}),
+        name='logout'
+    ),
+    path(
+        'v1/batch/',
+        BatchViewSet.as_view({'post': 'create'}),
+        name='batch'
+    ),
 ]
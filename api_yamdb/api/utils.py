@@ -1,18 +1,25 @@
+from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator
+from django.core.cache import caches
 from django.core.mail import send_mail
-from django.shortcuts import get_object_or_404
+from django.db.models import OuterRef, Subquery
+from rest_framework.exceptions import ValidationError
 
-from reviews.models import User
+CONFIRMATION_KEY = 'confirmation:{}'
 
 
-def send_confirmation_code(request):
+def send_confirmation_code(user):
     """
     Функция отправки пользователю кода подтверждения на электронную почту.
+    Повторный код не отправляется раньше, чем через
+    CONFIRMATION_RESEND_COOLDOWN после предыдущего.
+    Возвращает True, если письмо отправлено.
     """
-    user = get_object_or_404(
-        User,
-        username=request.data.get('username'),
-    )
+    if not caches[settings.THROTTLE_CACHE].add(
+        CONFIRMATION_KEY.format(user.pk), True,
+        timeout=settings.CONFIRMATION_RESEND_COOLDOWN.total_seconds()
+    ):
+        return False
     confirmation_code = default_token_generator.make_token(user)
     send_mail(
         subject='YaMDb registration',
@@ -20,3 +27,38 @@ def send_confirmation_code(request):
         from_email=None,
         recipient_list=[user.email],
     )
+    return True
+
+
+def parse_ids(value, field='ids'):
+    """
+    Функция разбирает список id через запятую из параметра запроса
+    (или список id из тела запроса).
+    Повторы отбрасываются с сохранением порядка.
+    """
+    if not isinstance(value, list):
+        value = str(value).split(',')
+    try:
+        ids = list(dict.fromkeys(
+            int(title_id) for title_id in value if title_id != ''
+        ))
+    except (TypeError, ValueError):
+        raise ValidationError({field: ['Ожидается список целых чисел.']})
+    if not ids or len(ids) > settings.TITLES_BULK_LIMIT:
+        raise ValidationError({field: [
+            f'Допустимо от 1 до {settings.TITLES_BULK_LIMIT} id.'
+        ]})
+    return ids
+
+
+def first_related(queryset, field, limit):
+    """
+    Функция ограничивает queryset первыми limit объектами (по id)
+    для каждого значения поля field. Используется в Prefetch:
+    лимит применяется коррелированным подзапросом внутри одного запроса.
+    """
+    return queryset.filter(id__in=Subquery(
+        queryset.model.objects.filter(
+            **{field: OuterRef(field)}
+        ).order_by('id').values('id')[:limit]
+    )).order_by('id')
@@ -1,25 +1,38 @@
-from django.db.models import Avg
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, permissions, viewsets
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.renderers import JSONRenderer
 
 from reviews.models import Category, Comment, Genre, Review, Title, User
+from reviews.versions import (CATALOG_VERSION, CATEGORIES_VERSION,
+                              COMMENTS_VERSION, GENRES_VERSION,
+                              REVIEWS_VERSION, TITLE_VERSION, TITLES_VERSION,
+                              USER_LIST_VERSION, USERS_VERSION)
 
+from .fast_serializers import (CommentValuesSerializer,
+                               ReviewValuesSerializer, TitleValuesSerializer)
 from .filters import TitleFilter
-from .mixins import (CategoryGenreMixin, GetTokenMixin, UserModelMixin,
-                     UserRegisterMixin)
+from .mixins import (BatchMixin, CategoryGenreMixin, ConditionalGetMixin,
+                     GetTokenMixin, LogoutMixin, RefreshTokenMixin,
+                     ResponseCacheMixin, ScoreDistributionMixin,
+                     SimilarTitlesMixin, SparseQuerysetMixin, TitleBulkMixin,
+                     TitleFacetMixin, TitleFragmentListMixin,
+                     TitleIncludeMixin, TitleRankingMixin, UserModelMixin,
+                     UserRegisterMixin, ValuesListMixin)
 from .permissions import (IsAdminOrReadOnly, IsAuthenticatedAdmin,
                           IsModeratorOrAdminOrAuthor)
 from .serializers import (CategorySerializer, CommentSerializer,
                           GenreSerializer, ReviewSerializer,
-                          TitleReadOnlySerializer, TitleSerializer,
+                          TitleDetailSerializer, TitleReadOnlySerializer,
+                          TitleSerializer,
                           TokenSerializer, UserRegisterSerializer,
                           UserSerializer)
+from .throttling import TokenBucketThrottle
 
 
-class UserViewSet(UserModelMixin,
+class UserViewSet(ConditionalGetMixin, UserModelMixin, SparseQuerysetMixin,
                   viewsets.GenericViewSet):
     """
     Вьюсет для для работы с моделью - User.
@@ -29,6 +42,12 @@ class UserViewSet(UserModelMixin,
     permission_classes = (IsAuthenticatedAdmin,)
     filter_backends = (filters.SearchFilter,)
     search_fields = ('username',)
+    conditional_per_user = True
+
+    def get_version_keys(self):
+        if self.action in ('list', 'get_user_profile', 'get_own_profile'):
+            return [USER_LIST_VERSION]
+        return None
 
 
 class RegisterViewSet(UserRegisterMixin,
@@ -39,6 +58,8 @@ class RegisterViewSet(UserRegisterMixin,
     queryset = User.objects.all()
     serializer_class = UserRegisterSerializer
     permission_classes = (permissions.AllowAny,)
+    throttle_classes = (TokenBucketThrottle,)
+    throttle_scope = 'signup'
 
 
 class GetTokenViewSet(GetTokenMixin,
@@ -49,60 +70,128 @@ class GetTokenViewSet(GetTokenMixin,
     queryset = User.objects.all()
     serializer_class = TokenSerializer
     permission_classes = (permissions.AllowAny,)
+    throttle_classes = (TokenBucketThrottle,)
+    throttle_scope = 'token'
 
 
-class CategoryViewSet(CategoryGenreMixin,
-                      viewsets.GenericViewSet):
+class RefreshTokenViewSet(RefreshTokenMixin,
+                          viewsets.GenericViewSet):
+    """
+    Вьюсет для обновления JWT токена доступа.
+    """
+    permission_classes = (permissions.AllowAny,)
+
+
+class LogoutViewSet(LogoutMixin,
+                    viewsets.GenericViewSet):
+    """
+    Вьюсет для отзыва JWT токенов.
+    """
+    permission_classes = (permissions.IsAuthenticated,)
+
+
+class CategoryViewSet(ResponseCacheMixin, CategoryGenreMixin,
+                      SparseQuerysetMixin, viewsets.GenericViewSet):
     """
     Вьюсет для Category.
     """
     queryset = Category.objects.order_by('id')
     serializer_class = CategorySerializer
+    catalog_objects = 'categories'
     permission_classes = (IsAdminOrReadOnly,)
     pagination_class = PageNumberPagination
     filter_backends = (filters.SearchFilter,)
     search_fields = ('name',)
     lookup_field = 'slug'
 
+    def get_version_keys(self):
+        return [CATEGORIES_VERSION]
 
-class GenreViewSet(CategoryGenreMixin,
-                   viewsets.GenericViewSet):
+
+class GenreViewSet(ResponseCacheMixin, CategoryGenreMixin,
+                   SparseQuerysetMixin, viewsets.GenericViewSet):
     """
     Вьюсет для Genre.
     """
     queryset = Genre.objects.order_by('id')
     serializer_class = GenreSerializer
+    catalog_objects = 'genres'
     permission_classes = (IsAdminOrReadOnly,)
     pagination_class = PageNumberPagination
     filter_backends = (filters.SearchFilter,)
     search_fields = ('name',)
     lookup_field = 'slug'
 
+    def get_version_keys(self):
+        return [GENRES_VERSION]
 
-class TitleViewSet(viewsets.ModelViewSet):
+
+class TitleViewSet(ResponseCacheMixin, TitleBulkMixin, TitleFacetMixin,
+                   TitleRankingMixin,
+                   ScoreDistributionMixin, SimilarTitlesMixin,
+                   TitleIncludeMixin, TitleFragmentListMixin,
+                   ValuesListMixin, SparseQuerysetMixin,
+                   viewsets.ModelViewSet):
     """
     Вьюсет для Title.
-    Подсчитывает рейтинг для каждого произведения.
+    Рейтинг и взвешенный рейтинг произведения хранятся в модели
+    и обновляются при изменении отзывов.
+    По параметру facets возвращает количество произведений
+    по жанрам, категориям и годам, /top/ и /trending/ - лучшие
+    и популярные произведения, /score_distribution/ - распределение
+    оценок нескольких произведений, /{id}/similar/ - похожие произведения.
+    По параметру include=reviews,comments в ответ с произведением
+    встраиваются первые отзывы и комментарии к ним.
+    Связи и столбцы загружаются по полям ответа (fields и exclude),
+    список строится из закешированного JSON произведений
+    или быстрым сериализатором из строк values().
+    По параметру ids=1,2,3 (или POST /bulk/) возвращает произведения
+    из списка в заданном порядке.
+    Списки и отдельные произведения поддерживают условные запросы,
+    ответ на промах кеша строит только один запрос.
     """
-    queryset = Title.objects.all().annotate(
-        rating=Avg('reviews__score')
-    ).order_by('name')
+    TITLE_LIST_ACTIONS = ('list', 'top', 'score_distribution')
+    single_flight = True
+    queryset = Title.objects.order_by('name')
+    values_serializer_class = TitleValuesSerializer
     permission_classes = (IsAdminOrReadOnly,)
     pagination_class = PageNumberPagination
     http_method_names = ('get', 'post', 'patch', 'delete')
-    filter_backends = (DjangoFilterBackend,)
+    filter_backends = (DjangoFilterBackend, filters.OrderingFilter)
     filterset_class = TitleFilter
+    ordering_fields = ('id', 'name', 'year', 'rating', 'weighted_rating')
 
     def get_serializer_class(self):
         """
         Выбор Serializer при безопасных методах и нет.
         """
-        if self.request.method == 'GET':
+        if self.action == 'retrieve':
+            return TitleDetailSerializer
+        if self.request.method == 'GET' or self.action == 'bulk':
             return TitleReadOnlySerializer
         return TitleSerializer
 
+    def get_version_keys(self):
+        """
+        Версии данных списков произведений и отдельного произведения
+        (со встроенными отзывами - и версии отзывов).
+        """
+        if self.action in self.TITLE_LIST_ACTIONS:
+            return [TITLES_VERSION, CATALOG_VERSION]
+        if self.action != 'retrieve':
+            return None
+        title_id = self.kwargs['pk']
+        names = [TITLE_VERSION.format(title_id), CATALOG_VERSION]
+        if self.request.query_params.get('include'):
+            names += [
+                REVIEWS_VERSION.format(title_id), COMMENTS_VERSION,
+                USERS_VERSION
+            ]
+        return names
+
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(ResponseCacheMixin, ValuesListMixin,
+                    SparseQuerysetMixin, viewsets.ModelViewSet):
     """
     Вьюсет для работы с моделью - Review.
 
@@ -113,11 +202,20 @@ class ReviewViewSet(viewsets.ModelViewSet):
     """
     queryset = Review.objects.order_by('id')
     serializer_class = ReviewSerializer
+    values_serializer_class = ReviewValuesSerializer
     http_method_names = ('get', 'post', 'patch', 'delete')
     permission_classes = (IsModeratorOrAdminOrAuthor,)
     lookup_field = 'pk'
     lookup_url_kwarg = 'review_id'
 
+    single_flight = True
+
+    def get_version_keys(self):
+        return [
+            REVIEWS_VERSION.format(self.kwargs.get('title_id')),
+            USERS_VERSION
+        ]
+
     def get_title(self):
         """
         Метод возвращает объект Title, соответствующий title_id из URL.
@@ -130,7 +228,7 @@ class ReviewViewSet(viewsets.ModelViewSet):
         Метод возвращает queryset отзывов, отфильтрованных по
         id произведения и отсортированных по id отзывов.
         """
-        return self.queryset.filter(title_id=self.get_title())
+        return super().get_queryset().filter(title_id=self.get_title())
 
     def perform_create(self, serializer):
         """
@@ -155,7 +253,8 @@ class ReviewViewSet(viewsets.ModelViewSet):
         return obj
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(ResponseCacheMixin, ValuesListMixin,
+                     SparseQuerysetMixin, viewsets.ModelViewSet):
     """
     Вьюсет для работы с моделью - Comment.
 
@@ -166,11 +265,15 @@ class CommentViewSet(viewsets.ModelViewSet):
     """
     queryset = Comment.objects.order_by('id')
     serializer_class = CommentSerializer
+    values_serializer_class = CommentValuesSerializer
     http_method_names = ('get', 'post', 'patch', 'delete')
     permission_classes = (IsModeratorOrAdminOrAuthor,)
     lookup_field = 'pk'
     lookup_url_kwarg = 'comment_id'
 
+    def get_version_keys(self):
+        return [COMMENTS_VERSION, USERS_VERSION]
+
     def perform_create(self, serializer):
         """
         Метод устанавливает автора при создании комментария.
@@ -178,3 +281,14 @@ class CommentViewSet(viewsets.ModelViewSet):
         review = get_object_or_404(
             Review, id=self.kwargs.get('review_id'))
         serializer.save(author=self.request.user, review=review)
+
+
+class BatchViewSet(BatchMixin,
+                   viewsets.GenericViewSet):
+    """
+    Вьюсет для пакетного выполнения запросов.
+    Права проверяются для каждого вложенного запроса.
+    """
+    permission_classes = (permissions.AllowAny,)
+    # Ответ пакета и вложенные ответы - только JSON
+    renderer_classes = (JSONRenderer,)
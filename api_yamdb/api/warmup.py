@@ -0,0 +1,133 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.conf import settings
+from django.db import connections
+
+from reviews.catalog import get_catalog
+from reviews.models import Category, Title
+from .fragments import get_title_fragments
+from .rankings import get_top_titles, get_trending_title_ids
+
+logger = logging.getLogger(__name__)
+
+# Порядки списка произведений, первые страницы которых загружаются в кеш
+WARM_TITLE_ORDERINGS = (
+    ('name',),
+    ('-weighted_rating', '-reviews_count', 'id'),
+    ('-rating', 'id'),
+)
+
+
+def warm_catalog():
+    catalog = get_catalog()
+    return len(catalog.categories) + len(catalog.genres)
+
+
+def warm_title_pages(ordering, pages, page_size):
+    """
+    Загружает в кеш JSON произведений первых pages страниц списка.
+    """
+    ids = list(Title.objects.order_by(*ordering).values_list(
+        'id', flat=True
+    )[:pages * page_size])
+    for start in range(0, len(ids), page_size):
+        get_title_fragments(ids[start:start + page_size])
+    return len(ids)
+
+
+def warm_top_titles(category=None):
+    """
+    Загружает в кеш лучшие и популярные произведения (в категории).
+    """
+    ids = set(get_trending_title_ids(category))
+    ids.update(get_top_titles(
+        Title.objects.all(), settings.RANKING_SIZE, category
+    ).values_list('id', flat=True))
+    get_title_fragments(list(ids))
+    return len(ids)
+
+
+def get_warm_tasks(pages, local=False):
+    """
+    Возвращает задачи прогрева: (название, функция, аргументы).
+    local - добавить данные, которые хранятся в памяти текущего
+    процесса (снимок каталога): их имеет смысл загружать только
+    в процессе, который будет обслуживать запросы.
+    """
+    page_size = settings.REST_FRAMEWORK['PAGE_SIZE']
+    tasks = [('catalog', warm_catalog, ())] if local else []
+    tasks.extend(
+        (f'titles ordering={",".join(ordering)}', warm_title_pages,
+         (ordering, pages, page_size))
+        for ordering in WARM_TITLE_ORDERINGS
+    )
+    tasks.append(('top', warm_top_titles, ()))
+    tasks.extend(
+        (f'top category={slug}', warm_top_titles, (slug,))
+        for slug in Category.objects.order_by('id').values_list(
+            'slug', flat=True
+        )
+    )
+    return tasks
+
+
+def run_task(function, args):
+    """
+    Выполняет задачу в потоке пула и возвращает количество объектов
+    и время выполнения, закрывая открытые в потоке соединения.
+    """
+    started = time.monotonic()
+    try:
+        return function(*args), time.monotonic() - started
+    finally:
+        connections.close_all()
+
+
+def warm_cache(pages, workers, report=None, local=False):
+    """
+    Выполняет задачи прогрева кеша в пуле из workers потоков
+    и вызывает report(название, количество, время) по мере
+    их завершения. Возвращает количество выполненных задач.
+    """
+    tasks = get_warm_tasks(pages, local)
+    with ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix='warm'
+    ) as executor:
+        futures = {
+            executor.submit(run_task, function, args): name
+            for name, function, args in tasks
+        }
+        for future in as_completed(futures):
+            count, elapsed = future.result()
+            if report is not None:
+                report(futures[future], count, elapsed)
+    return len(tasks)
+
+
+def log_report(name, count, elapsed):
+    logger.info('Прогрев кеша %s: %d объектов за %.2f с',
+                name, count, elapsed)
+
+
+def warm_cache_in_background():
+    """
+    Запускает прогрев кеша и данных в памяти процесса в фоновом
+    потоке, не задерживая запуск процесса. Ошибки записываются в журнал.
+    """
+    def warm():
+        try:
+            warm_cache(
+                settings.WARM_CACHE_PAGES, settings.WARM_CACHE_WORKERS,
+                log_report, local=True
+            )
+        except Exception:
+            logger.exception('Ошибка прогрева кеша')
+        finally:
+            connections.close_all()
+
+    thread = threading.Thread(target=warm, name='warm-cache', daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,248 @@
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS cache ('
+    ' key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL,'
+    ' accessed REAL NOT NULL, size INTEGER NOT NULL)',
+    'CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed)',
+    'CREATE TABLE IF NOT EXISTS cache_stats ('
+    ' id INTEGER PRIMARY KEY CHECK (id = 0),'
+    ' entries INTEGER NOT NULL, size INTEGER NOT NULL)',
+    'INSERT OR IGNORE INTO cache_stats VALUES (0, 0, 0)',
+    'CREATE TRIGGER IF NOT EXISTS cache_insert AFTER INSERT ON cache BEGIN'
+    ' UPDATE cache_stats SET entries = entries + 1,'
+    ' size = size + new.size; END',
+    'CREATE TRIGGER IF NOT EXISTS cache_delete AFTER DELETE ON cache BEGIN'
+    ' UPDATE cache_stats SET entries = entries - 1,'
+    ' size = size - old.size; END',
+    'CREATE TRIGGER IF NOT EXISTS cache_update AFTER UPDATE OF size'
+    ' ON cache BEGIN'
+    ' UPDATE cache_stats SET size = size - old.size + new.size; END',
+)
+UPSERT = (
+    'INSERT INTO cache (key, value, expires, accessed, size)'
+    ' VALUES (?, ?, ?, ?, ?) ON CONFLICT (key) DO UPDATE SET'
+    ' value = excluded.value, expires = excluded.expires,'
+    ' accessed = excluded.accessed, size = excluded.size'
+)
+STATS = 'SELECT entries, size FROM cache_stats'
+# Самые давно читавшиеся записи, удаление которых освобождает
+# не меньше ? байт и ? записей
+EVICT = (
+    'DELETE FROM cache WHERE key IN (SELECT key FROM ('
+    ' SELECT key, size, SUM(size) OVER oldest AS freed,'
+    ' ROW_NUMBER() OVER oldest AS number FROM cache'
+    ' WINDOW oldest AS (ORDER BY accessed, rowid))'
+    ' WHERE freed - size < ?1 OR number <= ?2)'
+)
+# Ограничение SQLite на количество параметров в запросе
+MAX_VARIABLES = 500
+
+
+def is_alive(expires, now):
+    return expires is None or expires > now
+
+
+class SQLiteCache(BaseCache):
+    """
+    Кеш в файле SQLite в режиме WAL, общий для всех процессов
+    на одном сервере: читатели не блокируют друг друга и писателя,
+    запись выполняется в транзакциях BEGIN IMMEDIATE.
+
+    Размер ограничен опциями MAX_SIZE (байт) и MAX_ENTRIES: при
+    превышении удаляются просроченные записи, а затем записи,
+    которые дольше всего не читались (LRU), пока не освободится
+    1 / CULL_FREQUENCY от ограничения. Время чтения обновляется
+    не чаще раза в ACCESS_RESOLUTION секунд, чтобы чтения почти
+    не превращались в запись.
+    """
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self.location = str(location)
+        self.max_size = int(options.get('MAX_SIZE', 64 * 1024 * 1024))
+        self.access_resolution = float(options.get('ACCESS_RESOLUTION', 1))
+        self.busy_timeout = float(options.get('BUSY_TIMEOUT', 10))
+        self.local = threading.local()
+
+    def get_connection(self):
+        """
+        Возвращает соединение текущего потока. После fork дочерний
+        процесс открывает собственное соединение.
+        """
+        pid = os.getpid()
+        if getattr(self.local, 'pid', None) != pid:
+            connection = sqlite3.connect(
+                self.location, timeout=self.busy_timeout,
+                isolation_level=None
+            )
+            connection.execute('PRAGMA journal_mode = WAL')
+            connection.execute('PRAGMA synchronous = NORMAL')
+            with self.transaction(connection):
+                for statement in SCHEMA:
+                    connection.execute(statement)
+            self.local.pid, self.local.connection = pid, connection
+        return self.local.connection
+
+    @contextmanager
+    def transaction(self, connection=None):
+        connection = connection or self.get_connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            yield connection
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        connection.execute('COMMIT')
+
+    def make_valid_key(self, key, version=None):
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        return key
+
+    def fetch(self, keys):
+        """
+        Возвращает непросроченные значения keys и обновляет время
+        чтения у давно не читавшихся записей.
+        """
+        connection = self.get_connection()
+        now = time.time()
+        rows, touched = {}, []
+        for start in range(0, len(keys), MAX_VARIABLES):
+            chunk = keys[start:start + MAX_VARIABLES]
+            for key, value, expires, accessed in connection.execute(
+                'SELECT key, value, expires, accessed FROM cache'
+                f' WHERE key IN ({", ".join("?" * len(chunk))})', chunk
+            ):
+                if not is_alive(expires, now):
+                    continue
+                rows[key] = value
+                if accessed < now - self.access_resolution:
+                    touched.append(key)
+        if touched:
+            with self.transaction(connection):
+                connection.executemany(
+                    'UPDATE cache SET accessed = ? WHERE key = ?',
+                    [(now, key) for key in touched]
+                )
+        return {key: pickle.loads(value) for key, value in rows.items()}
+
+    def store(self, connection, items, timeout):
+        now = time.time()
+        expires = self.get_backend_timeout(timeout)
+        rows = []
+        for key, value in items:
+            data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+            rows.append((key, data, expires, now, len(key) + len(data)))
+        connection.executemany(UPSERT, rows)
+        self.evict(connection, now)
+
+    def evict(self, connection, now):
+        """
+        Удаляет просроченные, а затем давно не читавшиеся записи,
+        пока кеш превышает ограничения по размеру и количеству.
+        """
+        entries, size = connection.execute(STATS).fetchone()
+        if entries <= self._max_entries and size <= self.max_size:
+            return
+        connection.execute('DELETE FROM cache WHERE expires <= ?', (now,))
+        entries, size = connection.execute(STATS).fetchone()
+        connection.execute(EVICT, (
+            size - self.max_size + self.max_size // self._cull_frequency,
+            entries - self._max_entries
+            + self._max_entries // self._cull_frequency
+        ))
+
+    def get(self, key, default=None, version=None):
+        key = self.make_valid_key(key, version)
+        return self.fetch([key]).get(key, default)
+
+    def get_many(self, keys, version=None):
+        keys = {self.make_valid_key(key, version): key for key in keys}
+        return {
+            keys[key]: value
+            for key, value in self.fetch(list(keys)).items()
+        }
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_valid_key(key, version)
+        with self.transaction() as connection:
+            self.store(connection, [(key, value)], timeout)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        items = [
+            (self.make_valid_key(key, version), value)
+            for key, value in data.items()
+        ]
+        with self.transaction() as connection:
+            self.store(connection, items, timeout)
+        return []
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_valid_key(key, version)
+        with self.transaction() as connection:
+            row = connection.execute(
+                'SELECT expires FROM cache WHERE key = ?', (key,)
+            ).fetchone()
+            if row is not None and is_alive(row[0], time.time()):
+                return False
+            self.store(connection, [(key, value)], timeout)
+        return True
+
+    def incr(self, key, delta=1, version=None):
+        key = self.make_valid_key(key, version)
+        with self.transaction() as connection:
+            row = connection.execute(
+                'SELECT value, expires FROM cache WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None or not is_alive(row[1], time.time()):
+                raise ValueError(f"Key '{key}' not found")
+            value = pickle.loads(row[0]) + delta
+            data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+            connection.execute(
+                'UPDATE cache SET value = ?, size = ? WHERE key = ?',
+                (data, len(key) + len(data), key)
+            )
+        return value
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_valid_key(key, version)
+        with self.transaction() as connection:
+            return connection.execute(
+                'UPDATE cache SET expires = ? WHERE key = ?'
+                ' AND (expires IS NULL OR expires > ?)',
+                (self.get_backend_timeout(timeout), key, time.time())
+            ).rowcount == 1
+
+    def has_key(self, key, version=None):
+        key = self.make_valid_key(key, version)
+        row = self.get_connection().execute(
+            'SELECT expires FROM cache WHERE key = ?', (key,)
+        ).fetchone()
+        return row is not None and is_alive(row[0], time.time())
+
+    def delete(self, key, version=None):
+        key = self.make_valid_key(key, version)
+        with self.transaction() as connection:
+            return connection.execute(
+                'DELETE FROM cache WHERE key = ?', (key,)
+            ).rowcount == 1
+
+    def delete_many(self, keys, version=None):
+        keys = [self.make_valid_key(key, version) for key in keys]
+        with self.transaction() as connection:
+            connection.executemany(
+                'DELETE FROM cache WHERE key = ?', [(key,) for key in keys]
+            )
+
+    def clear(self):
+        with self.transaction() as connection:
+            connection.execute('DELETE FROM cache')
@@ -121,7 +121,7 @@ EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.RoleJWTAuthentication',
     ],
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
@@ -130,7 +130,100 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 10,
 }
 
+# Токен доступа живёт недолго, поэтому его утверждения о роли
+# можно проверять без базы данных; токен обновления - неделю
 SIMPLE_JWT = {
-    'ACCESS_TOKEN_LIFETIME': timedelta(days=7),
+    'ACCESS_TOKEN_LIFETIME': timedelta(minutes=5),
+    'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
+
+# Рейтинги произведений: длина сохраняемого рейтинга,
+# окно активности для популярных произведений и период его обновления
+RANKING_SIZE = 100
+TRENDING_WINDOW = timedelta(days=7)
+TRENDING_REFRESH = timedelta(minutes=10)
+
+# Взвешенный рейтинг произведений (как в IMDb):
+# (v * R + m * C) / (v + m), где C - априорная средняя оценка,
+# m - минимальное количество отзывов для доверия среднему R
+RATING_PRIOR_MEAN = 5.5
+RATING_MIN_VOTES = 10
+
+# Максимальное количество id произведений в одном запросе
+TITLES_BULK_LIMIT = 100
+
+# Количество похожих произведений, которое хранится для каждого произведения
+SIMILAR_TITLES_COUNT = 20
+
+# Количество рекомендаций, которое команда train_recommendations
+# сохраняет для каждого пользователя (с запасом на новые отзывы),
+# и количество произведений с наибольшим смещением, из которых
+# они подбираются
+RECOMMENDATION_CANDIDATES = 100
+RECOMMENDATION_POOL = 10000
+
+# Количество отзывов и комментариев к каждому из них,
+# встраиваемых в ответ с произведением по параметру include
+TITLE_INCLUDE_REVIEWS = 10
+TITLE_INCLUDE_COMMENTS = 3
+
+# Пакетные запросы: максимальное количество вложенных запросов
+# и потоков для параллельного выполнения безопасных запросов
+BATCH_MAX_REQUESTS = 20
+BATCH_MAX_WORKERS = 4
+
+# Время хранения в кеше готового JSON произведений для списков
+TITLE_FRAGMENT_TIMEOUT = timedelta(days=1)
+
+# Кеш: версии данных, готовые фрагменты и ответы API.
+# Файл SQLite общий для всех процессов сервера, MAX_SIZE - размер в байтах
+CACHES = {
+    'default': {
+        'BACKEND': 'api_yamdb.cache.SQLiteCache',
+        'LOCATION': BASE_DIR / 'cache.sqlite3',
+        'OPTIONS': {
+            'MAX_ENTRIES': 100_000,
+            'MAX_SIZE': 256 * 1024 * 1024,
+        },
+    },
+    'throttle': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'throttle',
+    },
+}
+
+# Время хранения ответов на GET-запросы анонимных пользователей.
+# Ключ ответа содержит версии данных, поэтому срок не нужен (None)
+RESPONSE_CACHE_TIMEOUT = None
+
+# Построение одного ответа несколькими запросами: время аренды ведущего
+# запроса и ожидания остальных (в секундах), интервал проверки кеша
+# при ожидании ведущего из другого процесса
+SINGLE_FLIGHT_TIMEOUT = 5
+SINGLE_FLIGHT_POLL = 0.05
+
+# Прогрев кеша командой warm_cache и при запуске сервера
+# (WARM_CACHE_ON_STARTUP): количество первых страниц списков
+# произведений и потоков
+WARM_CACHE_ON_STARTUP = False
+WARM_CACHE_PAGES = 5
+WARM_CACHE_WORKERS = 4
+
+# Отзыв токенов: фильтр Блума (ёмкость и доля ложных срабатываний)
+# и интервал проверки версии списка отозванных токенов в каждом процессе
+REVOCATION_BLOOM_CAPACITY = 10_000
+REVOCATION_BLOOM_ERROR_RATE = 0.01
+REVOCATION_SYNC_INTERVAL = timedelta(seconds=1)
+
+# Ограничение частоты запросов регистрации и получения токена:
+# корзины токенов по IP, имени пользователя и почте (размер корзины
+# и время пополнения на один запрос). Состояние корзин хранится в кеше
+# THROTTLE_CACHE: по умолчанию в памяти процесса, для нескольких
+# процессов можно указать общий кеш
+AUTH_THROTTLE_BURST = 20
+AUTH_THROTTLE_REFILL_INTERVAL = timedelta(seconds=3)
+THROTTLE_CACHE = 'throttle'
+
+# Повторная отправка кода подтверждения не чаще раза в указанный срок
+CONFIRMATION_RESEND_COOLDOWN = timedelta(minutes=1)
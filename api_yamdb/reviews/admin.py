@@ -5,7 +5,12 @@ from .models import Category, Comment, Genre, Review, Title, User
 
 @admin.register(Title)
 class TitleAdmin(admin.ModelAdmin):
-    list_display = ('pk', 'name', 'year')
+    list_display = (
+        'pk', 'name', 'year', 'rating', 'weighted_rating', 'reviews_count'
+    )
+    readonly_fields = (
+        'score_sum', 'reviews_count', 'rating', 'weighted_rating'
+    )
     search_fields = ('year', 'name', 'category__name', 'genre__name')
     list_filter = ('year', 'name', 'category__name', 'genre__name')
 
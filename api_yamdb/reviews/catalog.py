@@ -0,0 +1,62 @@
+import threading
+from types import MappingProxyType
+
+from .models import Category, Genre
+from .versions import CATEGORIES_VERSION, GENRES_VERSION, get_versions
+
+CATALOG_SNAPSHOT_VERSIONS = (CATEGORIES_VERSION, GENRES_VERSION)
+
+
+class CatalogSnapshot:
+    """
+    Неизменяемый снимок всех категорий и жанров (по порядку id)
+    со словарями slug -> id и id -> объект. Объекты снимка общие
+    для всех потоков процесса и не должны изменяться.
+    """
+    __slots__ = (
+        'versions', 'categories', 'genres', 'category_ids',
+        'categories_by_id', 'genre_ids', 'genres_by_id',
+    )
+
+    def __init__(self, versions, categories, genres):
+        self.versions = versions
+        self.categories = tuple(categories)
+        self.genres = tuple(genres)
+        self.category_ids = MappingProxyType(
+            {category.slug: category.pk for category in self.categories}
+        )
+        self.categories_by_id = MappingProxyType(
+            {category.pk: category for category in self.categories}
+        )
+        self.genre_ids = MappingProxyType(
+            {genre.slug: genre.pk for genre in self.genres}
+        )
+        self.genres_by_id = MappingProxyType(
+            {genre.pk: genre for genre in self.genres}
+        )
+
+
+_lock = threading.Lock()
+_snapshot = None
+
+
+def get_catalog():
+    """
+    Возвращает снимок каталога для текущих версий категорий и жанров.
+    Если версии изменились, снимок строится заново двумя запросами
+    и заменяется целиком. Версии читаются до запросов, поэтому снимок
+    не может оказаться старее своих версий.
+    """
+    global _snapshot
+    versions = get_versions(CATALOG_SNAPSHOT_VERSIONS)
+    snapshot = _snapshot
+    if snapshot is not None and snapshot.versions == versions:
+        return snapshot
+    with _lock:
+        if _snapshot is None or _snapshot.versions != versions:
+            _snapshot = CatalogSnapshot(
+                versions,
+                Category.objects.order_by('id'),
+                Genre.objects.order_by('id')
+            )
+        return _snapshot
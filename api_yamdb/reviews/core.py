@@ -1,5 +1,8 @@
 from django.db import models
 
+SCORES = range(1, 11)
+SCORE_FIELDS = tuple(f'score_{score}_count' for score in SCORES)
+
 
 class NameSlugModel(models.Model):
     """
@@ -10,3 +13,29 @@ class NameSlugModel(models.Model):
 
     class Meta:
         abstract = True
+
+
+class ScoreHistogramModel(models.Model):
+    """
+    Абстрактная модель с количеством оценок от 1 до 10.
+    """
+    score_1_count = models.PositiveIntegerField('Оценок 1', default=0)
+    score_2_count = models.PositiveIntegerField('Оценок 2', default=0)
+    score_3_count = models.PositiveIntegerField('Оценок 3', default=0)
+    score_4_count = models.PositiveIntegerField('Оценок 4', default=0)
+    score_5_count = models.PositiveIntegerField('Оценок 5', default=0)
+    score_6_count = models.PositiveIntegerField('Оценок 6', default=0)
+    score_7_count = models.PositiveIntegerField('Оценок 7', default=0)
+    score_8_count = models.PositiveIntegerField('Оценок 8', default=0)
+    score_9_count = models.PositiveIntegerField('Оценок 9', default=0)
+    score_10_count = models.PositiveIntegerField('Оценок 10', default=0)
+
+    class Meta:
+        abstract = True
+
+    @property
+    def score_distribution(self):
+        return {
+            score: getattr(self, field)
+            for score, field in zip(SCORES, SCORE_FIELDS)
+        }
@@ -0,0 +1,235 @@
+import random
+from array import array
+from operator import mul
+
+import numpy as np
+from django.db import transaction
+
+from .models import Review, TitleFactors, UserFactors
+
+ITERATOR_CHUNK_SIZE = 10000
+WRITE_BATCH_SIZE = 1000
+SCORE_BLOCK_SIZE = 2 ** 22
+
+
+class Ratings:
+    """
+    Оценки из Review в компактных массивах: 9 байт на отзыв.
+    """
+
+    def __init__(self):
+        self.users = array('I')
+        self.titles = array('I')
+        self.scores = array('B')
+
+    @classmethod
+    def load(cls):
+        ratings = cls()
+        rows = Review.objects.order_by().values_list(
+            'author_id', 'title_id', 'score'
+        )
+        for author_id, title_id, score in rows.iterator(ITERATOR_CHUNK_SIZE):
+            ratings.users.append(author_id)
+            ratings.titles.append(title_id)
+            ratings.scores.append(score)
+        return ratings
+
+    def __len__(self):
+        return len(self.scores)
+
+    @property
+    def memory_size(self):
+        """
+        Объём массивов с оценками в байтах.
+        """
+        return sum(
+            values.itemsize * len(values)
+            for values in (self.users, self.titles, self.scores)
+        )
+
+
+class FactorizationModel:
+    """
+    Модель матричного разложения: оценка = mean + b_u + b_i + p_u * q_i.
+    Факторы хранятся в плоских массивах float32, индекс - id объекта.
+    """
+
+    def __init__(self, ratings, factors, seed=None):
+        rnd = random.Random(seed)
+        self.factors = factors
+        self.mean = sum(ratings.scores) / len(ratings) if len(ratings) else 0
+        users_count = max(ratings.users, default=0) + 1
+        titles_count = max(ratings.titles, default=0) + 1
+        self.user_bias = array('f', bytes(4 * users_count))
+        self.title_bias = array('f', bytes(4 * titles_count))
+        self.user_vectors = array('f', (
+            rnd.gauss(0, 0.1) for _ in range(users_count * factors)
+        ))
+        self.title_vectors = array('f', (
+            rnd.gauss(0, 0.1) for _ in range(titles_count * factors)
+        ))
+
+    def sgd_chunk(self, ratings, indexes, learning_rate, regularization):
+        """
+        Один проход SGD по отзывам с номерами indexes.
+        Возвращает сумму квадратов ошибок до обновления.
+        """
+        k = self.factors
+        user_bias, title_bias = self.user_bias, self.title_bias
+        user_vectors, title_vectors = self.user_vectors, self.title_vectors
+        squared_error = 0.0
+        for index in indexes:
+            user_id = ratings.users[index]
+            title_id = ratings.titles[index]
+            user_start, title_start = user_id * k, title_id * k
+            p = user_vectors[user_start:user_start + k]
+            q = title_vectors[title_start:title_start + k]
+            error = ratings.scores[index] - (
+                self.mean + user_bias[user_id] + title_bias[title_id]
+                + sum(map(mul, p, q))
+            )
+            squared_error += error * error
+            user_bias[user_id] += learning_rate * (
+                error - regularization * user_bias[user_id]
+            )
+            title_bias[title_id] += learning_rate * (
+                error - regularization * title_bias[title_id]
+            )
+            user_vectors[user_start:user_start + k] = array('f', (
+                pu + learning_rate * (error * qi - regularization * pu)
+                for pu, qi in zip(p, q)
+            ))
+            title_vectors[title_start:title_start + k] = array('f', (
+                qi + learning_rate * (error * pu - regularization * qi)
+                for pu, qi in zip(p, q)
+            ))
+        return squared_error
+
+    def train_epoch(self, ratings, chunk_size, learning_rate,
+                    regularization, rnd):
+        """
+        Эпоха SGD: отзывы перебираются группами по chunk_size
+        в случайном порядке групп и отзывов внутри группы.
+        Возвращает RMSE на обучающих данных.
+        """
+        starts = list(range(0, len(ratings), chunk_size))
+        rnd.shuffle(starts)
+        squared_error = 0.0
+        for start in starts:
+            indexes = list(
+                range(start, min(start + chunk_size, len(ratings)))
+            )
+            rnd.shuffle(indexes)
+            squared_error += self.sgd_chunk(
+                ratings, indexes, learning_rate, regularization
+            )
+        return (squared_error / max(len(ratings), 1)) ** 0.5
+
+    @property
+    def memory_size(self):
+        """
+        Объём массивов с факторами в байтах.
+        """
+        return sum(
+            values.itemsize * len(values)
+            for values in (self.user_bias, self.title_bias,
+                           self.user_vectors, self.title_vectors)
+        )
+
+    def vector(self, vectors, object_id):
+        start = object_id * self.factors
+        return vectors[start:start + self.factors].tobytes()
+
+    def recommend(self, ratings, count, pool):
+        """
+        Подбирает каждому пользователю с отзывами count произведений
+        с наибольшей предсказанной оценкой b_i + p_u * q_i, кроме уже
+        оценённых. Кандидаты - pool произведений с наибольшим
+        смещением b_i. Оценки считаются умножением матриц по блокам
+        пользователей, в блоке не больше SCORE_BLOCK_SIZE оценок.
+        Возвращает пары (id пользователя, упакованный массив id
+        произведений) по возрастанию id пользователя.
+        """
+        users = np.frombuffer(ratings.users, dtype=np.uintc)
+        titles = np.frombuffer(ratings.titles, dtype=np.uintc)
+        all_bias = np.frombuffer(self.title_bias, dtype=np.float32)
+        title_ids = np.unique(titles)
+        if len(title_ids) > pool:
+            title_ids = title_ids[
+                np.argpartition(-all_bias[title_ids], pool - 1)[:pool]
+            ]
+        title_matrix = np.frombuffer(
+            self.title_vectors, dtype=np.float32
+        ).reshape(-1, self.factors)[title_ids].T
+        title_bias = all_bias[title_ids]
+        user_matrix = np.frombuffer(
+            self.user_vectors, dtype=np.float32
+        ).reshape(-1, self.factors)
+        columns = np.full(len(all_bias), -1, dtype=np.intc)
+        columns[title_ids] = np.arange(len(title_ids))
+        # Отзывы по возрастанию id пользователя: отзывы блока
+        # пользователей занимают непрерывный отрезок
+        order = np.argsort(users, kind='stable')
+        users = users[order]
+        columns = columns[titles[order]]
+        del order
+        user_ids = np.unique(users)
+        count = min(count, len(title_ids))
+        block_size = max(1, SCORE_BLOCK_SIZE // max(len(title_ids), 1))
+        for start in range(0, len(user_ids), block_size):
+            block = user_ids[start:start + block_size]
+            scores = user_matrix[block] @ title_matrix
+            scores += title_bias
+            first = np.searchsorted(users, block[0])
+            last = np.searchsorted(users, block[-1], side='right')
+            reviewed = columns[first:last] >= 0
+            scores[
+                np.searchsorted(block, users[first:last][reviewed]),
+                columns[first:last][reviewed]
+            ] = -np.inf
+            top = np.argpartition(-scores, count - 1, axis=1)[:, :count]
+            top_scores = np.take_along_axis(scores, top, axis=1)
+            ranks = np.argsort(-top_scores, axis=1, kind='stable')
+            top = np.take_along_axis(top, ranks, axis=1)
+            top_scores = np.take_along_axis(top_scores, ranks, axis=1)
+            for user_id, row, row_scores in zip(block, top, top_scores):
+                yield int(user_id), title_ids[
+                    row[np.isfinite(row_scores)]
+                ].tobytes()
+
+    @transaction.atomic
+    def save(self, ratings, candidates, pool):
+        """
+        Сохраняет факторы пользователей и произведений, у которых
+        есть отзывы, заменяя результаты прошлого обучения.
+        Для каждого пользователя заранее подбирается candidates
+        рекомендаций из pool кандидатов, чтобы запрос к API
+        не считал оценки произведений.
+        """
+        UserFactors.objects.all().delete()
+        TitleFactors.objects.all().delete()
+        UserFactors.objects.bulk_create(
+            (
+                UserFactors(
+                    user_id=user_id,
+                    bias=self.user_bias[user_id],
+                    vector=self.vector(self.user_vectors, user_id),
+                    recommendations=recommendations,
+                )
+                for user_id, recommendations in self.recommend(
+                    ratings, candidates, pool
+                )
+            ),
+            batch_size=WRITE_BATCH_SIZE
+        )
+        TitleFactors.objects.bulk_create(
+            (
+                TitleFactors(
+                    title_id=title_id,
+                    bias=self.title_bias[title_id],
+                    vector=self.vector(self.title_vectors, title_id),
+                )
+                for title_id in sorted(set(ratings.titles))
+            ),
+            batch_size=WRITE_BATCH_SIZE
+        )
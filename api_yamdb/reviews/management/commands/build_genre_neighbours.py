@@ -0,0 +1,34 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from reviews.similarity import build_genre_neighbours
+
+
+class Command(BaseCommand):
+    help = ('Пересчёт похожих произведений по жанрам и категории '
+            '(коэффициент Жаккара). Используются для произведений '
+            'без оценок.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--top-k', type=int, default=settings.SIMILAR_TITLES_COUNT,
+            help='Сколько похожих произведений хранить для каждого.')
+        parser.add_argument(
+            '--chunk-size', type=int, default=500,
+            help='Сколько произведений сохранять за одну транзакцию.')
+        parser.add_argument(
+            '--titles', type=int, nargs='+',
+            help='Пересчитать только указанные произведения.')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        for processed in build_genre_neighbours(
+            options['top_k'], options['titles'], options['chunk_size']
+        ):
+            self.stdout.write(
+                f'Обработано произведений: {processed} '
+                f'({time.monotonic() - started:.1f} с)'
+            )
+        return 'Похожие по жанрам произведения пересчитаны.'
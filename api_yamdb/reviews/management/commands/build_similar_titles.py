@@ -0,0 +1,58 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from reviews.models import Review
+from reviews.similarity import MAX_PAIRS, build_similar_titles
+
+
+class Command(BaseCommand):
+    help = ('Пересчёт похожих произведений по оценкам пользователей. '
+            'Выполняется группами и частями по числу накапливаемых пар, '
+            'чтобы память не зависела от числа отзывов.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--top-k', type=int, default=settings.SIMILAR_TITLES_COUNT,
+            help='Сколько похожих произведений хранить для каждого.')
+        parser.add_argument(
+            '--min-common', type=int, default=2,
+            help='Минимальное количество общих оценивших пользователей.')
+        parser.add_argument(
+            '--chunk-size', type=int, default=500,
+            help='Сколько произведений обрабатывать за один проход.')
+        parser.add_argument(
+            '--max-pairs', type=int, default=MAX_PAIRS,
+            help='Сколько пар (произведение, сосед) накапливать '
+                 'одновременно: ограничивает память прохода.')
+        parser.add_argument(
+            '--titles', type=int, nargs='+',
+            help='Пересчитать только указанные произведения.')
+        parser.add_argument(
+            '--since-days', type=int,
+            help='Пересчитать только произведения с отзывами '
+                 'за последние N дней.')
+
+    def handle(self, *args, **options):
+        title_ids = options['titles']
+        if options['since_days'] is not None:
+            title_ids = set(title_ids or ()) | set(
+                Review.objects.filter(
+                    pub_date__gte=timezone.now() - timedelta(
+                        days=options['since_days']
+                    )
+                ).values_list('title_id', flat=True).distinct()
+            )
+        started = time.monotonic()
+        for processed in build_similar_titles(
+            options['top_k'], options['min_common'], options['chunk_size'],
+            title_ids, options['max_pairs']
+        ):
+            self.stdout.write(
+                f'Обработано произведений: {processed} '
+                f'({time.monotonic() - started:.1f} с)'
+            )
+        return 'Похожие произведения пересчитаны.'
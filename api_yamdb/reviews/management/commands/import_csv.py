@@ -1,9 +1,11 @@
 from csv import DictReader
 
 from django.conf import settings
+from django.core.cache import cache
 from django.core.management.base import BaseCommand
 
 from reviews.models import Category, Comment, Genre, Review, Title, User
+from reviews.stats import recalculate_title_stats
 
 # Кортеж связывает имя модели, имя файла CSV и ключевые поля,
 # требуещие добавления суффикса _id
@@ -45,4 +47,9 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         for model, file_name, key_fields in Model_CSV:
             load_data_from_csv(model, file_name, key_fields)
+        # bulk_create не отправляет сигналы, поэтому статистика
+        # произведений пересчитывается, а производные данные
+        # в кеше (индексы, версии) сбрасываются целиком
+        recalculate_title_stats()
+        cache.clear()
         return 'Загрузка данных завершена.'
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from reviews.stats import recalculate_title_stats
+from reviews.versions import CATALOG_VERSION, TITLES_VERSION, bump_version
+
+
+class Command(BaseCommand):
+    help = ('Пересчёт статистики и рейтингов произведений, например '
+            'после изменения RATING_PRIOR_MEAN или RATING_MIN_VOTES.')
+
+    def handle(self, *args, **options):
+        recalculate_title_stats()
+        bump_version(CATALOG_VERSION, TITLES_VERSION)
+        return 'Рейтинги произведений пересчитаны.'
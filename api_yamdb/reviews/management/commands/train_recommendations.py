@@ -0,0 +1,67 @@
+import random
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from reviews.factorization import FactorizationModel, Ratings
+
+
+class Command(BaseCommand):
+    help = ('Обучение рекомендаций: матричное разложение оценок '
+            'пользователей методом SGD.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--factors', type=int, default=16,
+            help='Размерность векторов факторов.')
+        parser.add_argument('--epochs', type=int, default=10)
+        parser.add_argument('--learning-rate', type=float, default=0.01)
+        parser.add_argument('--regularization', type=float, default=0.05)
+        parser.add_argument(
+            '--chunk-size', type=int, default=100000,
+            help='Сколько отзывов перемешивать и обрабатывать за раз.')
+        parser.add_argument('--seed', type=int)
+        parser.add_argument(
+            '--candidates', type=int,
+            default=settings.RECOMMENDATION_CANDIDATES,
+            help='Сколько рекомендаций сохранять для каждого пользователя.')
+        parser.add_argument(
+            '--pool', type=int, default=settings.RECOMMENDATION_POOL,
+            help='Из скольких произведений с наибольшим смещением '
+                 'подбирать рекомендации.')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        ratings = Ratings.load()
+        self.stdout.write(
+            f'Загружено отзывов: {len(ratings)} '
+            f'({ratings.memory_size / 2 ** 20:.1f} МБ, '
+            f'{time.monotonic() - started:.1f} с)'
+        )
+        model = FactorizationModel(ratings, options['factors'],
+                                   options['seed'])
+        self.stdout.write(
+            f'Размер факторов: {model.memory_size / 2 ** 20:.1f} МБ'
+        )
+        rnd = random.Random(options['seed'])
+        for epoch in range(1, options['epochs'] + 1):
+            epoch_started = time.monotonic()
+            rmse = model.train_epoch(
+                ratings, options['chunk_size'], options['learning_rate'],
+                options['regularization'], rnd
+            )
+            self.stdout.write(
+                f'Эпоха {epoch}: RMSE {rmse:.4f} '
+                f'({time.monotonic() - epoch_started:.1f} с)'
+            )
+        save_started = time.monotonic()
+        model.save(ratings, options['candidates'], options['pool'])
+        self.stdout.write(
+            f'Подбор и сохранение рекомендаций: '
+            f'{time.monotonic() - save_started:.1f} с'
+        )
+        self.stdout.write(
+            f'Общее время: {time.monotonic() - started:.1f} с'
+        )
+        return 'Факторы рекомендаций сохранены.'
@@ -0,0 +1,68 @@
+# Generated by Django 3.2 on 2026-10-19 08:48
+
+from django.db import migrations, models
+from django.db.models import (Count, F, FloatField, IntegerField, OuterRef,
+                              Subquery, Sum)
+from django.db.models.functions import Cast, Coalesce, NullIf
+
+
+def fill_title_stats(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    Review = apps.get_model('reviews', 'Review')
+    reviews = Review.objects.filter(
+        title=OuterRef('pk')
+    ).order_by().values('title')
+    Title.objects.update(
+        score_sum=Coalesce(
+            Subquery(reviews.annotate(value=Sum('score')).values('value')),
+            0, output_field=IntegerField()
+        ),
+        reviews_count=Coalesce(
+            Subquery(reviews.annotate(value=Count('id')).values('value')),
+            0, output_field=IntegerField()
+        ),
+    )
+    Title.objects.update(
+        rating=Cast(F('score_sum'), FloatField()) / NullIf(
+            F('reviews_count'), 0
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0003_alter_user_role'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='rating',
+            field=models.FloatField(blank=True, null=True, verbose_name='Рейтинг'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='reviews_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Количество отзывов'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_sum',
+            field=models.PositiveIntegerField(default=0, verbose_name='Сумма оценок'),
+        ),
+        migrations.AlterField(
+            model_name='review',
+            name='pub_date',
+            field=models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Дата публикации отзыва'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['-rating'], name='title_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['category', '-rating'], name='title_category_rating_idx'),
+        ),
+        migrations.RunPython(fill_title_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 3.2 on 2026-10-19 08:51
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import ExpressionWrapper, F, FloatField
+from django.db.models.functions import Cast, NullIf
+
+
+def fill_weighted_rating(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    min_votes = settings.RATING_MIN_VOTES
+    rating = Cast(F('score_sum'), FloatField()) / NullIf(
+        F('reviews_count'), 0
+    )
+    Title.objects.update(
+        weighted_rating=ExpressionWrapper(
+            (
+                F('reviews_count') * rating
+                + min_votes * settings.RATING_PRIOR_MEAN
+            ) / (F('reviews_count') + min_votes),
+            output_field=FloatField()
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_title_stats'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='title',
+            name='title_category_rating_idx',
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='weighted_rating',
+            field=models.FloatField(blank=True, null=True, verbose_name='Взвешенный рейтинг'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['-weighted_rating'], name='title_weighted_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['category', '-weighted_rating'], name='title_category_wr_idx'),
+        ),
+        migrations.RunPython(fill_weighted_rating, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 3.2 on 2026-10-19 08:56
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0007_similar_title'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleFactors',
+            fields=[
+                ('title', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='factors', serialize=False, to='reviews.title', verbose_name='Произведение')),
+                ('bias', models.FloatField(verbose_name='Смещение')),
+                ('vector', models.BinaryField(verbose_name='Вектор факторов')),
+            ],
+            options={
+                'verbose_name': 'факторы произведения',
+                'verbose_name_plural': 'Факторы произведений',
+            },
+        ),
+        migrations.CreateModel(
+            name='UserFactors',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='factors', serialize=False, to='reviews.user', verbose_name='Пользователь')),
+                ('bias', models.FloatField(verbose_name='Смещение')),
+                ('vector', models.BinaryField(verbose_name='Вектор факторов')),
+            ],
+            options={
+                'verbose_name': 'факторы пользователя',
+                'verbose_name_plural': 'Факторы пользователей',
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 3.2 on 2026-10-19 08:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0008_factors'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='similartitle',
+            name='similar_title_score_idx',
+        ),
+        migrations.AddField(
+            model_name='similartitle',
+            name='source',
+            field=models.CharField(choices=[('ratings', 'Оценки пользователей'), ('genres', 'Жанры и категория')], default='ratings', max_length=10, verbose_name='Источник'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='similartitle',
+            unique_together={('title', 'source', 'similar')},
+        ),
+        migrations.AddIndex(
+            model_name='similartitle',
+            index=models.Index(fields=['title', 'source', '-score'], name='similar_title_source_idx'),
+        ),
+    ]
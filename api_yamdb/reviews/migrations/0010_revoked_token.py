@@ -0,0 +1,29 @@
+# Generated by Django 3.2 on 2026-10-19 09:35
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0009_similar_title_source'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RevokedToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('jti', models.CharField(blank=True, max_length=255, null=True, unique=True, verbose_name='Идентификатор токена')),
+                ('issued_before', models.DateTimeField(blank=True, null=True, verbose_name='Выданы до')),
+                ('expires', models.DateTimeField(db_index=True, verbose_name='Истекает')),
+                ('user', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='token_revocation', to=settings.AUTH_USER_MODEL, verbose_name='Пользователь')),
+            ],
+            options={
+                'verbose_name': 'отозванный токен',
+                'verbose_name_plural': 'Отозванные токены',
+            },
+        ),
+    ]
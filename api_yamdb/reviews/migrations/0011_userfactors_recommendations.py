@@ -0,0 +1,18 @@
+# Generated by Django 3.2 on 2026-10-19 10:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0010_revoked_token'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userfactors',
+            name='recommendations',
+            field=models.BinaryField(default=b'', verbose_name='Рекомендации'),
+        ),
+    ]
@@ -6,7 +6,7 @@ from django.core.validators import (
     MaxValueValidator, MinValueValidator, RegexValidator)
 from django.db import models
 
-from .core import NameSlugModel
+from .core import NameSlugModel, ScoreHistogramModel
 
 LENGTH_TITLE = 20
 
@@ -100,9 +100,10 @@ class Genre(NameSlugModel):
         return self.name
 
 
-class Title(models.Model):
+class Title(ScoreHistogramModel):
     """
     Модель для произведений.
+    Хранит статистику оценок, которая обновляется при изменении отзывов.
     """
     name = models.CharField(
         'Название произведения',
@@ -121,10 +122,31 @@ class Title(models.Model):
         on_delete=models.SET_NULL,
         related_name='titles', null=True,
         verbose_name='Категория')
+    score_sum = models.PositiveIntegerField(
+        'Сумма оценок',
+        default=0)
+    reviews_count = models.PositiveIntegerField(
+        'Количество отзывов',
+        default=0)
+    rating = models.FloatField(
+        'Рейтинг',
+        null=True,
+        blank=True)
+    weighted_rating = models.FloatField(
+        'Взвешенный рейтинг',
+        null=True,
+        blank=True)
 
     class Meta:
         verbose_name = 'произведение'
         verbose_name_plural = 'Произведения'
+        indexes = (
+            models.Index(fields=('-rating',), name='title_rating_idx'),
+            models.Index(fields=('-weighted_rating',),
+                         name='title_weighted_rating_idx'),
+            models.Index(fields=('category', '-weighted_rating'),
+                         name='title_category_wr_idx'),
+        )
 
     def __str__(self):
         return self.name
@@ -152,7 +174,8 @@ class Review(models.Model):
                     MaxValueValidator(10)))
     pub_date = models.DateTimeField(
         'Дата публикации отзыва',
-        auto_now_add=True)
+        auto_now_add=True,
+        db_index=True)
 
     class Meta:
         verbose_name = 'Отзыв'
@@ -162,6 +185,16 @@ class Review(models.Model):
     def __str__(self):
         return self.text[:LENGTH_TITLE]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Запоминает загруженную оценку, чтобы при сохранении
+        обновить статистику произведения на разницу оценок.
+        """
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_score = instance.__dict__.get('score')
+        return instance
+
 
 class Comment(models.Model):
     """
@@ -189,3 +222,121 @@ class Comment(models.Model):
 
     def __str__(self):
         return self.text[:LENGTH_TITLE]
+
+
+class SimilarTitle(models.Model):
+    """
+    Модель для похожих произведений.
+    Для каждого произведения хранятся top-k похожих произведений:
+    - по оценкам пользователей (команда build_similar_titles),
+    - по жанрам и категории (команда build_genre_neighbours и сигналы
+    при изменении произведения) - для произведений без отзывов.
+    """
+    RATINGS = 'ratings'
+    GENRES = 'genres'
+
+    SOURCES = (
+        (RATINGS, 'Оценки пользователей'),
+        (GENRES, 'Жанры и категория'),
+    )
+
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='similar_titles',
+        verbose_name='Произведение')
+    similar = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='similar_to',
+        verbose_name='Похожее произведение')
+    source = models.CharField(
+        'Источник',
+        max_length=10,
+        choices=SOURCES,
+        default=RATINGS)
+    score = models.FloatField('Сходство')
+
+    class Meta:
+        verbose_name = 'похожее произведение'
+        verbose_name_plural = 'Похожие произведения'
+        unique_together = ('title', 'source', 'similar')
+        indexes = (
+            models.Index(fields=('title', 'source', '-score'),
+                         name='similar_title_source_idx'),
+        )
+
+    def __str__(self):
+        return f'{self.title} - {self.similar}'
+
+
+class UserFactors(models.Model):
+    """
+    Модель для скрытых факторов пользователя.
+    Заполняется командой train_recommendations, вектор хранится
+    упакованным массивом float32, рекомендации - упакованным
+    массивом id произведений в порядке предсказанной оценки.
+    """
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='factors',
+        verbose_name='Пользователь')
+    bias = models.FloatField('Смещение')
+    vector = models.BinaryField('Вектор факторов')
+    recommendations = models.BinaryField('Рекомендации', default=b'')
+
+    class Meta:
+        verbose_name = 'факторы пользователя'
+        verbose_name_plural = 'Факторы пользователей'
+
+
+class TitleFactors(models.Model):
+    """
+    Модель для скрытых факторов произведения.
+    Заполняется командой train_recommendations, вектор хранится
+    упакованным массивом float32.
+    """
+    title = models.OneToOneField(
+        Title,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='factors',
+        verbose_name='Произведение')
+    bias = models.FloatField('Смещение')
+    vector = models.BinaryField('Вектор факторов')
+
+    class Meta:
+        verbose_name = 'факторы произведения'
+        verbose_name_plural = 'Факторы произведений'
+
+
+class RevokedToken(models.Model):
+    """
+    Модель для отозванных токенов: отдельный токен по jti
+    или все токены пользователя, выданные не позже issued_before.
+    Запись не нужна после expires - все отозванные ею токены истекли.
+    """
+    jti = models.CharField(
+        'Идентификатор токена',
+        max_length=255,
+        unique=True,
+        null=True,
+        blank=True)
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='token_revocation',
+        verbose_name='Пользователь')
+    issued_before = models.DateTimeField(
+        'Выданы до',
+        null=True,
+        blank=True)
+    expires = models.DateTimeField('Истекает', db_index=True)
+
+    class Meta:
+        verbose_name = 'отозванный токен'
+        verbose_name_plural = 'Отозванные токены'
@@ -0,0 +1,162 @@
+import hashlib
+import math
+import threading
+import time
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import RevokedToken
+from .versions import REVOCATION_VERSION, bump_version, get_version
+
+JTI_KEY = 'jti:{}'
+USER_KEY = 'user:{}'
+
+
+class BloomFilter:
+    """
+    Фильтр Блума: отвечает «точно нет» или «возможно есть»
+    с вероятностью ложного срабатывания error_rate для capacity ключей.
+    """
+
+    def __init__(self, capacity, error_rate):
+        self.size = max(8, math.ceil(
+            -capacity * math.log(error_rate) / math.log(2) ** 2
+        ))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def positions(self, key):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return (
+            (first + index * second) % self.size
+            for index in range(self.hashes)
+        )
+
+    def add(self, key):
+        for position in self.positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key):
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self.positions(key)
+        )
+
+
+class RevocationSnapshot:
+    """
+    Фильтр Блума по действующим записям RevokedToken для версии
+    version. checked_at - время последней проверки версии.
+    """
+
+    def __init__(self, version):
+        self.version = version
+        self.checked_at = time.monotonic()
+        rows = RevokedToken.objects.filter(
+            expires__gt=timezone.now()
+        ).values_list('jti', 'user_id')
+        keys = [
+            JTI_KEY.format(jti) if jti is not None else USER_KEY.format(user)
+            for jti, user in rows
+        ]
+        self.filter = BloomFilter(
+            max(len(keys), settings.REVOCATION_BLOOM_CAPACITY),
+            settings.REVOCATION_BLOOM_ERROR_RATE
+        )
+        for key in keys:
+            self.filter.add(key)
+
+
+_lock = threading.Lock()
+_snapshot = None
+
+
+def get_revocation_filter():
+    """
+    Возвращает фильтр отозванных токенов процесса. Версия списка
+    в кеше проверяется не чаще раза в REVOCATION_SYNC_INTERVAL,
+    поэтому обычная проверка токена не обращается ни к кешу,
+    ни к базе данных. При изменении версии фильтр строится заново.
+    """
+    global _snapshot
+    snapshot = _snapshot
+    now = time.monotonic()
+    if snapshot is not None and (
+        now - snapshot.checked_at
+        < settings.REVOCATION_SYNC_INTERVAL.total_seconds()
+    ):
+        return snapshot.filter
+    version = get_version(REVOCATION_VERSION)
+    with _lock:
+        if _snapshot is not None and _snapshot.version == version:
+            _snapshot.checked_at = now
+        else:
+            _snapshot = RevocationSnapshot(version)
+        return _snapshot.filter
+
+
+def reset_revocation_filter():
+    global _snapshot
+    _snapshot = None
+
+
+def is_revoked(jti, user_id, issued_at):
+    """
+    Проверяет, отозван ли токен с идентификатором jti пользователя
+    user_id, выданный в issued_at (секунды эпохи). База данных
+    проверяется только при срабатывании фильтра Блума.
+    """
+    bloom = get_revocation_filter()
+    if JTI_KEY.format(jti) in bloom and RevokedToken.objects.filter(
+        jti=jti
+    ).exists():
+        return True
+    return USER_KEY.format(user_id) in bloom and RevokedToken.objects.filter(
+        user_id=user_id,
+        issued_before__gte=datetime.fromtimestamp(issued_at, dt_timezone.utc)
+    ).exists()
+
+
+def publish_revocation():
+    """
+    После фиксации транзакции обновляет версию списка отзыва
+    для всех процессов и сразу перестраивает фильтр текущего.
+    """
+    def publish():
+        bump_version(REVOCATION_VERSION)
+        reset_revocation_filter()
+
+    transaction.on_commit(publish)
+
+
+def revoke_token(jti, expires_at):
+    """
+    Отзывает токен с идентификатором jti, который истекает
+    в expires_at (секунды эпохи), и удаляет истёкшие записи.
+    """
+    with transaction.atomic():
+        RevokedToken.objects.filter(expires__lte=timezone.now()).delete()
+        RevokedToken.objects.get_or_create(jti=jti, defaults={
+            'expires': datetime.fromtimestamp(expires_at, dt_timezone.utc)
+        })
+        publish_revocation()
+
+
+def revoke_user_tokens(user_id):
+    """
+    Отзывает все токены пользователя, выданные до текущей секунды
+    включительно (время выдачи токена хранится с точностью до секунды).
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        RevokedToken.objects.filter(expires__lte=now).delete()
+        RevokedToken.objects.update_or_create(user_id=user_id, defaults={
+            'issued_before': now,
+            'expires': now + settings.SIMPLE_JWT['REFRESH_TOKEN_LIFETIME'],
+        })
+        publish_revocation()
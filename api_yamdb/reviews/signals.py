@@ -0,0 +1,171 @@
+import threading
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Category, Comment, Genre, Review, Title, User
+from .similarity import update_genre_neighbours
+from .stats import apply_review_change, recalculate_title_stats
+from .versions import (AUTH_VERSION, CATALOG_VERSION, CATEGORIES_VERSION,
+                       COMMENTS_VERSION, GENRES_VERSION, REVIEWS_VERSION,
+                       TITLE_VERSION, TITLES_VERSION, USER_LIST_VERSION,
+                       USERS_VERSION, bump_version_on_commit)
+
+# Произведения, похожих по жанрам для которых нужно пересчитать
+# после фиксации текущей транзакции (в каждом потоке свои)
+_pending = threading.local()
+
+
+def loaded_score(review):
+    """
+    Оценка отзыва на момент загрузки из базы данных.
+    """
+    return getattr(review, '_loaded_score', None)
+
+
+def bump_title_version(title_id):
+    """
+    Обновляет версии произведения и списка произведений.
+    """
+    bump_version_on_commit(TITLE_VERSION.format(title_id), TITLES_VERSION)
+
+
+@receiver(post_save, sender=Review)
+def update_title_stats_on_save(sender, instance, created, **kwargs):
+    """
+    Обновляет статистику произведения при создании или изменении отзыва.
+    """
+    if created:
+        apply_review_change(instance.title_id, new_score=instance.score)
+    elif loaded_score(instance) is None:
+        recalculate_title_stats(Title.objects.filter(pk=instance.title_id))
+    elif loaded_score(instance) != instance.score:
+        apply_review_change(
+            instance.title_id, loaded_score(instance), instance.score
+        )
+    else:
+        return
+    instance._loaded_score = instance.score
+    bump_title_version(instance.title_id)
+
+
+@receiver(post_delete, sender=Review)
+def update_title_stats_on_delete(sender, instance, **kwargs):
+    """
+    Обновляет статистику произведения при удалении отзыва.
+    """
+    if loaded_score(instance) is None:
+        recalculate_title_stats(Title.objects.filter(pk=instance.title_id))
+    else:
+        apply_review_change(
+            instance.title_id, old_score=loaded_score(instance)
+        )
+    bump_title_version(instance.title_id)
+
+
+def update_pending_genre_neighbours():
+    """
+    Пересчитывает похожих по жанрам для всех произведений,
+    изменённых в зафиксированной транзакции. Следующие вызовы
+    для той же транзакции ничего не делают.
+    """
+    title_ids = getattr(_pending, 'title_ids', None)
+    if title_ids:
+        _pending.title_ids = set()
+        update_genre_neighbours(settings.SIMILAR_TITLES_COUNT, title_ids)
+
+
+def refresh_genre_neighbours(title_id):
+    """
+    Пересчитывает похожих по жанрам произведений после фиксации
+    транзакции: один раз для всех изменённых в ней произведений.
+    Произведения из отменённой транзакции пересчитываются
+    при следующей фиксации (пересчёт читает текущие данные).
+    """
+    if getattr(_pending, 'title_ids', None) is None:
+        _pending.title_ids = set()
+    _pending.title_ids.add(title_id)
+    transaction.on_commit(update_pending_genre_neighbours)
+
+
+@receiver(post_save, sender=Title)
+def update_genre_neighbours_on_save(sender, instance, created, **kwargs):
+    """
+    Обновляет похожих произведений при изменении категории.
+    При создании произведения они считаются после добавления жанров.
+    """
+    if created:
+        bump_version_on_commit(TITLES_VERSION)
+    else:
+        refresh_genre_neighbours(instance.pk)
+        bump_title_version(instance.pk)
+
+
+@receiver(post_delete, sender=Title)
+def bump_version_on_title_delete(sender, instance, **kwargs):
+    bump_title_version(instance.pk)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def bump_catalog_version(sender, instance, created=False, **kwargs):
+    """
+    Обновляет версию списка категорий или жанров, а при изменении
+    или удалении - и версию каталога: они входят в данные
+    многих произведений.
+    """
+    names = [
+        CATEGORIES_VERSION if sender is Category else GENRES_VERSION
+    ]
+    if not created:
+        names.append(CATALOG_VERSION)
+    bump_version_on_commit(*names)
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def bump_reviews_version(sender, instance, **kwargs):
+    bump_version_on_commit(REVIEWS_VERSION.format(instance.title_id))
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def bump_comments_version(sender, instance, **kwargs):
+    bump_version_on_commit(COMMENTS_VERSION)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def bump_users_version(sender, instance, created=False, **kwargs):
+    """
+    Обновляет версию списка пользователей, а при изменении
+    или удалении - и версии данных пользователей (имена авторов
+    в отзывах и комментариях) и его авторизации (утверждения
+    в токенах). Регистрация их не затрагивает.
+    """
+    if created:
+        bump_version_on_commit(USER_LIST_VERSION)
+    else:
+        bump_version_on_commit(
+            USER_LIST_VERSION, USERS_VERSION,
+            AUTH_VERSION.format(instance.pk)
+        )
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def update_genre_neighbours_on_genres(sender, instance, action, reverse,
+                                      **kwargs):
+    """
+    Обновляет похожих произведений при изменении жанров произведения.
+    """
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if reverse:
+        bump_version_on_commit(CATALOG_VERSION, TITLES_VERSION)
+    else:
+        refresh_genre_neighbours(instance.pk)
+        bump_title_version(instance.pk)
@@ -0,0 +1,366 @@
+import heapq
+import math
+
+from django.db import transaction
+from django.db.models import Count, Q
+
+from .core import SCORE_FIELDS, SCORES
+from .models import Review, SimilarTitle, Title
+
+# Сходство по малому числу общих оценок уменьшается:
+# sim * common / (common + SIMILARITY_SHRINK)
+SIMILARITY_SHRINK = 10
+ITERATOR_CHUNK_SIZE = 2000
+# Сколько пар (произведение, сосед) накапливается одновременно
+MAX_PAIRS = 1_000_000
+
+
+def load_title_vectors_stats():
+    """
+    Возвращает для каждого оценённого произведения среднюю оценку
+    и норму вектора оценок, центрированного по этой средней.
+    Норма считается по гистограмме оценок без чтения отзывов.
+    """
+    stats = {}
+    rows = Title.objects.filter(reviews_count__gt=0).values_list(
+        'id', 'rating', *SCORE_FIELDS
+    )
+    for title_id, mean, *histogram in rows.iterator(ITERATOR_CHUNK_SIZE):
+        norm = math.sqrt(sum(
+            count * (score - mean) ** 2
+            for score, count in zip(SCORES, histogram)
+        ))
+        if norm:
+            stats[title_id] = (mean, norm)
+    return stats
+
+
+def load_raters(chunk, stats):
+    """
+    Возвращает оценки произведений группы chunk по авторам:
+    автор -> список (id произведения, центрированная оценка).
+    """
+    raters = {}
+    chunk_reviews = Review.objects.filter(title_id__in=chunk).values_list(
+        'author_id', 'title_id', 'score'
+    )
+    for author_id, title_id, score in chunk_reviews.iterator(
+        ITERATOR_CHUNK_SIZE
+    ):
+        raters.setdefault(author_id, []).append(
+            (title_id, score - stats[title_id][0])
+        )
+    return raters
+
+
+def split_by_pairs(chunk, raters, max_pairs):
+    """
+    Делит группу на части, в каждой из которых верхняя оценка
+    числа накапливаемых пар (произведение, сосед) - сумма количества
+    отзывов авторов, оценивших произведение, - не больше max_pairs.
+    Произведение с большей оценкой обрабатывается отдельно: его
+    соседей не больше, чем произведений в каталоге.
+    """
+    reviews_counts = dict(Review.objects.filter(
+        author_id__in=Review.objects.filter(
+            title_id__in=chunk
+        ).values('author_id')
+    ).values('author_id').annotate(count=Count('id')).values_list(
+        'author_id', 'count'
+    ))
+    bounds = {}
+    for author_id, items in raters.items():
+        # Отзывы автора могли удалить после load_raters
+        count = reviews_counts.get(author_id, 0)
+        for target_id, _ in items:
+            bounds[target_id] = bounds.get(target_id, 0) + count
+    parts = [[]]
+    total = 0
+    for target_id in chunk:
+        bound = bounds.get(target_id, 0)
+        if parts[-1] and total + bound > max_pairs:
+            parts.append([])
+            total = 0
+        parts[-1].append(target_id)
+        total += bound
+    return parts
+
+
+def compute_part(part, raters, stats, top_k, min_common):
+    """
+    Считает похожие произведения для части группы part.
+    Сходство - косинус между векторами оценок, центрированными
+    по средней оценке произведения (скалярные произведения копятся
+    в разреженных словарях по общим авторам).
+    """
+    targets = set(part)
+    part_raters = {}
+    for author_id, items in raters.items():
+        part_items = [item for item in items if item[0] in targets]
+        if part_items:
+            part_raters[author_id] = part_items
+    dots = {title_id: {} for title_id in part}
+    common = {title_id: {} for title_id in part}
+    neighbour_reviews = Review.objects.filter(
+        author_id__in=Review.objects.filter(
+            title_id__in=part
+        ).values('author_id')
+    ).values_list('author_id', 'title_id', 'score')
+    for author_id, title_id, score in neighbour_reviews.iterator(
+        ITERATOR_CHUNK_SIZE
+    ):
+        # Произведение без оценок или автор, оставивший отзыв
+        # после load_raters, не учитываются
+        if title_id not in stats or author_id not in part_raters:
+            continue
+        centered = score - stats[title_id][0]
+        for target_id, target_centered in part_raters[author_id]:
+            if target_id == title_id:
+                continue
+            target_dots = dots[target_id]
+            target_dots[title_id] = (
+                target_dots.get(title_id, 0) + target_centered * centered
+            )
+            target_common = common[target_id]
+            target_common[title_id] = target_common.get(title_id, 0) + 1
+    result = {}
+    for target_id in part:
+        target_norm = stats[target_id][1]
+        similarities = (
+            (
+                dot / (target_norm * stats[title_id][1])
+                * common[target_id][title_id]
+                / (common[target_id][title_id] + SIMILARITY_SHRINK),
+                title_id,
+            )
+            for title_id, dot in dots[target_id].items()
+            if common[target_id][title_id] >= min_common
+        )
+        result[target_id] = [
+            (title_id, similarity)
+            for similarity, title_id in heapq.nlargest(top_k, similarities)
+            if similarity > 0
+        ]
+    return result
+
+
+def compute_chunk(chunk, stats, top_k, min_common, max_pairs=MAX_PAIRS):
+    """
+    Считает похожие произведения для группы произведений chunk.
+    Группа обрабатывается частями (split_by_pairs), поэтому словари
+    скалярных произведений одновременно хранят не больше max_pairs
+    пар (или соседей одного произведения, если их больше).
+    """
+    raters = load_raters(chunk, stats)
+    result = {}
+    for part in split_by_pairs(chunk, raters, max_pairs):
+        result.update(compute_part(part, raters, stats, top_k, min_common))
+    return result
+
+
+def build_similar_titles(top_k, min_common=2, chunk_size=500,
+                         title_ids=None, max_pairs=MAX_PAIRS):
+    """
+    Пересчитывает похожие произведения группами по chunk_size
+    и сохраняет top_k соседей каждого произведения в SimilarTitle.
+    title_ids ограничивает пересчёт указанными произведениями,
+    max_pairs - число пар, накапливаемых одновременно (compute_chunk).
+    Генерирует количество обработанных произведений после каждой группы.
+    """
+    stats = load_title_vectors_stats()
+    targets = sorted(
+        stats if title_ids is None else set(title_ids) & stats.keys()
+    )
+    stored = SimilarTitle.objects.filter(
+        source=SimilarTitle.RATINGS
+    ).values_list('title_id', flat=True)
+    if title_ids is not None:
+        stored = stored.filter(title_id__in=title_ids)
+    stale = sorted(set(stored.distinct()) - set(targets))
+    for start in range(0, len(stale), chunk_size):
+        SimilarTitle.objects.filter(
+            source=SimilarTitle.RATINGS,
+            title_id__in=stale[start:start + chunk_size]
+        ).delete()
+    for start in range(0, len(targets), chunk_size):
+        chunk = targets[start:start + chunk_size]
+        save_neighbours(
+            SimilarTitle.RATINGS,
+            compute_chunk(chunk, stats, top_k, min_common, max_pairs)
+        )
+        yield start + len(chunk)
+
+
+@transaction.atomic
+def save_neighbours(source, neighbours):
+    """
+    Заменяет сохранённых соседей произведений из neighbours
+    (словарь id произведения -> список (id соседа, сходство)).
+    """
+    SimilarTitle.objects.filter(
+        source=source, title_id__in=neighbours
+    ).delete()
+    SimilarTitle.objects.bulk_create(
+        SimilarTitle(title_id=target_id, similar_id=title_id,
+                     source=source, score=similarity)
+        for target_id, items in neighbours.items()
+        for title_id, similarity in items
+    )
+
+
+def load_title_features(titles=None):
+    """
+    Возвращает признаки (жанры и категория) произведений titles
+    (по умолчанию всех) и их взвешенные рейтинги.
+    Произведения без признаков пропускаются.
+    """
+    genres = Title.genre.through.objects.values_list('title_id', 'genre_id')
+    if titles is None:
+        titles = Title.objects.all()
+    else:
+        genres = genres.filter(title_id__in=titles.values('id'))
+    features = {}
+    ratings = {}
+    rows = titles.values_list('id', 'category_id', 'weighted_rating')
+    for title_id, category_id, weighted_rating in rows.iterator(
+        ITERATOR_CHUNK_SIZE
+    ):
+        features[title_id] = (
+            {('category', category_id)} if category_id else set()
+        )
+        ratings[title_id] = weighted_rating
+    for title_id, genre_id in genres.iterator(ITERATOR_CHUNK_SIZE):
+        # Произведение могло быть создано между запросами
+        if title_id in features:
+            features[title_id].add(('genre', genre_id))
+    return {
+        title_id: frozenset(title_features)
+        for title_id, title_features in features.items() if title_features
+    }, ratings
+
+
+def load_title_groups(features=None):
+    """
+    Группирует произведения по набору признаков: жанры и категория.
+    Внутри группы произведения отсортированы по взвешенному рейтингу,
+    чтобы среди одинаково похожих соседей первыми шли лучшие.
+    Различных наборов признаков намного меньше, чем произведений.
+    features ограничивает загрузку произведениями, у которых есть
+    хотя бы один из этих признаков: только они могут быть похожи
+    на произведения с такими признаками.
+    """
+    titles = None
+    if features is not None:
+        titles = Title.objects.filter(
+            Q(category_id__in=[
+                value for kind, value in features if kind == 'category'
+            ])
+            | Q(genre__in=[
+                value for kind, value in features if kind == 'genre'
+            ])
+        ).distinct()
+    title_features, ratings = load_title_features(titles)
+    groups = {}
+    for title_id, group_features in title_features.items():
+        groups.setdefault(group_features, []).append(title_id)
+    for title_ids in groups.values():
+        title_ids.sort(key=lambda title_id: (
+            ratings[title_id] is None, -(ratings[title_id] or 0), title_id
+        ))
+    return groups
+
+
+def group_neighbours(groups, features, top_k):
+    """
+    Возвращает top_k + 1 ближайших произведений для набора признаков
+    features по точному коэффициенту Жаккара между наборами.
+    """
+    similarities = sorted(
+        (
+            (len(features & other) / len(features | other), other)
+            for other in groups
+            if features & other
+        ),
+        key=lambda item: -item[0]
+    )
+    result = []
+    for similarity, other in similarities:
+        for title_id in groups[other][:top_k + 1 - len(result)]:
+            result.append((title_id, similarity))
+        if len(result) > top_k:
+            break
+    return result
+
+
+def collect_neighbours(groups, title_features, title_ids, top_k, cache):
+    """
+    Возвращает top_k соседей каждого произведения из title_ids
+    (пустой список для произведений без признаков). Соседи наборов
+    признаков запоминаются в cache.
+    """
+    neighbours = {}
+    for title_id in title_ids:
+        features = title_features.get(title_id)
+        if features is None:
+            neighbours[title_id] = []
+            continue
+        if features not in cache:
+            cache[features] = group_neighbours(groups, features, top_k)
+        neighbours[title_id] = [
+            item for item in cache[features] if item[0] != title_id
+        ][:top_k]
+    return neighbours
+
+
+def build_genre_neighbours(top_k, title_ids=None, chunk_size=500):
+    """
+    Пересчитывает похожих по жанрам и категории произведений
+    и сохраняет top_k соседей каждого произведения в SimilarTitle.
+    title_ids ограничивает пересчёт указанными произведениями.
+    Генерирует количество обработанных произведений после каждой группы.
+    """
+    groups = load_title_groups()
+    title_features = {
+        title_id: features
+        for features, group in groups.items()
+        for title_id in group
+    }
+    if title_ids is None:
+        title_ids = sorted(
+            set(title_features) | set(SimilarTitle.objects.filter(
+                source=SimilarTitle.GENRES
+            ).values_list('title_id', flat=True).distinct())
+        )
+    cache = {}
+    for start in range(0, len(title_ids), chunk_size):
+        neighbours = collect_neighbours(
+            groups, title_features, title_ids[start:start + chunk_size],
+            top_k, cache
+        )
+        save_neighbours(SimilarTitle.GENRES, neighbours)
+        yield start + len(neighbours)
+
+
+def update_genre_neighbours(top_k, title_ids, chunk_size=500):
+    """
+    Пересчитывает похожих по жанрам для изменённых произведений
+    title_ids и произведений, в списках которых они уже есть.
+    Загружаются только произведения с общими с ними признаками.
+    В списки остальных произведений изменённое произведение попадает
+    при пересчёте всего каталога командой build_genre_neighbours,
+    которую нужно запускать по расписанию.
+    """
+    referencing = SimilarTitle.objects.filter(
+        source=SimilarTitle.GENRES, similar_id__in=title_ids
+    ).values_list('title_id', flat=True)
+    targets = sorted(set(title_ids) | set(referencing))
+    title_features, _ = load_title_features(Title.objects.filter(
+        Q(pk__in=title_ids) | Q(pk__in=referencing)
+    ))
+    groups = load_title_groups(frozenset().union(*title_features.values()))
+    cache = {}
+    for start in range(0, len(targets), chunk_size):
+        save_neighbours(SimilarTitle.GENRES, collect_neighbours(
+            groups, title_features, targets[start:start + chunk_size],
+            top_k, cache
+        ))
@@ -0,0 +1,100 @@
+from django.conf import settings
+from django.db.models import (Count, ExpressionWrapper, F, FloatField,
+                              IntegerField, OuterRef, Subquery, Sum)
+from django.db.models.functions import Cast, Coalesce, NullIf
+
+from .core import SCORE_FIELDS, SCORES
+from .models import Review, Title
+
+
+def rating_expression(score_sum, reviews_count):
+    """
+    Выражение для среднего значения оценок, NULL если отзывов нет.
+    """
+    return Cast(score_sum, FloatField()) / NullIf(reviews_count, 0)
+
+
+def weighted_rating_expression(score_sum, reviews_count):
+    """
+    Выражение для взвешенного рейтинга (v * R + m * C) / (v + m):
+    средняя оценка R, смещённая к RATING_PRIOR_MEAN (C), пока отзывов (v)
+    меньше RATING_MIN_VOTES (m). NULL если отзывов нет.
+    """
+    min_votes = settings.RATING_MIN_VOTES
+    return ExpressionWrapper(
+        (
+            reviews_count * rating_expression(score_sum, reviews_count)
+            + min_votes * settings.RATING_PRIOR_MEAN
+        ) / (reviews_count + min_votes),
+        output_field=FloatField()
+    )
+
+
+def score_field(score):
+    """
+    Имя поля гистограммы оценок произведения для оценки score.
+    """
+    return SCORE_FIELDS[score - SCORES.start]
+
+
+def apply_review_change(title_id, old_score=None, new_score=None):
+    """
+    Обновляет статистику и гистограмму оценок произведения
+    одним запросом UPDATE.
+    old_score=None - отзыв создан, new_score=None - отзыв удалён.
+    """
+    histogram = {}
+    if old_score is not None:
+        histogram[score_field(old_score)] = F(score_field(old_score)) - 1
+    if new_score is not None:
+        histogram[score_field(new_score)] = F(score_field(new_score)) + 1
+    score_sum = F('score_sum') + (new_score or 0) - (old_score or 0)
+    reviews_count = (
+        F('reviews_count')
+        + (new_score is not None) - (old_score is not None)
+    )
+    Title.objects.filter(pk=title_id).update(
+        score_sum=score_sum,
+        reviews_count=reviews_count,
+        rating=rating_expression(score_sum, reviews_count),
+        weighted_rating=weighted_rating_expression(score_sum, reviews_count),
+        **histogram,
+    )
+
+
+def recalculate_title_stats(titles=None):
+    """
+    Полностью пересчитывает статистику произведений по их отзывам.
+    Нужен после массовой загрузки данных, которая не отправляет сигналы.
+    """
+    if titles is None:
+        titles = Title.objects.all()
+    reviews = Review.objects.filter(
+        title=OuterRef('pk')
+    ).order_by().values('title')
+    histogram = {
+        score_field(score): Coalesce(
+            Subquery(reviews.filter(score=score).annotate(
+                value=Count('id')
+            ).values('value')),
+            0, output_field=IntegerField()
+        )
+        for score in SCORES
+    }
+    titles.update(
+        **histogram,
+        score_sum=Coalesce(
+            Subquery(reviews.annotate(value=Sum('score')).values('value')),
+            0, output_field=IntegerField()
+        ),
+        reviews_count=Coalesce(
+            Subquery(reviews.annotate(value=Count('id')).values('value')),
+            0, output_field=IntegerField()
+        ),
+    )
+    titles.update(
+        rating=rating_expression(F('score_sum'), F('reviews_count')),
+        weighted_rating=weighted_rating_expression(
+            F('score_sum'), F('reviews_count')
+        ),
+    )
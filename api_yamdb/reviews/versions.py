@@ -0,0 +1,79 @@
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+VERSION_KEY = 'version:{}'
+# Версии произведения (его полей, жанров и статистики оценок)
+# и каталога (категорий и жанров, которые входят во все произведения)
+TITLE_VERSION = 'title:{}'
+CATALOG_VERSION = 'catalog'
+# Версии таблиц и списков: произведений, категорий, жанров,
+# отзывов на произведение, комментариев, данных пользователей
+# (изменение и удаление) и списка пользователей (в том числе создание)
+TITLES_VERSION = 'titles'
+CATEGORIES_VERSION = 'categories'
+GENRES_VERSION = 'genres'
+REVIEWS_VERSION = 'reviews:{}'
+COMMENTS_VERSION = 'comments'
+USERS_VERSION = 'users'
+USER_LIST_VERSION = 'user-list'
+# Версия данных авторизации пользователя (роль, активность),
+# входит в выданные ему токены
+AUTH_VERSION = 'auth:{}'
+# Версия списка отозванных токенов
+REVOCATION_VERSION = 'revocations'
+
+
+def _now():
+    return int(time.time() * 1_000_000)
+
+
+def get_version(name):
+    """
+    Возвращает текущую версию данных с именем name.
+    Версия - отметка времени последнего изменения в микросекундах,
+    хранится в кеше и общая для всех процессов, использующих этот кеш.
+    """
+    key = VERSION_KEY.format(name)
+    version = cache.get(key)
+    if version is None:
+        version = _now()
+        if not cache.add(key, version, timeout=None):
+            version = cache.get(key, version)
+    return version
+
+
+def get_versions(names):
+    """
+    Возвращает словарь версий данных с именами names
+    одним обращением к кешу.
+    """
+    keys = {VERSION_KEY.format(name): name for name in names}
+    versions = {
+        keys[key]: version for key, version in cache.get_many(keys).items()
+    }
+    for name in names:
+        if name not in versions:
+            versions[name] = get_version(name)
+    return versions
+
+
+def bump_version_on_commit(*names):
+    """
+    Обновляет версии после фиксации текущей транзакции,
+    чтобы данные, закешированные по новой версии, уже были в базе.
+    """
+    transaction.on_commit(lambda: bump_version(*names))
+
+
+def bump_version(*names):
+    """
+    Обновляет версии данных с именами names и возвращает новую версию.
+    """
+    version = _now()
+    cache.set_many(
+        {VERSION_KEY.format(name): version for name in names},
+        timeout=None
+    )
+    return version
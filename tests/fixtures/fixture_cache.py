@@ -0,0 +1,32 @@
+import copy
+
+import pytest
+from django.conf import settings
+from django.core.cache import caches
+from django.test import override_settings
+
+
+def clear_caches():
+    for cache in caches.all():
+        cache.clear()
+
+
+@pytest.fixture(scope='session', autouse=True)
+def cache_location(tmp_path_factory):
+    """
+    Кеш по умолчанию хранится во временном файле, а не в cache.sqlite3
+    проекта: тесты очищают кеш, которым может пользоваться сервер.
+    """
+    caches_setting = copy.deepcopy(settings.CACHES)
+    caches_setting['default']['LOCATION'] = (
+        tmp_path_factory.mktemp('cache') / 'cache.sqlite3'
+    )
+    with override_settings(CACHES=caches_setting):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def clear_cache(cache_location):
+    clear_caches()
+    yield
+    clear_caches()
@@ -0,0 +1,62 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleFacetsAPI:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_title_facets(self, admin_client, client):
+        create_titles(admin_client)
+        response = client.get(
+            f'{self.TITLES_URL}?facets=genre,category,year'
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что GET-запрос к `/api/v1/titles/?facets=...` '
+            'возвращает ответ со статусом 200.'
+        )
+        data = response.json()
+        assert data.get('count') == 2 and len(data.get('results')) == 2, (
+            'Проверьте, что параметр `facets` не меняет основной '
+            'ответ со списком произведений.'
+        )
+        assert data.get('facets') == {
+            'genre': {'horror': 1, 'comedy': 1, 'drama': 1},
+            'category': {'films': 1, 'books': 1},
+            'year': {'1980': 2},
+        }, (
+            'Проверьте, что ключ `facets` содержит количество произведений '
+            'по жанрам, категориям и десятилетиям.'
+        )
+
+    def test_02_title_facets_with_filter(self, admin_client, client):
+        create_titles(admin_client)
+        response = client.get(
+            f'{self.TITLES_URL}?genre=horror&facets=genre'
+        )
+        data = response.json()
+        assert data.get('facets') == {
+            'genre': {'horror': 1, 'comedy': 1}
+        }, (
+            'Проверьте, что фасеты считаются только по отфильтрованным '
+            'произведениям.'
+        )
+
+    def test_03_title_facets_unknown(self, client):
+        response = client.get(f'{self.TITLES_URL}?facets=author')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что при запросе неизвестного фасета возвращается '
+            'ответ со статусом 400.'
+        )
+
+    def test_04_title_without_facets(self, admin_client, client):
+        create_titles(admin_client)
+        response = client.get(self.TITLES_URL)
+        assert 'facets' not in response.json(), (
+            'Проверьте, что без параметра `facets` ответ не содержит '
+            'ключ `facets`.'
+        )
@@ -0,0 +1,159 @@
+import re
+from http import HTTPStatus
+
+import pytest
+from django.conf import settings
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from api.genre_index import (GENRE_INDEX_VERSION, bitmap_slice, bitmap_to_ids,
+                             genre_index, ids_to_bitmap)
+from reviews.models import Genre, Title
+from reviews.versions import get_version
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09GenreIndex:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def get_names(self, client, query):
+        response = client.get(f'{self.TITLES_URL}?{query}')
+        assert response.status_code == HTTPStatus.OK
+        return {title['name'] for title in response.json()['results']}
+
+    def test_01_filter_any_and_all_genres(self, admin_client, client):
+        titles, _, _ = create_titles(admin_client)
+        assert self.get_names(client, 'genre=horror,drama') == {
+            titles[0]['name'], titles[1]['name']
+        }, (
+            'Проверьте, что фильтр `genre` со списком жанров возвращает '
+            'произведения хотя бы с одним из жанров.'
+        )
+        assert self.get_names(client, 'genre_all=horror,comedy') == {
+            titles[0]['name']
+        }, (
+            'Проверьте, что фильтр `genre_all` возвращает произведения '
+            'со всеми указанными жанрами.'
+        )
+        assert self.get_names(client, 'genre_all=horror,drama') == set()
+        assert self.get_names(client, 'genre=unknown') == set()
+
+    def test_02_index_follows_title_changes(self, admin_client, client):
+        titles, _, _ = create_titles(admin_client)
+        self.get_names(client, 'genre=drama')
+        admin_client.patch(
+            self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id']),
+            data={'genre': ['drama']}
+        )
+        assert self.get_names(client, 'genre=drama') == {
+            titles[0]['name'], titles[1]['name']
+        }, (
+            'Проверьте, что индекс жанров обновляется при изменении '
+            'жанров произведения.'
+        )
+        assert self.get_names(client, 'genre=horror') == set()
+
+        admin_client.delete(
+            self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[1]['id'])
+        )
+        assert self.get_names(client, 'genre=drama') == {
+            titles[0]['name']
+        }, (
+            'Проверьте, что индекс жанров обновляется при удалении '
+            'произведения.'
+        )
+        response = client.get(f'{self.TITLES_URL}?facets=genre')
+        assert response.json()['facets'] == {'genre': {'drama': 1}}
+
+    def test_03_index_changes_on_commit(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        title = Title.objects.get(pk=titles[0]['id'])
+        drama = Genre.objects.get(slug='drama')
+        genre_index.any_of(['drama'])
+        version = get_version(GENRE_INDEX_VERSION)
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                title.genre.add(drama)
+                assert get_version(GENRE_INDEX_VERSION) == version, (
+                    'Проверьте, что версия индекса жанров обновляется '
+                    'только после фиксации транзакции.'
+                )
+                raise RuntimeError
+        assert title.pk not in bitmap_to_ids(genre_index.any_of(['drama'])), (
+            'Проверьте, что индекс жанров не меняется при откате транзакции.'
+        )
+        with transaction.atomic():
+            title.genre.add(drama)
+        assert title.pk in bitmap_to_ids(genre_index.any_of(['drama']))
+
+    def test_04_genre_pages_from_index(self, client):
+        drama = Genre.objects.create(name='Драма', slug='drama')
+        comedy = Genre.objects.create(name='Комедия', slug='comedy')
+        names = [f'Драма {index:02}' for index in range(15)]
+        for name in reversed(names):
+            Title.objects.create(name=name, year=2000).genre.add(drama)
+        Title.objects.create(name='Комедия', year=2000).genre.add(comedy)
+        genre_index.any_of(['drama'])
+
+        results = []
+        with CaptureQueriesContext(connection) as context:
+            for page in (1, 2):
+                response = client.get(
+                    f'{self.TITLES_URL}?genre=drama&page={page}'
+                )
+                assert response.status_code == HTTPStatus.OK
+                assert response.json()['count'] == len(names)
+                results += response.json()['results']
+        assert [title['name'] for title in results] == names, (
+            'Проверьте, что страницы списка с фильтром по жанрам '
+            'возвращаются в порядке сортировки списка.'
+        )
+        queries = ' '.join(
+            query['sql'] for query in context.captured_queries
+        )
+        assert 'COUNT(' not in queries.upper(), (
+            'Проверьте, что количество произведений жанра берётся '
+            'из индекса жанров.'
+        )
+        largest_in = max(
+            (len(values.split(',')) for values in re.findall(
+                r'IN \(([^()]*)\)', queries
+            )),
+            default=0
+        )
+        assert largest_in <= settings.REST_FRAMEWORK['PAGE_SIZE'], (
+            'Проверьте, что в запросы передаются только id произведений '
+            'запрошенной страницы.'
+        )
+
+        drama_ids = sorted(drama.title_set.values_list('id', flat=True))
+        for ordering, expected in (
+            ('id', drama_ids), ('-id', drama_ids[::-1])
+        ):
+            response = client.get(
+                f'{self.TITLES_URL}?genre=drama&ordering={ordering}&page=2'
+            )
+            assert [
+                title['id'] for title in response.json()['results']
+            ] == expected[settings.REST_FRAMEWORK['PAGE_SIZE']:], (
+                'Проверьте, что страницы списка с фильтром по жанрам '
+                f'возвращаются в порядке `ordering={ordering}`.'
+            )
+
+        response = client.get(f'{self.TITLES_URL}?genre=drama&year=2000')
+        assert response.json()['count'] == len(names), (
+            'Проверьте, что фильтр по жанрам работает вместе '
+            'с другими фильтрами.'
+        )
+
+    def test_05_bitmap_slice(self):
+        ids = [1, 2, 4095, 4096, 4097, 9000, 20000, 20001]
+        bitmap = ids_to_bitmap(ids)
+        for start, stop in ((0, 2), (1, 5), (2, 4), (3, 8), (5, 20), (8, 9)):
+            assert bitmap_slice(bitmap, start, stop) == ids[start:stop], (
+                'Проверьте, что срез битовой карты совпадает со срезом '
+                'отсортированного списка id.'
+            )
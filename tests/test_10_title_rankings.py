@@ -0,0 +1,111 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import transaction
+
+from api.rankings import TRENDING_VERSION
+from reviews.models import Review
+from reviews.versions import get_version
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10TitleRankingsAPI:
+
+    TOP_URL = '/api/v1/titles/top/'
+    TRENDING_URL = '/api/v1/titles/trending/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def get_ids(self, client, url):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает ответ '
+            'со статусом 200.'
+        )
+        return [title['id'] for title in response.json()]
+
+    def test_01_top_titles(self, admin_client, user_client, moderator_client,
+                           client):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'text', 4)
+        create_single_review(user_client, titles[1]['id'], 'text', 9)
+        create_single_review(moderator_client, titles[0]['id'], 'text', 6)
+        create_single_review(admin_client, titles[1]['id'], 'text', 7)
+
+        assert self.get_ids(client, self.TOP_URL) == [
+            titles[1]['id'], titles[0]['id']
+        ], (
+            f'Проверьте, что `{self.TOP_URL}` возвращает произведения '
+            'в порядке убывания рейтинга.'
+        )
+        assert self.get_ids(client, f'{self.TOP_URL}?category=films') == [
+            titles[0]['id']
+        ]
+        assert self.get_ids(client, f'{self.TOP_URL}?genre=drama') == [
+            titles[1]['id']
+        ]
+        assert self.get_ids(client, f'{self.TOP_URL}?limit=1') == [
+            titles[1]['id']
+        ]
+        response = client.get(f'{self.TOP_URL}?limit=0')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_02_rating_follows_reviews(self, admin_client, user_client,
+                                       moderator_client, client):
+        titles, _, _ = create_titles(admin_client)
+        url = self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        review = create_single_review(
+            user_client, titles[0]['id'], 'text', 4
+        ).json()
+        create_single_review(moderator_client, titles[0]['id'], 'text', 6)
+        assert client.get(url).json()['rating'] == 5, (
+            'Проверьте, что рейтинг произведения обновляется при создании '
+            'отзыва.'
+        )
+        review_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        user_client.patch(f'{review_url}{review["id"]}/', data={'score': 10})
+        assert client.get(url).json()['rating'] == 8, (
+            'Проверьте, что рейтинг произведения обновляется при изменении '
+            'оценки.'
+        )
+        user_client.delete(f'{review_url}{review["id"]}/')
+        assert client.get(url).json()['rating'] == 6, (
+            'Проверьте, что рейтинг произведения обновляется при удалении '
+            'отзыва.'
+        )
+
+    def test_03_trending_titles(self, admin_client, user_client,
+                                moderator_client, client):
+        titles, _, _ = create_titles(admin_client)
+        assert self.get_ids(client, self.TRENDING_URL) == []
+        create_single_review(user_client, titles[1]['id'], 'text', 1)
+        assert self.get_ids(client, self.TRENDING_URL) == [
+            titles[1]['id']
+        ], (
+            f'Проверьте, что `{self.TRENDING_URL}` обновляется при '
+            'появлении новых отзывов.'
+        )
+        create_single_review(user_client, titles[0]['id'], 'text', 1)
+        create_single_review(moderator_client, titles[0]['id'], 'text', 1)
+        assert self.get_ids(client, self.TRENDING_URL) == [
+            titles[0]['id'], titles[1]['id']
+        ], (
+            f'Проверьте, что `{self.TRENDING_URL}` возвращает произведения '
+            'в порядке убывания числа новых отзывов.'
+        )
+        assert self.get_ids(
+            client, f'{self.TRENDING_URL}?category=books'
+        ) == [titles[1]['id']]
+
+    def test_04_trending_version_on_commit(self, admin_client, user):
+        titles, _, _ = create_titles(admin_client)
+        version = get_version(TRENDING_VERSION)
+        with transaction.atomic():
+            Review.objects.create(
+                author=user, title_id=titles[0]['id'], text='text', score=5
+            )
+            assert get_version(TRENDING_VERSION) == version, (
+                'Проверьте, что версия популярных произведений обновляется '
+                'только после фиксации транзакции с отзывом.'
+            )
+        assert get_version(TRENDING_VERSION) != version
@@ -0,0 +1,70 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11WeightedRatingAPI:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.fixture(autouse=True)
+    def rating_settings(self, settings):
+        settings.RATING_PRIOR_MEAN = 5.0
+        settings.RATING_MIN_VOTES = 2
+
+    def test_01_weighted_rating(self, admin_client, user_client,
+                                moderator_client, client):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'text', 10)
+        create_single_review(user_client, titles[1]['id'], 'text', 9)
+        create_single_review(moderator_client, titles[1]['id'], 'text', 9)
+
+        response = client.get(self.TITLES_URL)
+        assert response.status_code == HTTPStatus.OK
+        ratings = {
+            title['id']: (title['rating'], title['weighted_rating'])
+            for title in response.json()['results']
+        }
+        assert ratings[titles[0]['id']] == (10, 20 / 3), (
+            'Проверьте, что поле `weighted_rating` равно '
+            '(сумма оценок + m * C) / (число отзывов + m).'
+        )
+        assert ratings[titles[1]['id']] == (9, 7.0)
+
+        response = client.get(f'{self.TITLES_URL}?ordering=-weighted_rating')
+        assert [
+            title['id'] for title in response.json()['results']
+        ] == [titles[1]['id'], titles[0]['id']], (
+            'Проверьте, что произведения можно отсортировать по '
+            '`weighted_rating`.'
+        )
+        response = client.get(f'{self.TITLES_URL}?ordering=-rating')
+        assert response.json()['results'][0]['id'] == titles[0]['id']
+
+        response = client.get(f'{self.TITLES_URL}?weighted_rating_min=6.9')
+        assert [
+            title['id'] for title in response.json()['results']
+        ] == [titles[1]['id']], (
+            'Проверьте, что произведения можно отфильтровать по '
+            '`weighted_rating_min`.'
+        )
+
+        response = client.get('/api/v1/titles/top/')
+        assert [title['id'] for title in response.json()] == [
+            titles[1]['id'], titles[0]['id']
+        ], (
+            'Проверьте, что `/api/v1/titles/top/` сортирует произведения '
+            'по взвешенному рейтингу.'
+        )
+
+    def test_02_weighted_rating_without_reviews(self, admin_client, client):
+        create_titles(admin_client)
+        response = client.get(self.TITLES_URL)
+        for title in response.json()['results']:
+            assert title['weighted_rating'] is None, (
+                'Проверьте, что без отзывов значением поля `weighted_rating` '
+                'должно быть `None`.'
+            )
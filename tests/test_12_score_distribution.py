@@ -0,0 +1,74 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+def distribution(**counts):
+    result = {str(score): 0 for score in range(1, 11)}
+    result.update(counts)
+    return result
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12ScoreDistributionAPI:
+
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    DISTRIBUTION_URL = '/api/v1/titles/score_distribution/'
+
+    def test_01_title_detail_distribution(self, admin_client, user_client,
+                                          moderator_client, client):
+        titles, _, _ = create_titles(admin_client)
+        url = self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        assert client.get(url).json().get('score_distribution') == (
+            distribution()
+        ), (
+            f'Проверьте, что ответ на GET-запрос к `{url}` содержит поле '
+            '`score_distribution` с количеством оценок от 1 до 10.'
+        )
+        review = create_single_review(
+            user_client, titles[0]['id'], 'text', 3
+        ).json()
+        create_single_review(moderator_client, titles[0]['id'], 'text', 3)
+        assert client.get(url).json()['score_distribution'] == (
+            distribution(**{'3': 2})
+        ), 'Проверьте, что распределение оценок обновляется при новом отзыве.'
+
+        review_url = (
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{review["id"]}/'
+        )
+        user_client.patch(review_url, data={'score': 10})
+        assert client.get(url).json()['score_distribution'] == (
+            distribution(**{'3': 1, '10': 1})
+        ), (
+            'Проверьте, что распределение оценок обновляется при изменении '
+            'оценки.'
+        )
+        user_client.delete(review_url)
+        assert client.get(url).json()['score_distribution'] == (
+            distribution(**{'3': 1})
+        ), (
+            'Проверьте, что распределение оценок обновляется при удалении '
+            'отзыва.'
+        )
+
+    def test_02_bulk_distribution(self, admin_client, user_client, client):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[1]['id'], 'text', 7)
+        response = client.get(
+            f'{self.DISTRIBUTION_URL}?ids={titles[0]["id"]},'
+            f'{titles[1]["id"]},9999'
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.DISTRIBUTION_URL}` '
+            'возвращает ответ со статусом 200.'
+        )
+        assert response.json() == {
+            str(titles[0]['id']): distribution(),
+            str(titles[1]['id']): distribution(**{'7': 1}),
+        }
+        response = client.get(f'{self.DISTRIBUTION_URL}?ids=abc')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        response = client.get(self.DISTRIBUTION_URL)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
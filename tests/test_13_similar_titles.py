@@ -0,0 +1,107 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews import similarity
+from reviews.models import Review, SimilarTitle, User
+from reviews.similarity import build_similar_titles
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13SimilarTitlesAPI:
+
+    SIMILAR_URL_TEMPLATE = '/api/v1/titles/{title_id}/similar/'
+
+    def test_01_similar_titles(self, admin_client, user_client,
+                               moderator_client, client):
+        titles, _, _ = create_titles(admin_client)
+        first, second = titles[0]['id'], titles[1]['id']
+        url = self.SIMILAR_URL_TEMPLATE.format(title_id=first)
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает ответ '
+            'со статусом 200.'
+        )
+        assert response.json() == []
+
+        for author_client, first_score, second_score in (
+            (user_client, 10, 9),
+            (moderator_client, 2, 1),
+            (admin_client, 6, 5),
+        ):
+            create_single_review(author_client, first, 'text', first_score)
+            create_single_review(author_client, second, 'text', second_score)
+        call_command('build_similar_titles', stdout=None)
+
+        response = client.get(url)
+        assert [title['id'] for title in response.json()] == [second], (
+            f'Проверьте, что `{url}` возвращает произведения, которые '
+            'пользователи оценили похоже.'
+        )
+        assert response.json()[0]['name'] == titles[1]['name']
+
+    def test_02_similar_titles_not_found(self, client):
+        response = client.get(self.SIMILAR_URL_TEMPLATE.format(title_id=999))
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_03_bounded_parts(self, admin_client, user_client,
+                              moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        first, second = titles[0]['id'], titles[1]['id']
+        for author_client, first_score, second_score in (
+            (user_client, 10, 9),
+            (moderator_client, 2, 1),
+            (admin_client, 6, 5),
+        ):
+            create_single_review(author_client, first, 'text', first_score)
+            create_single_review(author_client, second, 'text', second_score)
+
+        def stored():
+            return sorted(SimilarTitle.objects.filter(
+                source=SimilarTitle.RATINGS
+            ).values_list('title_id', 'similar_id', 'score'))
+
+        list(build_similar_titles(10))
+        expected = stored()
+        assert expected
+        list(build_similar_titles(10, max_pairs=1))
+        assert stored() == expected, (
+            'Проверьте, что при обработке группы частями результат '
+            'не меняется.'
+        )
+
+    def test_04_reviews_changed_during_build(self, admin_client, user_client,
+                                             moderator_client, moderator,
+                                             monkeypatch):
+        titles, _, _ = create_titles(admin_client)
+        first, second = titles[0]['id'], titles[1]['id']
+        for author_client, first_score, second_score in (
+            (user_client, 10, 9),
+            (moderator_client, 2, 1),
+            (admin_client, 6, 5),
+        ):
+            create_single_review(author_client, first, 'text', first_score)
+            create_single_review(author_client, second, 'text', second_score)
+        load_raters = similarity.load_raters
+
+        def load_raters_and_change(chunk, stats):
+            raters = load_raters(chunk, stats)
+            Review.objects.filter(author=moderator).delete()
+            Review.objects.create(
+                author=User.objects.create(
+                    username='late', email='late@yamdb.fake'
+                ),
+                title_id=first, text='text', score=7
+            )
+            return raters
+
+        monkeypatch.setattr(similarity, 'load_raters', load_raters_and_change)
+        list(build_similar_titles(10))
+        assert SimilarTitle.objects.filter(
+            source=SimilarTitle.RATINGS, title_id=first
+        ).exists(), (
+            'Проверьте, что отзывы, созданные или удалённые во время '
+            'расчёта похожих произведений, не прерывают его.'
+        )
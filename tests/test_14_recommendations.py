@@ -0,0 +1,74 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews.factorization import FactorizationModel
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14RecommendationsAPI:
+
+    RECOMMENDATIONS_URL = '/api/v1/users/me/recommendations/'
+
+    def test_01_recommendations_not_auth(self, client):
+        response = client.get(self.RECOMMENDATIONS_URL)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что GET-запрос неавторизованного пользователя к '
+            f'`{self.RECOMMENDATIONS_URL}` возвращает ответ со статусом 401.'
+        )
+
+    def test_02_recommendations(self, admin_client, user_client,
+                                moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        response = user_client.get(self.RECOMMENDATIONS_URL)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что GET-запрос пользователя к '
+            f'`{self.RECOMMENDATIONS_URL}` возвращает ответ со статусом 200.'
+        )
+        assert response.json() == [], (
+            'Проверьте, что без факторов пользователю возвращаются лучшие '
+            'произведения с отзывами.'
+        )
+        create_single_review(user_client, titles[0]['id'], 'text', 9)
+        create_single_review(moderator_client, titles[0]['id'], 'text', 8)
+        create_single_review(moderator_client, titles[1]['id'], 'text', 7)
+        call_command('train_recommendations', epochs=2, seed=1, stdout=None)
+
+        response = user_client.get(self.RECOMMENDATIONS_URL)
+        assert [title['id'] for title in response.json()] == [
+            titles[1]['id']
+        ], (
+            f'Проверьте, что `{self.RECOMMENDATIONS_URL}` не возвращает '
+            'произведения, на которые пользователь уже оставил отзыв.'
+        )
+        response = moderator_client.get(self.RECOMMENDATIONS_URL)
+        assert response.json() == []
+
+    def test_03_precomputed_recommendations(self, admin_client, user_client,
+                                            moderator_client, monkeypatch):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(moderator_client, titles[0]['id'], 'text', 8)
+        create_single_review(moderator_client, titles[1]['id'], 'text', 7)
+        create_single_review(user_client, titles[0]['id'], 'text', 9)
+        call_command('train_recommendations', epochs=2, seed=1, stdout=None)
+
+        def fail(*args, **kwargs):
+            raise AssertionError('recommend')
+
+        monkeypatch.setattr(FactorizationModel, 'recommend', fail)
+        response = user_client.get(self.RECOMMENDATIONS_URL)
+        assert [title['id'] for title in response.json()] == [
+            titles[1]['id']
+        ], (
+            f'Проверьте, что `{self.RECOMMENDATIONS_URL}` возвращает '
+            'рекомендации, подобранные командой `train_recommendations`, '
+            'без расчёта оценок в запросе.'
+        )
+        create_single_review(user_client, titles[1]['id'], 'text', 5)
+        response = user_client.get(self.RECOMMENDATIONS_URL)
+        assert response.json() == [], (
+            f'Проверьте, что `{self.RECOMMENDATIONS_URL}` не возвращает '
+            'произведения, оценённые пользователем после обучения.'
+        )
@@ -0,0 +1,81 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews import signals, similarity
+from reviews.similarity import load_title_groups, update_genre_neighbours
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15GenreNeighboursAPI:
+
+    TITLES_URL = '/api/v1/titles/'
+    SIMILAR_URL_TEMPLATE = '/api/v1/titles/{title_id}/similar/'
+
+    def get_similar_ids(self, client, title_id):
+        url = self.SIMILAR_URL_TEMPLATE.format(title_id=title_id)
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает ответ '
+            'со статусом 200.'
+        )
+        return [title['id'] for title in response.json()]
+
+    def test_01_genre_neighbours(self, admin_client, client, monkeypatch):
+        titles, _, _ = create_titles(admin_client)
+        response = admin_client.post(self.TITLES_URL, data={
+            'name': 'Чужой',
+            'year': 1979,
+            'genre': ['horror'],
+            'category': 'films',
+        })
+        assert response.status_code == HTTPStatus.CREATED
+        new_id = response.json()['id']
+
+        assert self.get_similar_ids(client, new_id) == [titles[0]['id']], (
+            'Проверьте, что для произведения без оценок возвращаются '
+            'произведения с похожими жанрами и категорией.'
+        )
+
+        call_command('build_genre_neighbours', stdout=None)
+        assert self.get_similar_ids(client, titles[0]['id']) == [new_id], (
+            'Проверьте, что команда `build_genre_neighbours` пересчитывает '
+            'похожие произведения для всего каталога.'
+        )
+
+        refreshes = []
+        loads = []
+
+        def update(top_k, title_ids):
+            refreshes.append(set(title_ids))
+            update_genre_neighbours(top_k, title_ids)
+
+        def load(features=None):
+            loads.append(features)
+            return load_title_groups(features)
+
+        monkeypatch.setattr(signals, 'update_genre_neighbours', update)
+        monkeypatch.setattr(similarity, 'load_title_groups', load)
+        response = admin_client.patch(
+            f'{self.TITLES_URL}{new_id}/',
+            data={'genre': ['drama'], 'category': 'books'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert refreshes == [{new_id}], (
+            'Проверьте, что похожие по жанрам пересчитываются один раз '
+            'за транзакцию изменения произведения.'
+        )
+        assert loads and None not in loads, (
+            'Проверьте, что при изменении произведения загружаются только '
+            'произведения с общими признаками, а не весь каталог.'
+        )
+        assert self.get_similar_ids(client, new_id) == [titles[1]['id']], (
+            'Проверьте, что похожие по жанрам произведения обновляются '
+            'при изменении произведения.'
+        )
+        assert new_id not in self.get_similar_ids(client, titles[0]['id']), (
+            'Проверьте, что изменённое произведение удаляется из списков '
+            'похожих произведений, на которые оно больше не похоже.'
+        )
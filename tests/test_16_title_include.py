@@ -0,0 +1,73 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import (create_single_comment, create_single_review,
+                         create_titles)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16TitleIncludeAPI:
+
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    @pytest.fixture(autouse=True)
+    def include_limits(self, settings):
+        settings.TITLE_INCLUDE_REVIEWS = 2
+        settings.TITLE_INCLUDE_COMMENTS = 1
+
+    def create_title_with_reviews(self, admin_client, user_client,
+                                  moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        reviews = [
+            create_single_review(author_client, title_id, 'text', 5).json()
+            for author_client in (user_client, moderator_client, admin_client)
+        ]
+        for text in ('first', 'second'):
+            create_single_comment(
+                admin_client, title_id, reviews[0]['id'], text
+            )
+        return title_id, reviews
+
+    def test_01_include_reviews_and_comments(self, admin_client, user_client,
+                                             moderator_client, client,
+                                             django_assert_max_num_queries):
+        title_id, reviews = self.create_title_with_reviews(
+            admin_client, user_client, moderator_client
+        )
+        url = self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+
+        response = client.get(url)
+        assert 'reviews' not in response.json(), (
+            f'Проверьте, что без параметра include ответ на `{url}` '
+            'не содержит отзывов.'
+        )
+
+        with django_assert_max_num_queries(4):
+            response = client.get(f'{url}?include=reviews,comments')
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert [review['id'] for review in data['reviews']] == [
+            reviews[0]['id'], reviews[1]['id']
+        ], (
+            f'Проверьте, что `{url}?include=reviews` возвращает первые '
+            'отзывы произведения.'
+        )
+        assert data['reviews'][0]['author'] == reviews[0]['author']
+        assert [
+            comment['text'] for comment in data['reviews'][0]['comments']
+        ] == ['first'], (
+            f'Проверьте, что `{url}?include=comments` возвращает первые '
+            'комментарии к каждому отзыву.'
+        )
+        assert data['reviews'][1]['comments'] == []
+
+        response = client.get(f'{url}?include=reviews')
+        assert 'comments' not in response.json()['reviews'][0]
+
+    def test_02_unknown_include(self, admin_client, client):
+        titles, _, _ = create_titles(admin_client)
+        url = self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        response = client.get(f'{url}?include=authors')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
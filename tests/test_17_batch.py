@@ -0,0 +1,121 @@
+import json
+from http import HTTPStatus
+
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17BatchAPI:
+
+    BATCH_URL = '/api/v1/batch/'
+
+    def post_batch(self, client, requests):
+        response = client.post(
+            self.BATCH_URL, data=json.dumps({'requests': requests}),
+            content_type='application/json'
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что POST-запрос к `{self.BATCH_URL}` с корректными '
+            'данными возвращает ответ со статусом 200.'
+        )
+        return response.json()
+
+    def test_01_batch_requests(self, admin_client):
+        responses = self.post_batch(admin_client, [
+            {'method': 'GET', 'path': '/api/v1/genres/'},
+            {'method': 'POST', 'path': '/api/v1/genres/',
+             'body': {'name': 'Драма', 'slug': 'drama'}},
+            {'method': 'GET', 'path': '/api/v1/genres/?search=Драма'},
+            {'method': 'GET', 'path': '/api/v1/users/me/'},
+        ])
+        assert [response['status'] for response in responses] == [
+            HTTPStatus.OK, HTTPStatus.CREATED, HTTPStatus.OK, HTTPStatus.OK
+        ], (
+            f'Проверьте, что `{self.BATCH_URL}` возвращает статусы '
+            'вложенных запросов в порядке их следования.'
+        )
+        assert responses[0]['body']['count'] == 0
+        assert responses[2]['body']['results'] == [
+            {'name': 'Драма', 'slug': 'drama'}
+        ], (
+            'Проверьте, что вложенные запросы видят изменения, сделанные '
+            'предыдущими запросами пакета.'
+        )
+        assert responses[3]['body']['role'] == 'admin'
+
+    def test_02_batch_permissions(self, client, user_client):
+        requests = [
+            {'method': 'GET', 'path': '/api/v1/users/me/'},
+            {'method': 'POST', 'path': '/api/v1/genres/',
+             'body': {'name': 'Драма', 'slug': 'drama'}},
+        ]
+        responses = self.post_batch(client, requests)
+        assert [response['status'] for response in responses] == [
+            HTTPStatus.UNAUTHORIZED, HTTPStatus.UNAUTHORIZED
+        ], (
+            'Проверьте, что права доступа проверяются для каждого '
+            'вложенного запроса.'
+        )
+        responses = self.post_batch(user_client, requests)
+        assert [response['status'] for response in responses] == [
+            HTTPStatus.OK, HTTPStatus.FORBIDDEN
+        ]
+
+    def test_03_batch_invalid(self, admin_client):
+        responses = self.post_batch(admin_client, [
+            {'method': 'GET', 'path': '/api/v1/unknown/'},
+            {'method': 'POST', 'path': self.BATCH_URL, 'body': {}},
+        ])
+        assert [response['status'] for response in responses] == [
+            HTTPStatus.NOT_FOUND, HTTPStatus.NOT_FOUND
+        ]
+        for data in (
+            {'requests': []},
+            {'requests': [{'method': 'PUT', 'path': '/api/v1/genres/'}]},
+            {'requests': [{'method': 'GET', 'path': '/admin/'}]},
+        ):
+            response = admin_client.post(
+                self.BATCH_URL, data=data, format='json'
+            )
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что POST-запрос к `{self.BATCH_URL}` '
+                'с некорректными данными возвращает ответ со статусом 400.'
+            )
+
+    def test_04_batch_json_only(self, admin_client):
+        data = json.dumps({'requests': [
+            {'method': 'GET', 'path': '/api/v1/genres/'},
+            {'method': 'GET', 'path': '/api/v1/genres/?format=api'},
+        ]})
+        response = admin_client.post(
+            self.BATCH_URL, data=data, content_type='application/json',
+            HTTP_ACCEPT='text/html'
+        )
+        assert response.status_code == HTTPStatus.NOT_ACCEPTABLE
+        response = admin_client.post(
+            self.BATCH_URL, data=data, content_type='application/json',
+            HTTP_ACCEPT='text/html,*/*;q=0.8'
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert [item['status'] for item in response.json()] == [
+            HTTPStatus.OK, HTTPStatus.OK
+        ], (
+            'Проверьте, что вложенные запросы возвращают JSON независимо '
+            'от заголовка `Accept` и параметра `format`.'
+        )
+
+    def test_05_batch_sub_request_error(self, admin_client, monkeypatch):
+        def fail():
+            raise RuntimeError('catalog is unavailable')
+
+        monkeypatch.setattr('api.mixins.get_catalog', fail)
+        responses = self.post_batch(admin_client, [
+            {'method': 'GET', 'path': '/api/v1/genres/'},
+            {'method': 'GET', 'path': '/api/v1/users/me/'},
+        ])
+        assert [response['status'] for response in responses] == [
+            HTTPStatus.INTERNAL_SERVER_ERROR, HTTPStatus.OK
+        ], (
+            'Проверьте, что ошибка вложенного запроса возвращается '
+            'статусом 500 и не прерывает выполнение пакета.'
+        )
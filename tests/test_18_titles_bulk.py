@@ -0,0 +1,76 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18TitlesBulkAPI:
+
+    TITLES_URL = '/api/v1/titles/'
+    BULK_URL = '/api/v1/titles/bulk/'
+
+    def test_01_titles_by_ids(self, admin_client, client,
+                              django_assert_max_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        first, second = titles[0]['id'], titles[1]['id']
+        missing = second + 100
+        url = f'{self.TITLES_URL}?ids={second},{missing},{first}'
+        with django_assert_max_num_queries(2):
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает ответ '
+            'со статусом 200.'
+        )
+        data = response.json()
+        assert [title['id'] for title in data['results']] == [
+            second, first
+        ], (
+            'Проверьте, что произведения возвращаются в порядке '
+            'параметра `ids`.'
+        )
+        assert data['results'][0]['genre'] == [
+            {'name': 'Драма', 'slug': 'drama'}
+        ]
+        assert data['missing'] == [missing], (
+            'Проверьте, что ответ содержит список отсутствующих id.'
+        )
+
+        response = client.post(
+            self.BULK_URL, data={'ids': [first, missing]},
+            content_type='application/json'
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что POST-запрос к `{self.BULK_URL}` возвращает '
+            'ответ со статусом 200.'
+        )
+        assert [title['id'] for title in response.json()['results']] == [
+            first
+        ]
+        assert response.json()['missing'] == [missing]
+
+    def test_02_titles_by_ids_invalid(self, client, settings):
+        settings.TITLES_BULK_LIMIT = 2
+        for url in (
+            f'{self.TITLES_URL}?ids=',
+            f'{self.TITLES_URL}?ids=1,a',
+            f'{self.TITLES_URL}?ids=1,2,3',
+        ):
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что GET-запрос к `{url}` возвращает ответ '
+                'со статусом 400.'
+            )
+        response = client.post(
+            self.BULK_URL, data={'ids': 'x'},
+            content_type='application/json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        response = client.post(
+            self.BULK_URL, data='[1, 2]', content_type='application/json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            f'Проверьте, что POST-запрос к `{self.BULK_URL}` с телом-списком '
+            'возвращает ответ со статусом 400.'
+        )
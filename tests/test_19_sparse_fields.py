@@ -0,0 +1,65 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19SparseFieldsAPI:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_title_fields(self, admin_client, client,
+                             django_assert_max_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        url = f'{self.TITLES_URL}?fields=id,name,rating'
+        with django_assert_max_num_queries(2) as queries:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает ответ '
+            'со статусом 200.'
+        )
+        assert [
+            set(title) for title in response.json()['results']
+        ] == [{'id', 'name', 'rating'}] * len(titles), (
+            'Проверьте, что параметр `fields` оставляет в ответе '
+            'только указанные поля.'
+        )
+        sql = queries.captured_queries[-1]['sql']
+        assert 'description' not in sql and 'JOIN' not in sql, (
+            'Проверьте, что параметр `fields` уменьшает набор '
+            'загружаемых столбцов и связей.'
+        )
+
+        response = client.get(
+            f'{self.TITLES_URL}{titles[0]["id"]}/?exclude=description,genre'
+        )
+        assert set(response.json()) == {
+            'id', 'name', 'year', 'rating', 'weighted_rating', 'category',
+            'score_distribution'
+        }
+        assert response.json()['category'] == {
+            'name': 'Фильм', 'slug': 'films'
+        }
+
+    def test_02_review_fields(self, admin_client, user_client, client):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'text', 5)
+        response = client.get(
+            f'{self.TITLES_URL}{titles[0]["id"]}/reviews/?fields=author,score'
+        )
+        assert response.json()['results'] == [
+            {'author': 'TestUser', 'score': 5}
+        ]
+
+    def test_03_unknown_fields(self, client):
+        for url in (
+            f'{self.TITLES_URL}?fields=id,password',
+            '/api/v1/genres/?exclude=id',
+        ):
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что GET-запрос к `{url}` с неизвестным полем '
+                'возвращает ответ со статусом 400.'
+            )
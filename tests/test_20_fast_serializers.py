@@ -0,0 +1,59 @@
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from api.fast_serializers import (CommentValuesSerializer,
+                                  ReviewValuesSerializer,
+                                  TitleValuesSerializer)
+from api.fieldsets import optimize_queryset
+from api.serializers import (CommentSerializer, ReviewSerializer,
+                             TitleReadOnlySerializer)
+from reviews.models import Comment, Review, Title
+from tests.utils import (create_single_comment, create_single_review,
+                         create_titles)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20FastSerializers:
+
+    def assert_same_output(self, queryset, serializer_class,
+                           values_serializer_class):
+        serializer = serializer_class(
+            optimize_queryset(
+                queryset, serializer_class().fields.values()
+            ),
+            many=True
+        )
+        values_serializer = values_serializer_class()
+        expected = JSONRenderer().render(serializer.data)
+        actual = JSONRenderer().render(values_serializer.to_representation(
+            values_serializer.get_queryset(queryset)
+        ))
+        assert actual == expected, (
+            f'Проверьте, что `{values_serializer_class.__name__}` '
+            f'возвращает тот же ответ, что и `{serializer_class.__name__}`.'
+        )
+
+    def test_01_same_output(self, admin_client, user_client,
+                            moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        Title.objects.create(name='Без категории', year=2000)
+        for author_client, score in ((user_client, 4), (moderator_client, 7)):
+            review = create_single_review(
+                author_client, titles[0]['id'], 'text', score
+            ).json()
+            create_single_comment(
+                author_client, titles[0]['id'], review['id'], 'comment'
+            )
+
+        self.assert_same_output(
+            Title.objects.order_by('name'),
+            TitleReadOnlySerializer, TitleValuesSerializer
+        )
+        self.assert_same_output(
+            Review.objects.order_by('id'),
+            ReviewSerializer, ReviewValuesSerializer
+        )
+        self.assert_same_output(
+            Comment.objects.order_by('id'),
+            CommentSerializer, CommentValuesSerializer
+        )
@@ -0,0 +1,59 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21TitleFragmentsAPI:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def get_titles(self, client):
+        response = client.get(self.TITLES_URL)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.TITLES_URL}` возвращает '
+            'ответ со статусом 200.'
+        )
+        return response
+
+    def test_01_cached_fragments(self, admin_client, client,
+                                 django_assert_max_num_queries):
+        create_titles(admin_client)
+        response = self.get_titles(client)
+        assert response.content == client.get(
+            f'{self.TITLES_URL}?exclude='
+        ).content, (
+            'Проверьте, что список произведений из кеша совпадает '
+            'с обычным ответом.'
+        )
+        with django_assert_max_num_queries(2) as queries:
+            assert self.get_titles(client).content == response.content
+        assert all(
+            'description' not in query['sql']
+            for query in queries.captured_queries
+        ), (
+            'Проверьте, что при повторном запросе данные произведений '
+            'берутся из кеша.'
+        )
+
+    def test_02_fragments_invalidation(self, admin_client, user_client,
+                                       client):
+        titles, _, _ = create_titles(admin_client)
+        self.get_titles(client)
+        create_single_review(user_client, titles[0]['id'], 'text', 7)
+        results = self.get_titles(client).json()['results']
+        ratings = {title['id']: title['rating'] for title in results}
+        assert ratings[titles[0]['id']] == 7, (
+            'Проверьте, что список произведений обновляется '
+            'при появлении отзыва.'
+        )
+
+        admin_client.delete('/api/v1/categories/films/')
+        results = self.get_titles(client).json()['results']
+        categories = {title['id']: title['category'] for title in results}
+        assert categories[titles[0]['id']] is None, (
+            'Проверьте, что список произведений обновляется '
+            'при удалении категории.'
+        )
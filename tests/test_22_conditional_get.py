@@ -0,0 +1,69 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22ConditionalGetAPI:
+
+    TITLES_URL = '/api/v1/titles/'
+    ME_URL = '/api/v1/users/me/'
+
+    def get_validators(self, client, url):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert response.has_header('ETag') and response.has_header(
+            'Last-Modified'
+        ), (
+            f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+            'заголовки `ETag` и `Last-Modified`.'
+        )
+        return response['ETag'], response['Last-Modified']
+
+    def test_01_not_modified(self, admin_client, user_client, client,
+                             django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        reviews_url = f'{self.TITLES_URL}{titles[0]["id"]}/reviews/'
+        for url in (
+            self.TITLES_URL,
+            f'{self.TITLES_URL}{titles[0]["id"]}/',
+            reviews_url,
+            '/api/v1/genres/',
+        ):
+            etag, last_modified = self.get_validators(client, url)
+            with django_assert_num_queries(0):
+                response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+                f'Проверьте, что GET-запрос к `{url}` с совпадающим '
+                '`If-None-Match` возвращает ответ со статусом 304 '
+                'без запросов к базе данных.'
+            )
+            assert response['ETag'] == etag
+            response = client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+            assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+        etags = [
+            self.get_validators(client, url)[0]
+            for url in (self.TITLES_URL, reviews_url)
+        ]
+        create_single_review(user_client, titles[0]['id'], 'text', 5)
+        for url, etag in zip((self.TITLES_URL, reviews_url), etags):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что после изменения данных GET-запрос к `{url}` '
+                'со старым `If-None-Match` возвращает ответ со статусом 200.'
+            )
+
+    def test_02_user_etag(self, admin_client, user_client):
+        admin_etag, _ = self.get_validators(admin_client, self.ME_URL)
+        user_etag, _ = self.get_validators(user_client, self.ME_URL)
+        assert admin_etag != user_etag, (
+            f'Проверьте, что `ETag` ответа `{self.ME_URL}` зависит '
+            'от пользователя.'
+        )
+        user_client.patch(self.ME_URL, data={'bio': 'bio'})
+        response = user_client.get(self.ME_URL, HTTP_IF_NONE_MATCH=user_etag)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['bio'] == 'bio'
@@ -0,0 +1,96 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23ResponseCacheAPI:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_anonymous_cached(self, admin_client, user_client, client,
+                                 django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        title_url = f'{self.TITLES_URL}{titles[0]["id"]}/'
+        urls = (
+            f'{self.TITLES_URL}?ordering=name&genre=horror',
+            title_url,
+            f'{title_url}reviews/',
+            '/api/v1/categories/',
+            '/api/v1/genres/',
+        )
+        for url in urls:
+            expected = client.get(url)
+            assert expected.status_code == HTTPStatus.OK
+            with django_assert_num_queries(0):
+                response = client.get(url)
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что повторный GET-запрос к `{url}` '
+                'анонимного пользователя возвращается из кеша '
+                'без запросов к базе данных.'
+            )
+            assert response.content == expected.content
+            assert response['ETag'] == expected['ETag']
+
+        with django_assert_num_queries(0):
+            response = client.get(f'{self.TITLES_URL}?genre=horror'
+                                  '&ordering=name')
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что ключ кеша не зависит от порядка '
+            'параметров запроса.'
+        )
+
+    def test_02_invalidation(self, admin_client, user_client, client):
+        titles, _, _ = create_titles(admin_client)
+        title_url = f'{self.TITLES_URL}{titles[0]["id"]}/'
+        reviews_url = f'{title_url}reviews/'
+        assert client.get(reviews_url).json()['count'] == 0
+        assert client.get(title_url).json()['rating'] is None
+
+        create_single_review(user_client, titles[0]['id'], 'text', 5)
+        assert client.get(reviews_url).json()['count'] == 1, (
+            'Проверьте, что после создания отзыва закешированный '
+            'список отзывов обновляется.'
+        )
+        assert client.get(title_url).json()['rating'] == 5, (
+            'Проверьте, что после создания отзыва закешированное '
+            'произведение обновляется.'
+        )
+
+        genres_url = '/api/v1/genres/'
+        count = client.get(genres_url).json()['count']
+        admin_client.post(genres_url, data={'name': 'Новый', 'slug': 'new'})
+        assert client.get(genres_url).json()['count'] == count + 1
+
+        admin_client.delete(f'/api/v1/categories/{titles[0]["category"]}/')
+        assert client.get(title_url).json()['category'] is None, (
+            'Проверьте, что после удаления категории закешированное '
+            'произведение обновляется.'
+        )
+
+    def test_03_authenticated_not_cached(self, admin_client):
+        create_titles(admin_client)
+        admin_client.get(self.TITLES_URL)
+        response = admin_client.get(self.TITLES_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert not getattr(response, 'from_cache', False), (
+            'Проверьте, что ответы аутентифицированным пользователям '
+            'не кешируются.'
+        )
+
+    def test_04_host_in_key(self, admin_client, client):
+        for index in range(12):
+            admin_client.post(
+                '/api/v1/genres/',
+                data={'name': f'Жанр {index}', 'slug': f'genre-{index}'}
+            )
+        url = '/api/v1/genres/'
+        first = client.get(url, HTTP_HOST='first.example.com').json()
+        second = client.get(url, HTTP_HOST='second.example.com').json()
+        assert first['next'].startswith('http://first.example.com/')
+        assert second['next'].startswith('http://second.example.com/'), (
+            'Проверьте, что ключ кеша ответа учитывает хост запроса, '
+            'который входит в ссылки пагинации.'
+        )
@@ -0,0 +1,89 @@
+import multiprocessing
+import time
+
+import pytest
+from django.core.cache import caches
+
+from api_yamdb import settings as project_settings
+from api_yamdb.cache import SQLiteCache
+
+
+def create_cache(path, **options):
+    return SQLiteCache(path / 'cache.sqlite3', {
+        'TIMEOUT': None, 'OPTIONS': options
+    })
+
+
+def add_in_process(path, key):
+    return create_cache(path).add(key, 'value')
+
+
+class Test24SQLiteCache:
+
+    def test_01_operations(self, tmp_path):
+        cache = create_cache(tmp_path)
+        cache.set('key', {'a': 1})
+        assert cache.get('key') == {'a': 1}
+        assert cache.get_many(['key', 'missing']) == {'key': {'a': 1}}
+        assert not cache.add('key', 'other'), (
+            'Проверьте, что `add` не перезаписывает существующий ключ.'
+        )
+        assert cache.add('key2', 1)
+        assert cache.incr('key2') == 2
+        assert cache.get('key2') == 2
+        cache.set('expired', 1, timeout=0.01)
+        time.sleep(0.02)
+        assert cache.get('expired') is None
+        assert cache.add('expired', 2)
+        assert cache.delete('key')
+        assert cache.get('key', 'default') == 'default'
+        cache.clear()
+        assert cache.get_many(['key2', 'expired']) == {}
+
+    def test_02_lru_eviction(self, tmp_path):
+        cache = create_cache(
+            tmp_path, MAX_ENTRIES=100, CULL_FREQUENCY=100,
+            ACCESS_RESOLUTION=0
+        )
+        cache.set_many({f'key:{index}': index for index in range(100)})
+        cache.get('key:0')
+        cache.set('new', 'value')
+        assert cache.get('key:0') == 0, (
+            'Проверьте, что при вытеснении сохраняются записи, '
+            'которые читались последними.'
+        )
+        assert cache.get('key:1') is None
+        assert cache.get('new') == 'value'
+
+    def test_03_size_cap(self, tmp_path):
+        cache = create_cache(tmp_path, MAX_SIZE=100_000)
+        for index in range(50):
+            cache.set(f'key:{index}', b'x' * 10_000)
+        connection = cache.get_connection()
+        entries, size = connection.execute(
+            'SELECT entries, size FROM cache_stats'
+        ).fetchone()
+        assert size <= 100_000, (
+            'Проверьте, что размер кеша не превышает `MAX_SIZE`.'
+        )
+        assert entries == connection.execute(
+            'SELECT COUNT(*) FROM cache'
+        ).fetchone()[0]
+        assert cache.get('key:49') is not None
+
+    def test_04_multiprocess_add(self, tmp_path):
+        create_cache(tmp_path).get('key')
+        context = multiprocessing.get_context('fork')
+        with context.Pool(8) as pool:
+            added = pool.starmap(add_in_process, [(tmp_path, 'key')] * 32)
+        assert added.count(True) == 1, (
+            'Проверьте, что `add` атомарен при работе нескольких процессов.'
+        )
+
+    def test_05_tests_cache_location(self):
+        assert caches['default'].location != str(
+            project_settings.CACHES['default']['LOCATION']
+        ), (
+            'Проверьте, что тесты не используют и не очищают файл кеша '
+            'проекта.'
+        )
@@ -0,0 +1,93 @@
+import threading
+import time
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+
+from api.conditional import RESPONSE_KEY
+from api.singleflight import LEASE_KEY
+from api.views import TitleViewSet
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25SingleFlightAPI:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def get_lease_key(self, admin_client, url):
+        etag = admin_client.get(url)['ETag']
+        return RESPONSE_KEY.format(etag.strip('"'))
+
+    def test_01_stale_while_revalidate(self, admin_client, user_client,
+                                       client, django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        url = f'{self.TITLES_URL}{titles[0]["id"]}/'
+        stale = client.get(url)
+        create_single_review(user_client, titles[0]['id'], 'text', 5)
+        key = self.get_lease_key(admin_client, url)
+        cache.add(LEASE_KEY.format(key), True)
+        with django_assert_num_queries(0):
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert response.content == stale.content, (
+            'Проверьте, что пока другой запрос строит ответ, '
+            'возвращается последний ответ на этот запрос.'
+        )
+        assert not response.has_header('ETag'), (
+            'Проверьте, что устаревший ответ не содержит `ETag` '
+            'новой версии данных.'
+        )
+        cache.delete(LEASE_KEY.format(key))
+        assert client.get(url).json()['rating'] == 5
+
+    def test_02_wait_for_leader(self, admin_client, client):
+        create_titles(admin_client)
+        key = self.get_lease_key(admin_client, self.TITLES_URL)
+        cache.add(LEASE_KEY.format(key), True)
+
+        def lead():
+            time.sleep(0.2)
+            cache.set(key, ('application/json', b'{"leader": true}'))
+            cache.delete(LEASE_KEY.format(key))
+
+        thread = threading.Thread(target=lead)
+        thread.start()
+        response = client.get(self.TITLES_URL)
+        thread.join()
+        assert response.json() == {'leader': True}, (
+            'Проверьте, что при промахе кеша запрос ждёт ответа, '
+            'который строит другой процесс.'
+        )
+
+    def test_03_coalesce_threads(self, admin_client, client, monkeypatch):
+        create_titles(admin_client)
+        calls = []
+        original_list = TitleViewSet.list
+
+        def slow_list(self, request, *args, **kwargs):
+            calls.append(1)
+            time.sleep(0.2)
+            return original_list(self, request, *args, **kwargs)
+
+        monkeypatch.setattr(TitleViewSet, 'list', slow_list)
+        responses = []
+        threads = [
+            threading.Thread(
+                target=lambda: responses.append(client.get(self.TITLES_URL))
+            )
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(calls) == 1, (
+            'Проверьте, что одновременные запросы с одним ключом кеша '
+            'строят ответ один раз.'
+        )
+        assert len({response.content for response in responses}) == 1
+        assert all(
+            response.status_code == HTTPStatus.OK for response in responses
+        )
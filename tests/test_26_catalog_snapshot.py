@@ -0,0 +1,82 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Genre, Title
+from tests.utils import create_titles
+
+CATALOG_TABLES = ('"reviews_genre"', '"reviews_category"')
+
+
+def catalog_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    return [
+        query['sql'] for query in context.captured_queries
+        if any(table in query['sql'] for table in CATALOG_TABLES)
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26CatalogSnapshotAPI:
+
+    def test_01_no_catalog_queries(self, admin_client):
+        create_titles(admin_client)
+        for url in (
+            '/api/v1/genres/', '/api/v1/categories/', '/api/v1/titles/'
+        ):
+            catalog_queries(admin_client, url)
+            assert not catalog_queries(admin_client, url), (
+                f'Проверьте, что GET-запрос к `{url}` берёт категории '
+                'и жанры из снимка каталога без запросов к базе данных.'
+            )
+
+    def test_02_rebuilt_on_write(self, admin_client):
+        create_titles(admin_client)
+        response = admin_client.get('/api/v1/genres/?search=ДРАМ')
+        assert [genre['slug'] for genre in response.json()['results']] == [
+            'drama'
+        ]
+        admin_client.post(
+            '/api/v1/genres/', data={'name': 'Вестерн', 'slug': 'western'}
+        )
+        response = admin_client.get('/api/v1/genres/?search=вестерн')
+        assert response.json()['count'] == 1, (
+            'Проверьте, что после создания жанра снимок каталога '
+            'обновляется.'
+        )
+        data = {
+            'name': 'Хороший, плохой, злой',
+            'year': 1966,
+            'genre': ['western'],
+            'category': 'films',
+        }
+        response = admin_client.post('/api/v1/titles/', data=data)
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['genre'][0]['slug'] == 'western'
+
+        admin_client.delete('/api/v1/genres/western/')
+        response = admin_client.post('/api/v1/titles/', data=data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что после удаления жанра его slug не принимается.'
+        )
+        assert 'genre' in response.json()
+
+    def test_03_snapshot_behind(self, admin_client, client):
+        titles, _, _ = create_titles(admin_client)
+        client.get('/api/v1/titles/')
+        # Запись без сигналов: версия каталога не меняется
+        Genre.objects.bulk_create([Genre(name='Вестерн', slug='western')])
+        genre = Genre.objects.get(slug='western')
+        Title.genre.through.objects.bulk_create([
+            Title.genre.through(title_id=titles[0]['id'], genre_id=genre.pk)
+        ])
+        for url in ('/api/v1/titles/', '/api/v1/titles/?fields=name,genre'):
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что GET-запрос к `{url}` не завершается '
+                'ошибкой, если жанра ещё нет в снимке каталога.'
+            )
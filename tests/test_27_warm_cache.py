@@ -0,0 +1,79 @@
+import sys
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from api import fragments
+from api.apps import ApiConfig
+from api.warmup import warm_cache_in_background
+from reviews import catalog
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27WarmCache:
+
+    def fail_render(self, ids):
+        raise AssertionError(
+            'Проверьте, что после прогрева кеша JSON произведений '
+            'первых страниц не строится заново.'
+        )
+
+    def test_01_command(self, admin_client, client, monkeypatch,
+                        user, user_client, moderator, moderator_client):
+        create_reviews(admin_client, {
+            user: user_client, moderator: moderator_client
+        })
+        out = StringIO()
+        call_command('warm_cache', '--pages', '1', stdout=out)
+        output = out.getvalue()
+        for name in ('titles ordering=name', 'top'):
+            assert name in output, (
+                'Проверьте, что команда `warm_cache` сообщает '
+                f'о выполнении задачи `{name}`.'
+            )
+        assert 'catalog' not in output, (
+            'Проверьте, что команда `warm_cache` не строит снимок каталога: '
+            'он хранится только в памяти процесса команды.'
+        )
+        monkeypatch.setattr(fragments, 'render_titles', self.fail_render)
+        for url in (
+            '/api/v1/titles/',
+            '/api/v1/titles/?ordering=-weighted_rating',
+        ):
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            assert response.json()['count'] == 2
+
+    def test_02_background(self, admin_client, client, monkeypatch,
+                           user, user_client):
+        create_reviews(admin_client, {user: user_client})
+        catalog._snapshot = None
+        warm_cache_in_background().join()
+        assert catalog._snapshot is not None, (
+            'Проверьте, что при запуске сервера строится снимок каталога.'
+        )
+        monkeypatch.setattr(fragments, 'render_titles', self.fail_render)
+        assert client.get('/api/v1/titles/').status_code == HTTPStatus.OK
+
+
+@pytest.mark.parametrize('argv,expected', [
+    (['/usr/bin/gunicorn', 'api_yamdb.wsgi'], True),
+    (['uwsgi', '--ini', 'uwsgi.ini'], True),
+    (['manage.py', 'runserver'], True),
+    (['/usr/lib/python3/site-packages/django/__main__.py', 'runserver'],
+     True),
+    (['manage.py', 'migrate'], False),
+    (['/usr/bin/django-admin', 'migrate'], False),
+    (['/usr/lib/python3/site-packages/django/__main__.py', 'migrate'],
+     False),
+    (['/usr/bin/pytest', '-q'], False),
+    ([], False),
+])
+def test_is_server(monkeypatch, argv, expected):
+    monkeypatch.setattr(sys, 'argv', argv)
+    assert ApiConfig.is_server() is expected, (
+        'Проверьте, что кеш прогревается только в процессах серверов.'
+    )
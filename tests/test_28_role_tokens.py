@@ -0,0 +1,80 @@
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth.tokens import default_token_generator
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from tests.utils import create_titles
+
+USER_TABLE = '"reviews_user"'
+
+
+def get_client(user):
+    response = APIClient().post('/api/v1/auth/token/', data={
+        'username': user.username,
+        'confirmation_code': default_token_generator.make_token(user),
+    })
+    assert response.status_code == HTTPStatus.OK
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION=f'Bearer {response.json()["token"]}'
+    )
+    return client, AccessToken(response.json()['token'])
+
+
+def user_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    return [
+        query['sql'] for query in context.captured_queries
+        if USER_TABLE in query['sql']
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28RoleTokensAPI:
+
+    def test_01_claims(self, admin):
+        _, token = get_client(admin)
+        assert token['role'] == admin.role
+        assert token['username'] == admin.username
+        assert 'is_superuser' in token and 'auth_version' in token, (
+            'Проверьте, что токен содержит роль, признак суперпользователя '
+            'и версию данных авторизации.'
+        )
+
+    def test_02_no_user_lookup(self, admin, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        client, _ = get_client(admin)
+        for url in (f'/api/v1/titles/{titles[0]["id"]}/', '/api/v1/genres/'):
+            assert not user_queries(client, url), (
+                f'Проверьте, что GET-запрос к `{url}` с токеном, '
+                'содержащим роль, не загружает пользователя из базы данных.'
+            )
+        response = client.get('/api/v1/users/me/')
+        assert response.json()['email'] == admin.email
+        response = client.post(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/',
+            data={'text': 'text', 'score': 5}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+
+    def test_03_demotion(self, user, admin_client):
+        url = f'/api/v1/users/{user.username}/'
+        admin_client.patch(url, data={'role': 'admin'})
+        user.refresh_from_db()
+        client, _ = get_client(user)
+        assert client.get('/api/v1/users/').status_code == HTTPStatus.OK
+        admin_client.patch(url, data={'role': 'user'})
+        response = client.get('/api/v1/users/')
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что после изменения роли пользователя '
+            'утверждения выданного ранее токена не используются.'
+        )
+        admin_client.delete(url)
+        response = client.get('/api/v1/genres/')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
@@ -0,0 +1,98 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from reviews.models import RevokedToken
+from reviews.revocation import BloomFilter
+from reviews.versions import REVOCATION_VERSION, bump_version
+
+LOGOUT_URL = '/api/v1/auth/logout/'
+GENRES_URL = '/api/v1/genres/'
+
+
+def get_client(user):
+    token = AccessToken.for_user(user)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return client, token
+
+
+def test_bloom_filter():
+    bloom = BloomFilter(1000, 0.01)
+    for index in range(1000):
+        bloom.add(f'key:{index}')
+    assert all(f'key:{index}' in bloom for index in range(1000)), (
+        'Проверьте, что фильтр Блума не даёт ложноотрицательных ответов.'
+    )
+    false_positives = sum(
+        f'other:{index}' in bloom for index in range(10000)
+    )
+    assert false_positives < 300
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29TokenRevocationAPI:
+
+    def test_01_logout(self, user):
+        client, _ = get_client(user)
+        other_client, _ = get_client(user)
+        assert client.get(GENRES_URL).status_code == HTTPStatus.OK
+        assert client.post(LOGOUT_URL).status_code == HTTPStatus.NO_CONTENT
+        response = client.get(GENRES_URL)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            f'Проверьте, что после POST-запроса к `{LOGOUT_URL}` '
+            'токен запроса отклоняется.'
+        )
+        assert other_client.get(GENRES_URL).status_code == HTTPStatus.OK
+
+    def test_02_logout_all(self, user, admin_client):
+        client, _ = get_client(user)
+        other_client, _ = get_client(user)
+        response = client.post(LOGOUT_URL, data={'all': True})
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        for revoked in (client, other_client):
+            assert revoked.get(GENRES_URL).status_code == (
+                HTTPStatus.UNAUTHORIZED
+            ), (
+                'Проверьте, что после отзыва всех токенов пользователя '
+                'выданные ранее токены отклоняются.'
+            )
+        assert admin_client.get(GENRES_URL).status_code == HTTPStatus.OK
+        assert APIClient().post(LOGOUT_URL).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )
+
+    def test_03_no_queries(self, user_client):
+        user_client.get(GENRES_URL)
+        with CaptureQueriesContext(connection) as context:
+            user_client.get(GENRES_URL)
+        assert not [
+            query for query in context.captured_queries
+            if 'revokedtoken' in query['sql']
+        ], (
+            'Проверьте, что проверка неотозванного токена не обращается '
+            'к базе данных.'
+        )
+
+    def test_04_sync_workers(self, user, settings):
+        settings.REVOCATION_SYNC_INTERVAL = timedelta(0)
+        client, token = get_client(user)
+        assert client.get(GENRES_URL).status_code == HTTPStatus.OK
+        # Отзыв в другом процессе: запись и новая версия без сброса
+        # фильтра текущего процесса
+        RevokedToken.objects.create(
+            jti=token['jti'], expires=timezone.now() + timedelta(days=1)
+        )
+        bump_version(REVOCATION_VERSION)
+        assert client.get(GENRES_URL).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), (
+            'Проверьте, что фильтр отозванных токенов обновляется '
+            'при изменении версии списка.'
+        )
@@ -0,0 +1,113 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth.tokens import default_token_generator
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.authentication import ROLE_CLAIM
+
+TOKEN_URL = '/api/v1/auth/token/'
+REFRESH_URL = '/api/v1/auth/token/refresh/'
+LOGOUT_URL = '/api/v1/auth/logout/'
+GENRES_URL = '/api/v1/genres/'
+
+
+def get_tokens(user):
+    response = APIClient().post(TOKEN_URL, data={
+        'username': user.username,
+        'confirmation_code': default_token_generator.make_token(user),
+    })
+    assert response.status_code == HTTPStatus.OK
+    return response.json()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test30RefreshTokensAPI:
+
+    def test_01_token_response(self, user):
+        data = get_tokens(user)
+        assert 'refresh' in data, (
+            f'Проверьте, что ответ на POST-запрос к `{TOKEN_URL}` '
+            'содержит токен обновления `refresh`.'
+        )
+        access = AccessToken(data['token'])
+        assert access['exp'] - access['iat'] == (
+            timedelta(minutes=5).total_seconds()
+        ), 'Проверьте, что токен доступа действует 5 минут.'
+
+    def test_02_refresh(self, user, django_assert_num_queries):
+        refresh = get_tokens(user)['refresh']
+        client = APIClient()
+        # Первый запрос процесса строит фильтр отозванных токенов
+        client.post(REFRESH_URL, data={'refresh': refresh})
+        with django_assert_num_queries(1):
+            response = client.post(REFRESH_URL, data={'refresh': refresh})
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что POST-запрос к `{REFRESH_URL}` с действующим '
+            'токеном обновления возвращает статус 200.'
+        )
+        client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {response.json()["token"]}'
+        )
+        assert client.get(GENRES_URL).status_code == HTTPStatus.OK
+
+    def test_03_invalid_refresh(self, user):
+        data = get_tokens(user)
+        client = APIClient()
+        assert client.post(REFRESH_URL).status_code == HTTPStatus.BAD_REQUEST
+        for token in ('invalid', data['token']):
+            response = client.post(REFRESH_URL, data={'refresh': token})
+            assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+                f'Проверьте, что POST-запрос к `{REFRESH_URL}` '
+                'с недействительным токеном или токеном доступа '
+                'возвращает статус 401.'
+            )
+
+    def test_04_role_change(self, user, admin_client):
+        refresh = get_tokens(user)['refresh']
+        admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'role': 'moderator'}
+        )
+        response = APIClient().post(REFRESH_URL, data={'refresh': refresh})
+        assert AccessToken(response.json()['token'])[ROLE_CLAIM] == (
+            'moderator'
+        ), (
+            'Проверьте, что новый токен доступа содержит текущую роль '
+            'пользователя.'
+        )
+
+    def test_05_logout(self, user):
+        first, second = get_tokens(user), get_tokens(user)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {first["token"]}')
+        response = client.post(LOGOUT_URL, data={'refresh': first['refresh']})
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        refresh = APIClient().post(
+            REFRESH_URL, data={'refresh': first['refresh']}
+        )
+        assert refresh.status_code == HTTPStatus.UNAUTHORIZED, (
+            f'Проверьте, что токен обновления, переданный в `{LOGOUT_URL}`, '
+            'отзывается.'
+        )
+        assert APIClient().post(
+            REFRESH_URL, data={'refresh': second['refresh']}
+        ).status_code == HTTPStatus.OK
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {second["token"]}')
+        client.post(LOGOUT_URL, data={'all': True})
+        assert APIClient().post(
+            REFRESH_URL, data={'refresh': second['refresh']}
+        ).status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что после отзыва всех токенов пользователя '
+            'токены обновления отклоняются.'
+        )
+
+    def test_06_other_user_refresh(self, user, moderator):
+        refresh = get_tokens(moderator)['refresh']
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {get_tokens(user)["token"]}'
+        )
+        response = client.post(LOGOUT_URL, data={'refresh': refresh})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
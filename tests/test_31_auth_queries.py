@@ -0,0 +1,58 @@
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth.tokens import default_token_generator
+from django.core import mail
+
+SIGNUP_URL = '/api/v1/auth/signup/'
+TOKEN_URL = '/api/v1/auth/token/'
+
+
+@pytest.mark.django_db(transaction=True)
+class Test31AuthQueriesAPI:
+
+    def test_01_signup_new_user(self, client, django_assert_num_queries):
+        data = {'username': 'NewUser', 'email': 'newuser@yamdb.fake'}
+        # Поиск пользователя, проверки уникальности имени и почты, создание
+        with django_assert_num_queries(4):
+            response = client.post(SIGNUP_URL, data=data)
+        assert response.status_code == HTTPStatus.OK
+        assert len(mail.outbox) == 1
+
+    def test_02_signup_existing_user(self, client, user,
+                                     django_assert_num_queries):
+        data = {'username': user.username, 'email': user.email}
+        with django_assert_num_queries(1):
+            response = client.post(SIGNUP_URL, data=data)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что повторный POST-запрос к `{SIGNUP_URL}` '
+            'зарегистрированного пользователя возвращает статус 200.'
+        )
+        assert len(mail.outbox) == 1, (
+            'Проверьте, что зарегистрированному пользователю повторно '
+            'отправляется код подтверждения.'
+        )
+
+    def test_03_token(self, client, user, django_assert_num_queries):
+        data = {
+            'username': user.username,
+            'confirmation_code': default_token_generator.make_token(user),
+        }
+        with django_assert_num_queries(1):
+            response = client.post(TOKEN_URL, data=data)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что POST-запрос к `{TOKEN_URL}` загружает '
+            'пользователя из базы данных один раз.'
+        )
+
+    def test_04_token_errors(self, client, user, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            response = client.post(TOKEN_URL, data={
+                'username': 'unknown', 'confirmation_code': '12345'
+            })
+        assert response.status_code == HTTPStatus.NOT_FOUND
+        with django_assert_num_queries(1):
+            response = client.post(TOKEN_URL, data={
+                'username': user.username, 'confirmation_code': '12345'
+            })
+        assert response.status_code == HTTPStatus.BAD_REQUEST
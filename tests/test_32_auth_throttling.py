@@ -0,0 +1,130 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core import mail
+from django.core.cache import caches
+
+from api.throttling import TokenBucketThrottle
+
+SIGNUP_URL = '/api/v1/auth/signup/'
+TOKEN_URL = '/api/v1/auth/token/'
+
+
+@pytest.fixture
+def burst(settings):
+    settings.AUTH_THROTTLE_BURST = 3
+    settings.AUTH_THROTTLE_REFILL_INTERVAL = timedelta(seconds=10)
+    return settings.AUTH_THROTTLE_BURST
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(
+        TokenBucketThrottle, 'timer', staticmethod(lambda: now[0])
+    )
+    return now
+
+
+def get_token(client, username, address='127.0.0.1'):
+    return client.post(TOKEN_URL, data={
+        'username': username, 'confirmation_code': '12345'
+    }, REMOTE_ADDR=address)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test32AuthThrottlingAPI:
+
+    def test_01_burst(self, client, user, burst, clock):
+        for _ in range(burst):
+            assert get_token(client, user.username).status_code == (
+                HTTPStatus.BAD_REQUEST
+            )
+        response = get_token(client, user.username)
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            f'Проверьте, что частые POST-запросы к `{TOKEN_URL}` '
+            'ограничиваются со статусом 429.'
+        )
+        assert response['Retry-After'] == '10', (
+            'Проверьте, что ответ со статусом 429 содержит заголовок '
+            '`Retry-After`.'
+        )
+        clock[0] += 5
+        assert get_token(client, user.username)['Retry-After'] == '5'
+        clock[0] += 5
+        assert get_token(client, user.username).status_code == (
+            HTTPStatus.BAD_REQUEST
+        ), 'Проверьте, что корзина запросов пополняется со временем.'
+
+    def test_02_keys(self, client, user, moderator, burst, clock):
+        for index in range(burst):
+            get_token(client, user.username, f'10.0.0.{index}')
+        assert get_token(
+            client, user.username, '10.0.1.1'
+        ).status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что запросы ограничиваются по имени пользователя '
+            'независимо от IP-адреса.'
+        )
+        assert get_token(
+            client, moderator.username, '10.0.1.1'
+        ).status_code == HTTPStatus.BAD_REQUEST
+        for index in range(burst):
+            get_token(client, f'unknown{index}', '10.0.2.2')
+        assert get_token(
+            client, moderator.username, '10.0.2.2'
+        ).status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что запросы ограничиваются по IP-адресу.'
+        )
+        response = client.post(
+            SIGNUP_URL, data={'username': user.username, 'email': user.email}
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что ограничения регистрации и получения токена '
+            'независимы.'
+        )
+
+    def test_03_email_key(self, client, burst, clock):
+        for index in range(burst):
+            client.post(SIGNUP_URL, data={
+                'username': f'user{index}', 'email': 'same@yamdb.fake'
+            }, REMOTE_ADDR=f'10.0.0.{index}')
+        response = client.post(SIGNUP_URL, data={
+            'username': 'other', 'email': 'SAME@yamdb.fake'
+        }, REMOTE_ADDR='10.0.1.1')
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что запросы регистрации ограничиваются по почте.'
+        )
+
+    def test_04_resend_cooldown(self, client, settings):
+        data = {'username': 'NewUser', 'email': 'newuser@yamdb.fake'}
+        for _ in range(3):
+            assert client.post(SIGNUP_URL, data=data).status_code == (
+                HTTPStatus.OK
+            )
+        assert len(mail.outbox) == 1, (
+            'Проверьте, что повторный код подтверждения не отправляется '
+            'раньше `CONFIRMATION_RESEND_COOLDOWN`.'
+        )
+        # Истечение срока: запись о последней отправке удаляется из кеша
+        caches[settings.THROTTLE_CACHE].clear()
+        client.post(SIGNUP_URL, data=data)
+        assert len(mail.outbox) == 2
+
+    def test_05_non_object_body(self, client, burst, clock):
+        for url in (SIGNUP_URL, TOKEN_URL):
+            response = client.post(
+                url, data='[1, 2]', content_type='application/json'
+            )
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что POST-запрос к `{url}` с телом-списком '
+                'возвращает статус 400.'
+            )
+        for _ in range(burst - 1):
+            client.post(TOKEN_URL, data='[]', content_type='application/json')
+        assert client.post(
+            TOKEN_URL, data='[]', content_type='application/json'
+        ).status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что запросы с телом-списком ограничиваются '
+            'по IP-адресу.'
+        )